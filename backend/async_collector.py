@@ -0,0 +1,226 @@
+"""
+Asyncio-native news collector engine
+One aiohttp session per run (keep-alive + DNS cache), passed down to its
+requests, and a single in-flight budget created with the collector for
+every feed and article fetch; CPU-bound feed parsing, HTML
+extraction and enrichment run in a worker process pool. A run flows through
+the stages of ingest_pipeline.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Dict, Optional, Tuple
+
+import aiohttp
+
+from enhanced_news_collector import (
+    collector, EnhancedNewsCollector, FEEDS, HEADERS, CONNECT_TIMEOUT, READ_TIMEOUT,
+)
+from ingest_engine import ArticleSink, IngestConfig
+from host_scheduler import host_scheduler, host_of, THROTTLE_STATUSES, HOST_MAX_RETRIES
+from feed_fetcher import feed_fetcher, FeedFetchResult
+from collection_deadline import Deadline
+from article_download import is_html_content_type, read_capped_async
+from ingest_pipeline import IngestPipeline
+from llm_summarizer import llm_summarizer
+
+logger = logging.getLogger(__name__)
+
+ASYNC_MAX_IN_FLIGHT = int(os.getenv("ASYNC_MAX_IN_FLIGHT", "16"))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", "300"))
+KEEPALIVE_TIMEOUT = float(os.getenv("KEEPALIVE_TIMEOUT", "30"))
+
+
+class AsyncNewsCollector:
+    def __init__(self, base: EnhancedNewsCollector = collector,
+                 max_in_flight: int = ASYNC_MAX_IN_FLIGHT, parse_workers: int = PARSE_WORKERS):
+        self.base = base
+        self.max_in_flight = max_in_flight
+        self.parse_workers = parse_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # One in-flight budget shared by every run on the event loop
+        self._budget = asyncio.Semaphore(max_in_flight)
+        self._budget_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def stats(self) -> Dict:
+        return self.base.stats
+
+    @property
+    def deadline(self) -> Deadline:
+        return self.base.deadline
+
+    def _request_timeout(self) -> Optional[aiohttp.ClientTimeout]:
+        """Per-request timeout that ends with the run (None: the session's defaults)"""
+        remaining = self.deadline.remaining()
+        if remaining is None:
+            return None
+        return aiohttp.ClientTimeout(
+            total=self.deadline.cap(remaining),
+            sock_connect=self.deadline.cap(CONNECT_TIMEOUT),
+            sock_read=self.deadline.cap(READ_TIMEOUT),
+        )
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Worker processes are created once and reused across runs"""
+        if self._pool is None and self.parse_workers > 0:
+            self._pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self._pool
+
+    def _bind_budget(self) -> None:
+        """
+        asyncio primitives belong to one event loop. The API keeps a single loop;
+        scripts start a new one per asyncio.run(), and only then is the budget replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self._budget_loop is not loop:
+            if self._budget_loop is not None:
+                self._budget = asyncio.Semaphore(self.max_in_flight)
+            self._budget_loop = loop
+
+    async def _run_cpu(self, func, *args):
+        """Run CPU-bound parsing/enrichment in the worker pool (or a thread when disabled)"""
+        pool = self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+
+    async def request(self, session: aiohttp.ClientSession, url: str, headers: Optional[Dict[str, str]] = None,
+                      html_only: bool = False) -> Optional[Tuple[int, Any, bytes]]:
+        """
+        GET a URL politely: wait for a per-host slot first, then take a slot from
+        the global in-flight budget. 429/503 responses release both and retry after
+        the host's backoff, so a throttled host does not hold budget from others.
+        Returns (status, headers, body) for 2xx/304 responses, None otherwise.
+        With html_only, non-HTML responses are dropped after the headers and the
+        body is streamed up to ARTICLE_MAX_BYTES.
+        """
+        host = host_of(url)
+        for attempt in range(HOST_MAX_RETRIES + 1):
+            await host_scheduler.acquire_async(host)
+            status, retry_after = None, None
+            try:
+                async with self._budget:
+                    if self.deadline.expired:
+                        return None
+                    timeout = self._request_timeout()
+                    kwargs = {'timeout': timeout} if timeout else {}
+                    async with session.get(url, headers=headers, allow_redirects=True, **kwargs) as response:
+                        status = response.status
+                        if status in THROTTLE_STATUSES:
+                            retry_after = response.headers.get("Retry-After")
+                            continue
+                        response.raise_for_status()
+                        if not html_only:
+                            return status, response.headers, await response.read()
+                        content_type = response.headers.get("Content-Type")
+                        if not is_html_content_type(content_type):
+                            logger.info(f"  ⏭️ Skipping non-HTML article page {url} ({content_type})")
+                            return None
+                        return status, response.headers, await read_capped_async(response)
+            except Exception as e:
+                logger.warning(f"Fetch failed for {url}: {e}")
+                return None
+            finally:
+                host_scheduler.release(host, status, retry_after)
+
+        logger.warning(f"Giving up on {url} after {HOST_MAX_RETRIES + 1} throttled attempts")
+        return None
+
+    async def fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[bytes]:
+        """Body of a URL within the politeness and in-flight limits"""
+        response = await self.request(session, url)
+        return response[2] if response else None
+
+    async def fetch_feed(self, session: aiohttp.ClientSession, feed_url: str) -> FeedFetchResult:
+        """Conditional GET of a feed page; content is only returned when the body changed"""
+        if not self.base.sink.uses_backend_state:
+            # Sinks without fetch state read the whole feed and leave the validators alone
+            response = await self.request(session, feed_url)
+            if response is None:
+                return FeedFetchResult(feed_url, None, changed=False, error="fetch failed")
+            return FeedFetchResult(feed_url, response[0], True, response[2])
+        state = await asyncio.to_thread(feed_fetcher.load_state, feed_url)
+        response = await self.request(session, feed_url, feed_fetcher.conditional_headers(state))
+        if response is None:
+            return FeedFetchResult(feed_url, None, changed=False, error="fetch failed")
+        status, headers, body = response
+        return await asyncio.to_thread(feed_fetcher.handle_response, feed_url, state, status, headers, body)
+
+    async def collect_all_news(self, max_feeds: Optional[int] = None, feeds: Optional[List[Dict]] = None,
+                               deadline: Optional[Deadline] = None, sink: Optional[ArticleSink] = None,
+                               config: Optional[IngestConfig] = None) -> Dict:
+        """
+        Collect news from all feeds (or only the given feed configs) through the
+        staged ingest pipeline. Once the deadline passes no new work starts;
+        in-flight work gets DEADLINE_GRACE seconds, then is cancelled, and
+        everything that reached the persist stage is saved. Raises
+        CollectionInProgress while another run holds the collector.
+        """
+        with self.base.exclusive_run():
+            return await self._collect_all_news(max_feeds, feeds, deadline, sink, config)
+
+    async def _collect_all_news(self, max_feeds: Optional[int], feeds: Optional[List[Dict]],
+                                deadline: Optional[Deadline], sink: Optional[ArticleSink],
+                                config: Optional[IngestConfig]) -> Dict:
+        logger.info("🚀 Starting async news collection")
+        self.base.begin_run(deadline, sink, config)
+
+        start_time = time.time()
+        if feeds is not None:
+            feeds_to_process = feeds
+        else:
+            feeds_to_process = FEEDS[:max_feeds] if max_feeds else FEEDS
+        # Feeds most likely to have new articles queue first for the fetch budget
+        feeds_to_process = self.base.order_feeds(feeds_to_process)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        timeout = aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+        self._bind_budget()
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=HEADERS) as session:
+            pipeline = IngestPipeline(self, session)
+            await pipeline.run(feeds_to_process)
+
+        logger.info(f"📊 Collected {self.stats['total_processed']} unique articles")
+
+        duration = time.time() - start_time
+
+        partial = self.deadline.expired
+        if partial:
+            logger.warning(f"⏱️ Async collection stopped early ({self.deadline.reason}) after {duration:.2f} seconds")
+        else:
+            logger.info(f"✅ Async collection completed in {duration:.2f} seconds")
+        logger.info(f"📈 Stats: {self.stats}")
+
+        return {
+            'success': True,
+            'duration': duration,
+            'stats': self.stats,
+            'total_feeds': len(feeds_to_process),
+            'successful_feeds': len(self.stats['successful_feeds']),
+            'failed_feeds': len(self.stats['failed_feeds']),
+            'skipped_feeds': len(self.stats['skipped_feeds']),
+            'partial': partial,
+            'stop_reason': self.deadline.reason if partial else None,
+            'new_entries': dict(self.base.new_entries_by_feed),
+            'stages': pipeline.metrics(),
+            'summaries': llm_summarizer.stats()
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global async collector instance
+async_collector = AsyncNewsCollector()
@@ -0,0 +1,102 @@
+"""
+Main-text extraction benchmark
+Compares the selector-based BeautifulSoup extractor with the single-pass
+lxml extractor on the saved pages in fixtures/: throughput (pages/sec) and
+agreement between the two outputs (token-set F1 and Jaccard). The lxml
+extractor is also timed with each page's learned selector, as it runs once
+a host's extraction profile is in place.
+
+Run from backend/: python benchmarks/extract_benchmark.py [--rounds N] [--fixtures DIR]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+from typing import Callable, Dict, List, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import (  # noqa: E402
+    LXML_AVAILABLE, MAX_MAIN_TEXT, extract_article, extract_main_text_from_html, extract_main_text_lxml,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def load_fixtures(directory: str) -> Dict[str, bytes]:
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                pages[name] = f.read()
+    return pages
+
+
+def tokens(text: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(text[:MAX_MAIN_TEXT].lower()))
+
+
+def agreement(a: str, b: str) -> Dict[str, float]:
+    ta, tb = tokens(a), tokens(b)
+    if not ta and not tb:
+        return {'f1': 1.0, 'jaccard': 1.0}
+    common = len(ta & tb)
+    precision = common / len(tb) if tb else 0.0
+    recall = common / len(ta) if ta else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {'f1': f1, 'jaccard': common / len(ta | tb)}
+
+
+def throughput(extract: Callable[[bytes], str], pages: List[bytes], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            extract(html)
+    elapsed = time.perf_counter() - started
+    return len(pages) * rounds / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the fixture set per extractor")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of saved article pages")
+    args = parser.parse_args()
+
+    if not LXML_AVAILABLE:
+        sys.exit("lxml is not installed")
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        sys.exit(f"no fixtures in {args.fixtures}")
+
+    print(f"{len(fixtures)} pages, {args.rounds} rounds\n")
+    print(f"{'page':<36} {'bs4':>6} {'lxml':>6} {'F1':>6} {'Jacc':>6}")
+    f1s, jaccards = [], []
+    for name, html in fixtures.items():
+        baseline = extract_main_text_from_html(html)
+        candidate = extract_main_text_lxml(html)
+        score = agreement(baseline, candidate)
+        f1s.append(score['f1'])
+        jaccards.append(score['jaccard'])
+        print(f"{name:<36} {len(baseline):>6} {len(candidate):>6} {score['f1']:>6.3f} {score['jaccard']:>6.3f}")
+
+    pages = list(fixtures.values())
+    bs4_rate = throughput(extract_main_text_from_html, pages, args.rounds)
+    lxml_rate = throughput(extract_main_text_lxml, pages, args.rounds)
+    selectors = {html: extract_article(html).selector for html in pages}
+    profile_rate = throughput(lambda html: extract_article(html, selector=selectors[html]).text, pages, args.rounds)
+
+    print(f"\nagreement  F1 mean {statistics.mean(f1s):.3f} median {statistics.median(f1s):.3f}"
+          f" | Jaccard mean {statistics.mean(jaccards):.3f} median {statistics.median(jaccards):.3f}")
+    print(f"bs4           {bs4_rate:8.1f} pages/sec")
+    print(f"lxml          {lxml_rate:8.1f} pages/sec  ({lxml_rate / bs4_rate:.1f}x)")
+    print(f"lxml+profile  {profile_rate:8.1f} pages/sec  ({profile_rate / bs4_rate:.1f}x,"
+          f" {sum(1 for s in selectors.values() if s)}/{len(pages)} pages with a selector)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+LLM summarization benchmark against a local mock server
+Starts an OpenAI-compatible /v1/chat/completions mock (aiohttp) that answers
+after a fixed latency and reports token usage, then summarizes the article
+texts of the saved pages in fixtures/ three ways:
+
+- sequential: one request at a time on a fresh connection, as the collector
+  did when ENABLE_SUMMARY was on
+- service: the shared LLMSummarizer from collector worker threads
+- cached: the same articles again, answered from the response cache
+
+It also shows the per-run token budget and the timeout fallback. No real
+API key or network access is needed; the database cache goes to a temporary
+SQLite file.
+
+Run from backend/: python benchmarks/summary_benchmark.py [--latency MS] [--copies N] [--concurrency N]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "summary_benchmark.db")
+os.environ.setdefault("DB_TYPE", "sqlite")
+
+import requests  # noqa: E402
+from aiohttp import web  # noqa: E402
+
+from database import db  # noqa: E402
+from parsers import extract_article_text  # noqa: E402
+from llm_summarizer import LLMSummarizer, estimate_tokens  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def load_articles(directory: str, copies: int) -> List[Tuple[str, str]]:
+    """(title, text) pairs; copies are made distinct so they are not cache hits"""
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                text = extract_article_text(f.read())
+            if text:
+                texts.append((os.path.splitext(name)[0], text))
+    return [(f"{title} #{i}", text) for i in range(copies) for title, text in texts]
+
+
+class MockServer:
+    """OpenAI-compatible chat completions endpoint on its own loop thread"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    async def _completions(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests += 1
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self._in_flight -= 1
+        prompt = "".join(m["content"] for m in body["messages"])
+        content = "목업 요약입니다. " + prompt[-120:].replace("\n", " ")
+        return web.json_response({
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(content)},
+        })
+
+    async def _start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._completions)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+    def start(self) -> str:
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop)
+        self._ready.wait()
+        return f"http://127.0.0.1:{self.port}/v1"
+
+
+def sequential(base_url: str, summarizer: LLMSummarizer, articles: List[Tuple[str, str]]) -> float:
+    started = time.perf_counter()
+    for title, text in articles:
+        payload, _ = summarizer.build_request(title, text, "bench")
+        resp = requests.post(f"{base_url}/chat/completions", json=payload,
+                             headers={"Authorization": "Bearer test", "Connection": "close"}, timeout=30)
+        resp.json()["choices"][0]["message"]["content"]
+    return time.perf_counter() - started
+
+
+def threaded(summarizer: LLMSummarizer, articles: List[Tuple[str, str]], workers: int) -> Tuple[float, int]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda a: summarizer.summarize_sync(a[0], a[1], "bench"), articles))
+    return time.perf_counter() - started, sum(1 for r in results if r)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=300, help="mock response latency in ms")
+    parser.add_argument("--copies", type=int, default=4, help="distinct copies of each fixture article")
+    parser.add_argument("--concurrency", type=int, default=8, help="service request concurrency")
+    parser.add_argument("--workers", type=int, default=8, help="collector worker threads")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of saved article pages")
+    args = parser.parse_args()
+
+    articles = load_articles(args.fixtures, args.copies)
+    if not articles:
+        sys.exit(f"no fixtures in {args.fixtures}")
+    db.init_database()
+    server = MockServer(args.latency / 1000)
+    base_url = server.start()
+    print(f"{len(articles)} articles, mock latency {args.latency:.0f} ms, concurrency {args.concurrency}\n")
+
+    service = LLMSummarizer(api_key="test", base_url=base_url, concurrency=args.concurrency)
+    seq = sequential(base_url, service, articles)
+    print(f"{'sequential':<12} {seq:>7.2f}s {len(articles) / seq:>7.1f} articles/s")
+
+    server.peak_in_flight = 0
+    service.begin_run()
+    elapsed, ok = threaded(service, articles, args.workers)
+    stats = service.stats()
+    print(f"{'service':<12} {elapsed:>7.2f}s {len(articles) / elapsed:>7.1f} articles/s  "
+          f"({ok} summaries, peak {server.peak_in_flight} in flight, "
+          f"{stats['prompt_tokens'] + stats['completion_tokens']} tokens, ${stats['cost']:.4f})")
+
+    requests_before = server.requests
+    service.begin_run()
+    elapsed, ok = threaded(service, articles, args.workers)
+    print(f"{'cached':<12} {elapsed:>7.2f}s {len(articles) / elapsed:>7.1f} articles/s  "
+          f"({ok} summaries, {service.stats()['cache_hits']} cache hits, "
+          f"{server.requests - requests_before} requests)")
+
+    fresh = [(f"{title} budget", text) for title, text in articles]
+    budget = stats['prompt_tokens'] + stats['completion_tokens']
+    service.max_run_tokens = budget // 2
+    service.begin_run()
+    threaded(service, fresh, args.workers)
+    stats = service.stats()
+    print(f"\nbudget {service.max_run_tokens} tokens: {stats['requests']} requests, "
+          f"{stats['budget_skipped']} fell back to the heuristic, "
+          f"{stats['prompt_tokens'] + stats['completion_tokens']} tokens used")
+    service.close()
+
+    slow = LLMSummarizer(api_key="test", base_url=base_url, concurrency=args.concurrency,
+                         timeout=args.latency / 2000)
+    slow.begin_run()
+    elapsed, ok = threaded(slow, [(f"{title} slow", text) for title, text in articles[:8]], args.workers)
+    print(f"timeout {slow.timeout:.2f}s: {slow.stats()['timeouts']} timeouts, {ok} summaries, {elapsed:.2f}s")
+    slow.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Dictionary term matching benchmark
+Times the per-term substring loops the classifiers used against the
+compiled TermMatcher for each dictionary: enrichment's tech filter
+(TECH_KEYWORDS + NON_TECH_PATTERNS) and the streamlit app's CATEGORIES, on
+the article text of the saved pages in fixtures/. Both sides must return
+the same result for every page. A second table scales a dictionary built from words of the fixtures to show how the
+loop grows with the number of terms while the single pass barely does.
+
+Run from backend/: python benchmarks/term_match_benchmark.py [--rounds N] [--fixtures DIR]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from typing import Callable, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.append(os.path.join(os.path.dirname(BACKEND_DIR), "streamlit_app"))
+
+from enrichment import NON_TECH_PATTERNS, TECH_KEYWORDS, TECH_MATCHER  # noqa: E402
+from parsers import extract_article_text  # noqa: E402
+from term_matcher import AHOCORASICK_AVAILABLE, TermMatcher  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SCALE_SIZES = (100, 300, 1000, 3000)
+
+
+def load_texts(directory: str) -> List[str]:
+    texts = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                texts.append(extract_article_text(f.read()))
+    return texts
+
+
+def per_call_us(func: Callable[[str], object], texts: List[str], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - started) / (rounds * len(texts)) * 1e6
+
+
+def tech_filter_loop(text: str):
+    combined = text.lower()
+    return (sum(1 for kw in TECH_KEYWORDS if kw in combined),
+            sum(1 for pattern in NON_TECH_PATTERNS if pattern in combined))
+
+
+def tech_filter_matcher(text: str):
+    matches = TECH_MATCHER.scan(text.lower())
+    return matches.count("tech"), matches.count("non_tech")
+
+
+def cases():
+    yield "tech filter", len(TECH_MATCHER), tech_filter_loop, tech_filter_matcher
+
+    try:
+        from playlist_collections import CATEGORIES, _pick_best_category
+    except ImportError as e:
+        print(f"skipping CATEGORIES: {e}")
+    else:
+        def category_loop(text: str):
+            text_low = (text + " ").lower()
+            best, best_hits = ("기타", "기타", []), 0
+            for main_cat, subcats in CATEGORIES.items():
+                for sub_cat, keywords in subcats.items():
+                    hits = [kw for kw in keywords if kw.lower() in text_low]
+                    if len(hits) > best_hits:
+                        best, best_hits = (main_cat, sub_cat, hits), len(hits)
+            return best
+        terms = sum(len(keywords) for subcats in CATEGORIES.values() for keywords in subcats.values())
+        yield "categories", terms, category_loop, lambda text: _pick_best_category(text, "")
+
+
+def scaled_terms(texts: List[str], size: int, rng: random.Random) -> List[str]:
+    """Synthetic dictionary: fixture words, some suffixed so that not every term hits"""
+    words = sorted({w.lower() for text in texts for w in re.findall(r"\w{2,}", text)})
+    return [w + rng.choice(("", "x", "q")) for w in rng.choices(words, k=size)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200, help="passes over the fixture texts per matcher")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of saved article pages")
+    args = parser.parse_args()
+
+    texts = [text for text in load_texts(args.fixtures) if text]
+    if not texts:
+        sys.exit(f"no fixtures in {args.fixtures}")
+    backend = "pyahocorasick" if AHOCORASICK_AVAILABLE else "per-term fallback"
+    avg_chars = sum(len(t) for t in texts) // len(texts)
+    print(f"{len(texts)} texts (avg {avg_chars} chars), {args.rounds} rounds, matcher: {backend}\n")
+    print(f"{'dictionary':<18} {'terms':>5} {'loop us':>9} {'matcher us':>11} {'speedup':>8}")
+    for name, terms, loop, matcher in cases():
+        for text in texts:
+            if loop(text) != matcher(text):
+                sys.exit(f"{name}: results differ")
+        loop_us = per_call_us(loop, texts, args.rounds)
+        matcher_us = per_call_us(matcher, texts, args.rounds)
+        print(f"{name:<18} {terms:>5} {loop_us:>9.1f} {matcher_us:>11.1f} {loop_us / matcher_us:>7.1f}x")
+
+    print(f"\n{'synthetic':<18} {'terms':>5} {'loop us':>9} {'matcher us':>11} {'speedup':>8}")
+    rng = random.Random(0)
+    rounds = max(1, args.rounds // 4)
+    for size in SCALE_SIZES:
+        terms = scaled_terms(texts, size, rng)
+        matcher = TermMatcher.from_terms(terms)
+
+        def loop(text: str) -> List[str]:
+            low = text.lower()
+            return [term for term in terms if term in low]
+
+        loop_us = per_call_us(loop, texts, rounds)
+        matcher_us = per_call_us(matcher.scan, texts, rounds)
+        print(f"{'fixture words':<18} {size:>5} {loop_us:>9.1f} {matcher_us:>11.1f} {loop_us / matcher_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
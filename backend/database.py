@@ -1,8 +1,11 @@
 import os
+import uuid
+import socket
 import sqlite3
 import json
 import logging
-from typing import Optional, Any, Dict, List
+from datetime import datetime, date, timedelta
+from typing import Optional, Any, Dict, List, Iterable
 from urllib.parse import urlparse
 
 # Try to import psycopg2 - it might not be available in all environments
@@ -37,6 +40,9 @@ except ImportError:
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL")
 DB_TYPE = os.getenv("DB_TYPE", "auto").lower()
+# Lease that keeps keyword rollup rebuilds from overlapping (expires if a rebuild dies)
+KEYWORD_REBUILD_LOCK = "keyword_rollup_rebuild"
+KEYWORD_REBUILD_LOCK_TTL = int(os.getenv("KEYWORD_REBUILD_LOCK_TTL", "1800"))
 SQLITE_PATH = os.getenv("SQLITE_PATH", "/tmp/news.db")
 
 class DatabaseConnection:
@@ -59,6 +65,11 @@ class DatabaseConnection:
             self._init_postgres_pool()
         
         logger.info(f"Database type: {self.db_type}")
+    
+    @property
+    def placeholder(self) -> str:
+        """Query parameter placeholder for the active database"""
+        return "%s" if self.db_type == "postgresql" else "?"
         
     def _init_postgres_pool(self):
         """Initialize PostgreSQL connection pool"""
@@ -160,6 +171,24 @@ class DatabaseConnection:
         finally:
             self.return_connection(conn)
     
+    def execute_many(self, query: str, params_seq: Iterable[tuple]) -> int:
+        """Execute the same INSERT/UPDATE statement for many parameter tuples in one transaction"""
+        params_seq = list(params_seq)
+        if not params_seq:
+            return 0
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(query, params_seq)
+            conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            logger.error(f"Batch execution error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+    
     def init_database(self):
         """Initialize database tables"""
         conn = self.get_connection()
@@ -180,6 +209,10 @@ class DatabaseConnection:
             raise
         finally:
             self.return_connection(conn)
+        
+        # One-time backfill of the keyword rollup for archives created before it existed
+        if not self.execute_query("SELECT 1 FROM keyword_daily_counts LIMIT 1"):
+            self.rebuild_keyword_daily_counts()
     
     def _create_postgres_tables(self, cursor):
         """Create PostgreSQL tables with enhanced schema"""
@@ -240,6 +273,205 @@ class DatabaseConnection:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_keywords ON articles USING GIN(keywords)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_collection_articles_collection ON collection_articles(collection_id)")
         
+        # Per-day keyword counts, maintained at ingest for trend queries
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_daily_counts (
+                day DATE NOT NULL,
+                keyword TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, keyword)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyword_daily_counts_keyword ON keyword_daily_counts(keyword, day)")
+        
+        # MinHash LSH band buckets for related-article lookups
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_lsh_buckets (
+                bucket BIGINT NOT NULL,
+                article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+                PRIMARY KEY (bucket, article_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_lsh_buckets_article ON article_lsh_buckets(article_id)")
+        
+        # SimHash fingerprints of recent stories and skipped near-duplicate copies
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_simhash (
+                link TEXT PRIMARY KEY,
+                simhash BIGINT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_simhash_created ON article_simhash(created_at)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_duplicates (
+                link TEXT PRIMARY KEY,
+                canonical_link TEXT NOT NULL,
+                source TEXT,
+                title TEXT,
+                distance INTEGER,
+                detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_duplicates_canonical ON article_duplicates(canonical_link)")
+        
+        # HTTP validators and body hash of the last fetch of each feed URL
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_state (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                last_status INTEGER,
+                last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_changed TIMESTAMP
+            )
+        """)
+        
+        # Newest entry seen per feed; the page walk stops once it reaches this point
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_watermarks (
+                feed_url TEXT PRIMARY KEY,
+                last_guid TEXT,
+                last_published TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Adaptive polling state: learned publish rate and next due time per feed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_schedule (
+                feed_url TEXT PRIMARY KEY,
+                source TEXT,
+                rate_per_hour DOUBLE PRECISION,
+                interval_seconds DOUBLE PRECISION,
+                next_poll_at TIMESTAMP,
+                last_polled_at TIMESTAMP,
+                last_new_entries INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Feed health: latency window, failure streak and circuit-breaker state per feed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_health (
+                feed_url TEXT PRIMARY KEY,
+                source TEXT,
+                state TEXT NOT NULL DEFAULT 'closed',
+                consecutive_failures INTEGER DEFAULT 0,
+                trips INTEGER DEFAULT 0,
+                total_successes INTEGER DEFAULT 0,
+                total_failures INTEGER DEFAULT 0,
+                latencies TEXT,
+                last_latency_ms DOUBLE PRECISION,
+                last_error TEXT,
+                last_success_at TIMESTAMP,
+                last_failure_at TIMESTAMP,
+                open_until TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """)
+        
+        # Named leases (owner + expiry renewed by heartbeat) for single-leader jobs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS locks (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                acquired_at TIMESTAMP,
+                heartbeat_at TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            )
+        """)
+        
+        # Learned main-content selector per host (see extraction_profiles.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS extraction_profiles (
+                host TEXT PRIMARY KEY,
+                selector TEXT NOT NULL,
+                samples INTEGER DEFAULT 0,
+                hits INTEGER DEFAULT 0,
+                misses INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Whether a feed's own entries carry full article text (page fetch skipped)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_content_mode (
+                feed_url TEXT PRIMARY KEY,
+                full_text BOOLEAN NOT NULL,
+                richness DOUBLE PRECISION,
+                samples INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Raw article HTML: zstd blobs on disk keyed by SHA-256, indexed by link and fetch time
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_blobs (
+                sha256 TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                dict_id TEXT,
+                raw_size INTEGER,
+                stored_size INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_snapshots (
+                id SERIAL PRIMARY KEY,
+                link TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                charset TEXT,
+                fetched_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_snapshots_link ON html_snapshots(link, fetched_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_snapshots_fetched ON html_snapshots(fetched_at)")
+        
+        # Offline reprocessing jobs: filters and the last article id written (resume point)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reprocess_jobs (
+                name TEXT PRIMARY KEY,
+                options TEXT,
+                status TEXT NOT NULL,
+                last_id INTEGER DEFAULT 0,
+                processed INTEGER DEFAULT 0,
+                changed INTEGER DEFAULT 0,
+                dropped INTEGER DEFAULT 0,
+                error TEXT,
+                started_at TIMESTAMP,
+                updated_at TIMESTAMP
+            )
+        """)
+        
+        # Memoized enrichment per article body and pipeline version
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS enrichment_cache (
+                content_hash TEXT NOT NULL,
+                pipeline_version TEXT NOT NULL,
+                summary TEXT,
+                keywords TEXT,
+                is_tech BOOLEAN NOT NULL,
+                category TEXT,
+                created_at TIMESTAMP,
+                PRIMARY KEY (content_hash, pipeline_version)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_cache_created ON enrichment_cache(created_at)")
+        
+        # LLM responses keyed by a hash of the full request (model, prompts, limits)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                prompt_hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                created_at TIMESTAMP
+            )
+        """)
+        
         # Update trigger for updated_at
         cursor.execute("""
             CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -315,6 +547,205 @@ class DatabaseConnection:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published DESC)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_collection_articles_collection ON collection_articles(collection_id)")
+        
+        # Per-day keyword counts, maintained at ingest for trend queries
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS keyword_daily_counts (
+                day TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, keyword)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_keyword_daily_counts_keyword ON keyword_daily_counts(keyword, day)")
+        
+        # MinHash LSH band buckets for related-article lookups
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_lsh_buckets (
+                bucket INTEGER NOT NULL,
+                article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE,
+                PRIMARY KEY (bucket, article_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_lsh_buckets_article ON article_lsh_buckets(article_id)")
+        
+        # SimHash fingerprints of recent stories and skipped near-duplicate copies
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_simhash (
+                link TEXT PRIMARY KEY,
+                simhash INTEGER NOT NULL,
+                created_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_simhash_created ON article_simhash(created_at)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_duplicates (
+                link TEXT PRIMARY KEY,
+                canonical_link TEXT NOT NULL,
+                source TEXT,
+                title TEXT,
+                distance INTEGER,
+                detected_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_duplicates_canonical ON article_duplicates(canonical_link)")
+        
+        # HTTP validators and body hash of the last fetch of each feed URL
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_state (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                last_status INTEGER,
+                last_checked TEXT DEFAULT (datetime('now')),
+                last_changed TEXT
+            )
+        """)
+        
+        # Newest entry seen per feed; the page walk stops once it reaches this point
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_watermarks (
+                feed_url TEXT PRIMARY KEY,
+                last_guid TEXT,
+                last_published TEXT,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        
+        # Adaptive polling state: learned publish rate and next due time per feed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_schedule (
+                feed_url TEXT PRIMARY KEY,
+                source TEXT,
+                rate_per_hour REAL,
+                interval_seconds REAL,
+                next_poll_at TEXT,
+                last_polled_at TEXT,
+                last_new_entries INTEGER,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        
+        # Feed health: latency window, failure streak and circuit-breaker state per feed
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_health (
+                feed_url TEXT PRIMARY KEY,
+                source TEXT,
+                state TEXT NOT NULL DEFAULT 'closed',
+                consecutive_failures INTEGER DEFAULT 0,
+                trips INTEGER DEFAULT 0,
+                total_successes INTEGER DEFAULT 0,
+                total_failures INTEGER DEFAULT 0,
+                latencies TEXT,
+                last_latency_ms REAL,
+                last_error TEXT,
+                last_success_at TEXT,
+                last_failure_at TEXT,
+                open_until TEXT,
+                updated_at TEXT
+            )
+        """)
+        
+        # Named leases (owner + expiry renewed by heartbeat) for single-leader jobs
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS locks (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                acquired_at TEXT,
+                heartbeat_at TEXT,
+                expires_at TEXT NOT NULL
+            )
+        """)
+        
+        # Learned main-content selector per host (see extraction_profiles.py)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS extraction_profiles (
+                host TEXT PRIMARY KEY,
+                selector TEXT NOT NULL,
+                samples INTEGER DEFAULT 0,
+                hits INTEGER DEFAULT 0,
+                misses INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        
+        # Whether a feed's own entries carry full article text (page fetch skipped)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS feed_content_mode (
+                feed_url TEXT PRIMARY KEY,
+                full_text INTEGER NOT NULL,
+                richness REAL,
+                samples INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        
+        # Raw article HTML: zstd blobs on disk keyed by SHA-256, indexed by link and fetch time
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_blobs (
+                sha256 TEXT PRIMARY KEY,
+                codec TEXT NOT NULL,
+                dict_id TEXT,
+                raw_size INTEGER,
+                stored_size INTEGER,
+                created_at TEXT DEFAULT (datetime('now'))
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS html_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                link TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                charset TEXT,
+                fetched_at TEXT NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_snapshots_link ON html_snapshots(link, fetched_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_html_snapshots_fetched ON html_snapshots(fetched_at)")
+        
+        # Offline reprocessing jobs: filters and the last article id written (resume point)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reprocess_jobs (
+                name TEXT PRIMARY KEY,
+                options TEXT,
+                status TEXT NOT NULL,
+                last_id INTEGER DEFAULT 0,
+                processed INTEGER DEFAULT 0,
+                changed INTEGER DEFAULT 0,
+                dropped INTEGER DEFAULT 0,
+                error TEXT,
+                started_at TEXT,
+                updated_at TEXT
+            )
+        """)
+        
+        # Memoized enrichment per article body and pipeline version
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS enrichment_cache (
+                content_hash TEXT NOT NULL,
+                pipeline_version TEXT NOT NULL,
+                summary TEXT,
+                keywords TEXT,
+                is_tech INTEGER NOT NULL,
+                category TEXT,
+                created_at TEXT,
+                PRIMARY KEY (content_hash, pipeline_version)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_cache_created ON enrichment_cache(created_at)")
+        
+        # LLM responses keyed by a hash of the full request (model, prompts, limits)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                prompt_hash TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                prompt_tokens INTEGER DEFAULT 0,
+                completion_tokens INTEGER DEFAULT 0,
+                created_at TEXT
+            )
+        """)
     
     def insert_article(self, article_data: Dict) -> Optional[int]:
         """Insert new article and return ID"""
@@ -380,6 +811,68 @@ class DatabaseConnection:
         finally:
             self.return_connection(conn)
     
+    def upsert_articles(self, articles: List[Dict], previous: Optional[Dict[str, Dict]] = None,
+                        chunk_size: int = 100) -> Dict[str, int]:
+        """
+        Insert or update a batch of articles by link in one transaction and return
+        their ids by link. Each chunk is one multi-row INSERT ... ON CONFLICT (link)
+        DO UPDATE ... RETURNING (the drivers' executemany drops returned rows).
+        With `previous` (the stored rows by link, with published and keywords) the
+        keyword rollup moves by the batch's change in the same transaction.
+        """
+        if not articles:
+            return {}
+        p = self.placeholder
+        previous = previous or {}
+        ids: Dict[str, int] = {}
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(articles), chunk_size):
+                chunk = articles[start:start + chunk_size]
+                params = []
+                for article in chunk:
+                    keywords = article.get('keywords')
+                    params.extend((
+                        article.get('title'),
+                        article.get('link'),
+                        article.get('published'),
+                        article.get('source'),
+                        article.get('raw_text'),
+                        article.get('summary'),
+                        json.dumps(keywords) if isinstance(keywords, list) else keywords,
+                        article.get('category'),
+                        article.get('language')
+                    ))
+                values = ", ".join([f"({', '.join([p] * 9)})"] * len(chunk))
+                cursor.execute(f"""
+                    INSERT INTO articles (title, link, published, source, raw_text, summary, keywords, category, language)
+                    VALUES {values}
+                    ON CONFLICT (link) DO UPDATE SET
+                        title = EXCLUDED.title,
+                        summary = EXCLUDED.summary,
+                        keywords = EXCLUDED.keywords,
+                        updated_at = CURRENT_TIMESTAMP
+                    RETURNING id, link
+                """, tuple(params))
+                ids.update({link: article_id for article_id, link in cursor.fetchall()})
+            changes = []
+            for article in articles:
+                stored = previous.get(article['link'])
+                if stored:
+                    changes.append((stored.get('published'), stored.get('keywords'), article.get('keywords')))
+                else:
+                    changes.append((article.get('published'), None, article.get('keywords')))
+            self._apply_keyword_changes(cursor, changes)
+            conn.commit()
+            return ids
+        except Exception as e:
+            logger.error(f"Article batch upsert error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+    
     def get_articles_with_filters(self, limit: int = 100, offset: int = 0, **filters) -> List[Dict]:
         """Get articles with advanced filtering"""
         conditions = []
@@ -470,6 +963,533 @@ class DatabaseConnection:
             sorted_keywords = sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
             return [{"keyword": k, "count": v} for k, v in sorted_keywords]
     
+    @staticmethod
+    def _to_day(published: Any) -> str:
+        """Normalize a published value to a YYYY-MM-DD day key"""
+        if isinstance(published, (datetime, date)):
+            return published.strftime("%Y-%m-%d")
+        value = str(published or "").strip()
+        if value:
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+            except ValueError:
+                pass
+            try:
+                import dateutil.parser
+                return dateutil.parser.parse(value).strftime("%Y-%m-%d")
+            except Exception:
+                pass
+        return datetime.now().strftime("%Y-%m-%d")
+    
+    @staticmethod
+    def _keyword_set(keywords: Any) -> set:
+        """Distinct keywords of a stored value (JSON list, comma-joined string or list)"""
+        if isinstance(keywords, str):
+            try:
+                keywords = json.loads(keywords)
+            except (json.JSONDecodeError, TypeError):
+                keywords = keywords.split(',')
+        if not isinstance(keywords, list):
+            return set()
+        return {kw.strip() for kw in keywords if isinstance(kw, str) and kw.strip()}
+    
+    def _keyword_count_upsert(self) -> str:
+        p = self.placeholder
+        return f"""
+            INSERT INTO keyword_daily_counts (day, keyword, count)
+            VALUES ({p}, {p}, {p})
+            ON CONFLICT (day, keyword) DO UPDATE SET
+                count = keyword_daily_counts.count + EXCLUDED.count
+        """
+    
+    def _apply_keyword_changes(self, cursor, changes: Iterable[tuple]) -> None:
+        """
+        Move the rollup by (published, old_keywords, new_keywords) article changes
+        on the caller's cursor, netted per day and keyword into one executemany
+        """
+        deltas: Dict[tuple, int] = {}
+        for published, old_keywords, new_keywords in changes:
+            day = self._to_day(published)
+            for kw in self._keyword_set(old_keywords):
+                deltas[(day, kw)] = deltas.get((day, kw), 0) - 1
+            for kw in self._keyword_set(new_keywords):
+                deltas[(day, kw)] = deltas.get((day, kw), 0) + 1
+        params = [(day, kw, delta) for (day, kw), delta in deltas.items() if delta]
+        if params:
+            cursor.executemany(self._keyword_count_upsert(), params)
+    
+    def update_keyword_counts(self, published: Any, keywords: Optional[List[str]], delta: int = 1) -> None:
+        """Add (or with delta=-1 remove) one article's keywords to the per-day rollup"""
+        unique_keywords = self._keyword_set(keywords or [])
+        if not unique_keywords:
+            return
+        day = self._to_day(published)
+        self.execute_many(self._keyword_count_upsert(), [(day, kw, delta) for kw in unique_keywords])
+    
+    def rebuild_keyword_daily_counts(self) -> int:
+        """
+        Recompute the per-day keyword rollup from every article (backfill / repair).
+        The read, delete and insert run in one transaction that holds the rollup's
+        write lock, so readers see the old rows until it commits and ingest
+        upserts wait instead of being lost. Rebuilds are serialized with a lease;
+        returns the number of rollup rows, or 0 when another rebuild is running.
+        """
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if not self.try_acquire_lock(KEYWORD_REBUILD_LOCK, owner, KEYWORD_REBUILD_LOCK_TTL):
+            logger.info("📊 Keyword rollup rebuild already running; skipped")
+            return 0
+        
+        p = self.placeholder
+        conn = self.get_connection()
+        try:
+            if self.db_type == "postgresql":
+                cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                # Blocks writers, not readers, until commit
+                cursor.execute("LOCK TABLE keyword_daily_counts IN EXCLUSIVE MODE")
+            else:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SELECT published, keywords FROM articles WHERE keywords IS NOT NULL")
+            rows = cursor.fetchall()
+            
+            counts: Dict[tuple, int] = {}
+            for row in rows:
+                keywords = self._keyword_set(row['keywords'])
+                if not keywords:
+                    continue
+                day = self._to_day(row['published'])
+                for kw in keywords:
+                    counts[(day, kw)] = counts.get((day, kw), 0) + 1
+            
+            cursor.execute("DELETE FROM keyword_daily_counts")
+            if counts:
+                cursor.executemany(
+                    f"INSERT INTO keyword_daily_counts (day, keyword, count) VALUES ({p}, {p}, {p})",
+                    [(day, kw, n) for (day, kw), n in counts.items()]
+                )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Keyword rollup rebuild error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+            self.release_lock(KEYWORD_REBUILD_LOCK, owner)
+        
+        logger.info(f"📊 Keyword rollup rebuilt: {len(counts)} day/keyword rows from {len(rows)} articles")
+        return len(counts)
+    
+    def get_keyword_daily_counts(self, keywords: List[str], day_from: str, day_to: str) -> List[Dict]:
+        """Fetch rollup rows for the given keywords within [day_from, day_to]"""
+        if not keywords:
+            return []
+        p = self.placeholder
+        in_clause = ", ".join([p] * len(keywords))
+        return self.execute_query(f"""
+            SELECT day, keyword, count FROM keyword_daily_counts
+            WHERE keyword IN ({in_clause}) AND day >= {p} AND day <= {p}
+        """, tuple(keywords) + (day_from, day_to))
+    
+    def get_feed_state(self, feed_url: str) -> Optional[Dict]:
+        """Stored validators for a feed URL (None if it was never fetched)"""
+        rows = self.execute_query(
+            f"SELECT * FROM feed_state WHERE feed_url = {self.placeholder}", (feed_url,)
+        )
+        return rows[0] if rows else None
+    
+    def save_feed_state(self, feed_url: str, etag: Optional[str], last_modified: Optional[str],
+                        content_hash: Optional[str], status: int, changed: bool) -> None:
+        """Record the outcome of a feed fetch; last_changed only moves when the body changed"""
+        p = self.placeholder
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.execute_update(f"""
+            INSERT INTO feed_state (feed_url, etag, last_modified, content_hash, last_status, last_checked, last_changed)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (feed_url) DO UPDATE SET
+                etag = COALESCE(EXCLUDED.etag, feed_state.etag),
+                last_modified = COALESCE(EXCLUDED.last_modified, feed_state.last_modified),
+                content_hash = COALESCE(EXCLUDED.content_hash, feed_state.content_hash),
+                last_status = EXCLUDED.last_status,
+                last_checked = EXCLUDED.last_checked,
+                last_changed = COALESCE(EXCLUDED.last_changed, feed_state.last_changed)
+        """, (feed_url, etag, last_modified, content_hash, status, now, now if changed else None))
+    
+    def get_feed_watermark(self, feed_url: str) -> Optional[Dict]:
+        """Newest entry recorded for a feed (None before its first collection)"""
+        rows = self.execute_query(
+            f"SELECT last_guid, last_published FROM feed_watermarks WHERE feed_url = {self.placeholder}",
+            (feed_url,)
+        )
+        return rows[0] if rows else None
+    
+    def save_feed_watermark(self, feed_url: str, last_guid: str, last_published: Optional[str]) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO feed_watermarks (feed_url, last_guid, last_published, updated_at)
+            VALUES ({p}, {p}, {p}, {p})
+            ON CONFLICT (feed_url) DO UPDATE SET
+                last_guid = EXCLUDED.last_guid,
+                last_published = EXCLUDED.last_published,
+                updated_at = EXCLUDED.updated_at
+        """, (feed_url, last_guid, last_published, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def get_feed_schedules(self) -> List[Dict]:
+        return self.execute_query("SELECT * FROM feed_schedule")
+    
+    def save_feed_schedule(self, feed_url: str, source: str, rate_per_hour: float, interval_seconds: float,
+                           next_poll_at: str, last_polled_at: Optional[str], last_new_entries: Optional[int]) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO feed_schedule (feed_url, source, rate_per_hour, interval_seconds, next_poll_at,
+                                       last_polled_at, last_new_entries, updated_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (feed_url) DO UPDATE SET
+                source = EXCLUDED.source,
+                rate_per_hour = EXCLUDED.rate_per_hour,
+                interval_seconds = EXCLUDED.interval_seconds,
+                next_poll_at = EXCLUDED.next_poll_at,
+                last_polled_at = EXCLUDED.last_polled_at,
+                last_new_entries = EXCLUDED.last_new_entries,
+                updated_at = EXCLUDED.updated_at
+        """, (feed_url, source, rate_per_hour, interval_seconds, next_poll_at, last_polled_at,
+              last_new_entries, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def get_feed_health(self) -> List[Dict]:
+        return self.execute_query("SELECT * FROM feed_health")
+    
+    def save_feed_health(self, health: Dict) -> None:
+        """Upsert one feed's health row (all columns of feed_health except updated_at)"""
+        columns = ['feed_url', 'source', 'state', 'consecutive_failures', 'trips', 'total_successes',
+                   'total_failures', 'latencies', 'last_latency_ms', 'last_error', 'last_success_at',
+                   'last_failure_at', 'open_until']
+        p = self.placeholder
+        updates = ",\n                ".join(f"{c} = EXCLUDED.{c}" for c in columns[1:] + ['updated_at'])
+        self.execute_update(f"""
+            INSERT INTO feed_health ({', '.join(columns)}, updated_at)
+            VALUES ({', '.join([p] * (len(columns) + 1))})
+            ON CONFLICT (feed_url) DO UPDATE SET
+                {updates}
+        """, tuple(health.get(c) for c in columns) + (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),))
+    
+    def get_source_publish_counts(self, since: datetime) -> Dict[str, int]:
+        """Articles per source published since the given time (publish-rate history)"""
+        rows = self.execute_query(f"""
+            SELECT source, COUNT(*) AS count FROM articles
+            WHERE published >= {self.placeholder}
+            GROUP BY source
+        """, (since.strftime("%Y-%m-%d %H:%M:%S"),))
+        return {row['source']: row['count'] for row in rows}
+    
+    def try_acquire_lock(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take the named lease if it is free or expired, or renew it if `owner` holds it"""
+        p = self.placeholder
+        now = datetime.now()
+        now_str = now.strftime("%Y-%m-%d %H:%M:%S.%f")
+        expires = (now + timedelta(seconds=ttl_seconds)).strftime("%Y-%m-%d %H:%M:%S.%f")
+        rows = self.execute_update(f"""
+            INSERT INTO locks (name, owner, acquired_at, heartbeat_at, expires_at)
+            VALUES ({p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (name) DO UPDATE SET
+                owner = EXCLUDED.owner,
+                acquired_at = CASE WHEN locks.owner = EXCLUDED.owner
+                                   THEN locks.acquired_at ELSE EXCLUDED.acquired_at END,
+                heartbeat_at = EXCLUDED.heartbeat_at,
+                expires_at = EXCLUDED.expires_at
+            WHERE locks.owner = EXCLUDED.owner OR locks.expires_at < {p}
+        """, (name, owner, now_str, now_str, expires, now_str))
+        return rows > 0
+    
+    def release_lock(self, name: str, owner: str) -> None:
+        p = self.placeholder
+        self.execute_update(f"DELETE FROM locks WHERE name = {p} AND owner = {p}", (name, owner))
+    
+    def get_lock(self, name: str) -> Optional[Dict]:
+        rows = self.execute_query(f"SELECT * FROM locks WHERE name = {self.placeholder}", (name,))
+        return rows[0] if rows else None
+    
+    def get_extraction_profiles(self) -> List[Dict]:
+        return self.execute_query("SELECT host, selector, samples, hits, misses FROM extraction_profiles")
+    
+    def save_extraction_profile(self, host: str, selector: str, samples: int, hits: int, misses: int) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO extraction_profiles (host, selector, samples, hits, misses, updated_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (host) DO UPDATE SET
+                selector = EXCLUDED.selector,
+                samples = EXCLUDED.samples,
+                hits = EXCLUDED.hits,
+                misses = EXCLUDED.misses,
+                updated_at = EXCLUDED.updated_at
+        """, (host, selector, samples, hits, misses, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def delete_extraction_profile(self, host: str) -> None:
+        self.execute_update(f"DELETE FROM extraction_profiles WHERE host = {self.placeholder}", (host,))
+    
+    def get_feed_content_modes(self) -> List[Dict]:
+        return self.execute_query("SELECT feed_url, full_text, richness, samples FROM feed_content_mode")
+    
+    def save_feed_content_mode(self, feed_url: str, full_text: bool, richness: float, samples: int) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO feed_content_mode (feed_url, full_text, richness, samples, updated_at)
+            VALUES ({p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (feed_url) DO UPDATE SET
+                full_text = EXCLUDED.full_text,
+                richness = EXCLUDED.richness,
+                samples = EXCLUDED.samples,
+                updated_at = EXCLUDED.updated_at
+        """, (feed_url, full_text, richness, samples, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def save_html_blob(self, sha256: str, codec: str, dict_id: Optional[str], raw_size: int, stored_size: int) -> bool:
+        """Register a stored blob; False when it was already known"""
+        p = self.placeholder
+        return self.execute_update(f"""
+            INSERT INTO html_blobs (sha256, codec, dict_id, raw_size, stored_size, created_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (sha256) DO NOTHING
+        """, (sha256, codec, dict_id, raw_size, stored_size, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))) > 0
+    
+    def add_html_snapshot(self, link: str, sha256: str, charset: Optional[str], fetched_at: str) -> None:
+        p = self.placeholder
+        self.execute_update(
+            f"INSERT INTO html_snapshots (link, sha256, charset, fetched_at) VALUES ({p}, {p}, {p}, {p})",
+            (link, sha256, charset, fetched_at)
+        )
+    
+    def get_html_snapshot(self, link: str) -> Optional[Dict]:
+        """Latest stored HTML snapshot of a link with its blob's codec"""
+        rows = self.execute_query(f"""
+            SELECT s.link, s.sha256, s.charset, s.fetched_at, b.codec, b.dict_id
+            FROM html_snapshots s JOIN html_blobs b ON b.sha256 = s.sha256
+            WHERE s.link = {self.placeholder}
+            ORDER BY s.fetched_at DESC
+            LIMIT 1
+        """, (link,))
+        return rows[0] if rows else None
+    
+    def get_recent_html_blobs(self, limit: int) -> List[Dict]:
+        return self.execute_query(
+            f"SELECT sha256, codec, dict_id FROM html_blobs ORDER BY created_at DESC LIMIT {self.placeholder}",
+            (limit,)
+        )
+    
+    def get_html_store_stats(self) -> Dict:
+        blobs = self.execute_query("""
+            SELECT COUNT(*) AS blobs, COALESCE(SUM(raw_size), 0) AS raw_bytes,
+                   COALESCE(SUM(stored_size), 0) AS stored_bytes
+            FROM html_blobs
+        """)[0]
+        snapshots = self.execute_query("SELECT COUNT(*) AS snapshots FROM html_snapshots")[0]
+        return {**blobs, **snapshots}
+    
+    def delete_oldest_html_snapshots(self, limit: int) -> int:
+        p = self.placeholder
+        return self.execute_update(f"""
+            DELETE FROM html_snapshots WHERE id IN (
+                SELECT id FROM html_snapshots ORDER BY fetched_at LIMIT {p}
+            )
+        """, (limit,))
+    
+    def get_orphan_html_blobs(self) -> List[Dict]:
+        """Blobs no snapshot refers to any more"""
+        return self.execute_query("""
+            SELECT b.sha256, b.stored_size FROM html_blobs b
+            WHERE NOT EXISTS (SELECT 1 FROM html_snapshots s WHERE s.sha256 = b.sha256)
+        """)
+    
+    def delete_html_blobs(self, sha256s: List[str]) -> int:
+        return self.execute_many(
+            f"DELETE FROM html_blobs WHERE sha256 = {self.placeholder}", [(sha,) for sha in sha256s]
+        )
+    
+    def get_cached_enrichment(self, content_hash: str, pipeline_version: str) -> Optional[Dict]:
+        p = self.placeholder
+        rows = self.execute_query(f"""
+            SELECT summary, keywords, is_tech, category FROM enrichment_cache
+            WHERE content_hash = {p} AND pipeline_version = {p}
+        """, (content_hash, pipeline_version))
+        return rows[0] if rows else None
+    
+    def save_cached_enrichment(self, content_hash: str, pipeline_version: str, summary: str,
+                               keywords: List[str], is_tech: bool, category: Optional[str]) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO enrichment_cache (content_hash, pipeline_version, summary, keywords, is_tech, category, created_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (content_hash, pipeline_version) DO UPDATE SET
+                summary = EXCLUDED.summary,
+                keywords = EXCLUDED.keywords,
+                is_tech = EXCLUDED.is_tech,
+                category = EXCLUDED.category,
+                created_at = EXCLUDED.created_at
+        """, (content_hash, pipeline_version, summary, json.dumps(keywords), is_tech, category,
+              datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def prune_enrichment_cache(self, namespace: str, current_version: str, older_than: str) -> int:
+        """Drop a namespace's entries from other pipeline versions and entries created before `older_than`"""
+        p = self.placeholder
+        return self.execute_update(f"""
+            DELETE FROM enrichment_cache
+            WHERE (pipeline_version LIKE {p} AND pipeline_version <> {p}) OR created_at < {p}
+        """, (f"{namespace}:%", current_version, older_than))
+    
+    def get_llm_response(self, prompt_hash: str) -> Optional[Dict]:
+        rows = self.execute_query(
+            f"SELECT response, prompt_tokens, completion_tokens FROM llm_cache WHERE prompt_hash = {self.placeholder}",
+            (prompt_hash,)
+        )
+        return rows[0] if rows else None
+    
+    def save_llm_response(self, prompt_hash: str, model: str, response: str,
+                          prompt_tokens: int, completion_tokens: int) -> None:
+        p = self.placeholder
+        self.execute_update(f"""
+            INSERT INTO llm_cache (prompt_hash, model, response, prompt_tokens, completion_tokens, created_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (prompt_hash) DO NOTHING
+        """, (prompt_hash, model, response, prompt_tokens, completion_tokens,
+              datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+    
+    def get_articles_for_reprocess(self, after_id: int, limit: int, since: Optional[str] = None,
+                                   until: Optional[str] = None, sources: Optional[List[str]] = None) -> List[Dict]:
+        """Next chunk of articles by id (keyset pagination), filtered by published date and source"""
+        p = self.placeholder
+        conditions = [f"id > {p}"]
+        params: List[Any] = [after_id]
+        if since:
+            conditions.append(f"published >= {p}")
+            params.append(since)
+        if until:
+            conditions.append(f"published < {p}")
+            params.append(until)
+        if sources:
+            conditions.append(f"source IN ({', '.join([p] * len(sources))})")
+            params.extend(sources)
+        params.append(limit)
+        return self.execute_query(f"""
+            SELECT id, title, link, published, source, raw_text, summary, keywords, category, language
+            FROM articles WHERE {' AND '.join(conditions)}
+            ORDER BY id LIMIT {p}
+        """, tuple(params))
+    
+    def get_articles_by_ids(self, article_ids: List[int]) -> List[Dict]:
+        """Articles with the given ids, with the columns get_articles_for_reprocess returns"""
+        if not article_ids:
+            return []
+        return self.execute_query(f"""
+            SELECT id, title, link, published, source, raw_text, summary, keywords, category, language
+            FROM articles WHERE id IN ({', '.join([self.placeholder] * len(article_ids))})
+            ORDER BY id
+        """, tuple(article_ids))
+    
+    def get_articles_by_links(self, links: List[str], chunk_size: int = 500) -> Dict[str, Dict]:
+        """Stored id, title, summary, keywords and published of the given links, keyed by link"""
+        found: Dict[str, Dict] = {}
+        for start in range(0, len(links), chunk_size):
+            chunk = links[start:start + chunk_size]
+            for row in self.execute_query(f"""
+                SELECT id, link, title, summary, keywords, published
+                FROM articles WHERE link IN ({', '.join([self.placeholder] * len(chunk))})
+            """, tuple(chunk)):
+                found[row['link']] = row
+        return found
+    
+    def bulk_update_enrichment(self, rows: List[Dict], previous: Optional[Dict[int, Dict]] = None) -> int:
+        """
+        Write re-derived text, summary, keywords and category for many articles in
+        one transaction. With `previous` (the stored rows by id, with published and
+        keywords) the keyword rollup moves by the same change in that transaction.
+        """
+        if not rows:
+            return 0
+        p = self.placeholder
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(f"""
+                UPDATE articles SET raw_text = {p}, summary = {p}, keywords = {p}, category = {p}, updated_at = {p}
+                WHERE id = {p}
+            """, [
+                (row['raw_text'], row['summary'], json.dumps(row['keywords']), row['category'], now, row['id'])
+                for row in rows
+            ])
+            updated = cursor.rowcount
+            if previous:
+                self._apply_keyword_changes(cursor, [
+                    (previous[row['id']].get('published'), previous[row['id']].get('keywords'), row['keywords'])
+                    for row in rows if row['id'] in previous
+                ])
+            conn.commit()
+            return updated
+        except Exception as e:
+            logger.error(f"Enrichment update error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+    
+    def delete_articles(self, article_ids: List[int]) -> int:
+        """
+        Delete articles and their dependent rows in one transaction, taking their
+        keywords out of the rollup. SQLite connections do not enforce foreign
+        keys, so ON DELETE CASCADE is not relied on, and SimHash fingerprints
+        are keyed by link.
+        """
+        if not article_ids:
+            return 0
+        p = self.placeholder
+        params = [(article_id,) for article_id in article_ids]
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT published, keywords FROM articles WHERE id IN ({', '.join([p] * len(article_ids))})",
+                tuple(article_ids)
+            )
+            self._apply_keyword_changes(cursor, [(row[0], row[1], None) for row in cursor.fetchall()])
+            cursor.executemany(
+                f"DELETE FROM article_simhash WHERE link IN (SELECT link FROM articles WHERE id = {p})", params
+            )
+            for table in ("article_lsh_buckets", "favorites", "collection_articles"):
+                cursor.executemany(f"DELETE FROM {table} WHERE article_id = {p}", params)
+            cursor.executemany(f"DELETE FROM articles WHERE id = {p}", params)
+            deleted = cursor.rowcount
+            conn.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"Article deletion error: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.return_connection(conn)
+    
+    def get_reprocess_job(self, name: str) -> Optional[Dict]:
+        rows = self.execute_query(f"SELECT * FROM reprocess_jobs WHERE name = {self.placeholder}", (name,))
+        return rows[0] if rows else None
+    
+    def save_reprocess_job(self, name: str, options: str, status: str, last_id: int, processed: int,
+                           changed: int, dropped: int, error: Optional[str] = None) -> None:
+        p = self.placeholder
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.execute_update(f"""
+            INSERT INTO reprocess_jobs (name, options, status, last_id, processed, changed, dropped, error,
+                                        started_at, updated_at)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (name) DO UPDATE SET
+                options = EXCLUDED.options,
+                status = EXCLUDED.status,
+                last_id = EXCLUDED.last_id,
+                processed = EXCLUDED.processed,
+                changed = EXCLUDED.changed,
+                dropped = EXCLUDED.dropped,
+                error = EXCLUDED.error,
+                started_at = CASE WHEN EXCLUDED.last_id = 0 THEN EXCLUDED.started_at
+                                  ELSE reprocess_jobs.started_at END,
+                updated_at = EXCLUDED.updated_at
+        """, (name, options, status, last_id, processed, changed, dropped, error, now, now))
+    
     def close_all_connections(self):
         """Close all database connections"""
         if self.pool:
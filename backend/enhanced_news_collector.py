@@ -8,39 +8,64 @@ import re
 import json
 import time
 import logging
-from typing import List, Dict, Optional, Set
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 import asyncio
 
 import requests
-import feedparser
-from bs4 import BeautifulSoup
+
+from parsers import parse_feed_content, extract_article, charset_from_content_type
+# Keyword/summary/tech-filter logic lives in a process-safe module shared with the reprocessor
+from enrichment import (
+    STRICT_TECH_KEYWORDS, extract_keywords, heuristic_summarize, is_tech_article, sanitize_summary,
+)
+from enrichment_cache import CachedEnrichment, EnrichmentCache, content_hash
+from extraction_profiles import extraction_profiles
+from nlp_service import nlp_service, looks_korean
+from llm_summarizer import llm_summarizer, SUMMARY_STYLES
 
 # Import database
 from database import db
 
+# Related-article LSH index (optional, requires numpy)
+try:
+    from related_articles import related_index
+except ImportError:
+    related_index = None
+
+# Cross-source near-duplicate detection
+from near_duplicates import simhash_index, simhash64
+
+# Per-host politeness scheduling
+from host_scheduler import host_scheduler, host_of, HOST_MAX_RETRIES, HOST_MAX_BLOCKING_WAIT
+from feed_health import feed_health
+from feed_priority import prioritize_feeds
+from collection_deadline import COLLECTION_DEADLINE, Deadline
+
+# Conditional GET state for feeds
+from feed_fetcher import feed_fetcher, FeedFetchResult
+from feed_watermarks import Watermark, load_watermark, save_watermarks, newest_first, entry_time
+from feed_content import feed_content_modes
+from article_download import is_html_content_type, read_capped
+from html_store import html_store
+from micro_batch import ArticleBatchWriter
+# Shared settings and the sinks every front-end writes through
+from ingest_engine import (
+    IngestConfig, ArticleSink, DatabaseSink, CONNECT_TIMEOUT, READ_TIMEOUT, PARALLEL_MAX_WORKERS, env_flag,
+)
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Enhanced configuration
-MAX_RESULTS = int(os.getenv("MAX_RESULTS", "15"))
-MAX_TOTAL_PER_SOURCE = int(os.getenv("MAX_TOTAL_PER_SOURCE", "200"))
-RSS_BACKFILL_PAGES = int(os.getenv("RSS_BACKFILL_PAGES", "3"))
-
-CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "10.0"))
-READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "15.0"))
-
-ENABLE_SUMMARY = os.getenv("ENABLE_SUMMARY", "false").lower() == "true"
-ENABLE_HTTP_CACHE = os.getenv("ENABLE_HTTP_CACHE", "true").lower() == "true"
+# Enhanced configuration (collection limits and timeouts live in ingest_engine)
+ENABLE_SUMMARY = env_flag("ENABLE_SUMMARY", False)
+ENABLE_HTTP_CACHE = env_flag("ENABLE_HTTP_CACHE", True)
 HTTP_CACHE_EXPIRE = int(os.getenv("HTTP_CACHE_EXPIRE", "3600"))
-PARALLEL_MAX_WORKERS = int(os.getenv("PARALLEL_MAX_WORKERS", "8"))
-SKIP_UPDATE_IF_EXISTS = os.getenv("SKIP_UPDATE_IF_EXISTS", "true").lower() == "true"
-
-STRICT_TECH_KEYWORDS = os.getenv("STRICT_TECH_KEYWORDS", "true").lower() == "true"
-SKIP_NON_TECH = os.getenv("SKIP_NON_TECH", "false").lower() == "true"
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
@@ -92,10 +117,16 @@ except ImportError:
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# 429/503 are left to the per-host scheduler so backoff does not hold a worker in urllib3.
+# Read timeouts are not retried: a server that stalled once would only stall the retries too,
+# multiplying the wait (and overrunning a run's deadline)
 retry_strategy = Retry(
     total=3,
+    read=0,
     backoff_factor=0.3,
-    status_forcelist=[429, 500, 502, 503, 504],
+    status_forcelist=[500, 502, 504],
+    # urllib3 would otherwise sleep out a 429/503 Retry-After itself
+    respect_retry_after_header=False,
 )
 ADAPTER = HTTPAdapter(
     pool_connections=10,
@@ -105,58 +136,71 @@ ADAPTER = HTTPAdapter(
 SESSION.mount("http://", ADAPTER)
 SESSION.mount("https://", ADAPTER)
 
-# Enhanced keyword processing
-STOP_WORDS = {
-    "기자", "뉴스", "특파원", "오늘", "매우", "기사", "사진", "영상", "제공", "입력",
-    "것", "수", "등", "및", "그리고", "그러나", "하지만", "지난", "이번", "관련", "대한", "통해", "대해", "위해",
-    "입니다", "한다", "했다", "하였다", "에서는", "에서", "대한", "이날", "라며", "다고", "였다", "했다가", "하며",
-    "the", "and", "for", "are", "but", "not", "you", "all", "can", "had", "her", "was", "one", "our"
-}
+# Article pages are streamed with a size cap, which the response cache would defeat by
+# reading whole bodies; they are fetched once anyway, so they bypass it
+ARTICLE_SESSION = requests.Session()
+ARTICLE_SESSION.mount("http://", ADAPTER)
+ARTICLE_SESSION.mount("https://", ADAPTER)
+
+
+class CollectionInProgress(RuntimeError):
+    """A collection run was started while another one holds the collector"""
+
+
+def _stored_keywords(value) -> List[str]:
+    """Keywords column as a list (JSON, or comma-separated in old rows)"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return value.split(',')
+    return value or []
 
-TECH_KEYWORDS = {
-    # AI/ML
-    "ai", "인공지능", "machine learning", "머신러닝", "deep learning", "딥러닝",
-    "chatgpt", "gpt", "llm", "생성형ai", "generative ai", "신경망", "neural network",
-    
-    # Hardware/Semiconductors
-    "반도체", "semiconductor", "메모리", "memory", "dram", "nand", "hbm",
-    "gpu", "cpu", "npu", "tpu", "fpga", "asic", "칩셋", "chipset",
-    "삼성전자", "samsung", "sk하이닉스", "tsmc", "엔비디아", "nvidia",
-    
-    # Communication/Network
-    "5g", "6g", "lte", "와이파이", "wifi", "블루투스", "bluetooth",
-    "클라우드", "cloud", "데이터센터", "data center", "서버", "server",
-    "네트워크", "network", "cdn", "api", "sdk",
-    
-    # Blockchain/Fintech
-    "블록체인", "blockchain", "암호화폐", "cryptocurrency", "bitcoin", "비트코인",
-    "ethereum", "이더리움", "nft", "defi", "메타버스", "metaverse",
-    
-    # Automotive/Energy
-    "자율주행", "autonomous", "전기차", "electric vehicle", "ev", "tesla", "테슬라",
-    "배터리", "battery", "리튬", "lithium", "수소", "hydrogen",
-    
-    # Security
-    "보안", "security", "해킹", "hacking", "사이버", "cyber", "랜섬웨어", "ransomware",
-    "개인정보", "privacy", "데이터보호", "gdpr", "제로트러스트", "zero trust",
-    
-    # Software/Development
-    "오픈소스", "open source", "개발자", "developer", "프로그래밍", "programming",
-    "python", "javascript", "react", "node.js", "docker", "kubernetes",
-}
 
 class EnhancedNewsCollector:
     def __init__(self):
         self.session = SESSION
-        self.stats = {
+        self.stats = self._empty_stats()
+        self._stats_lock = threading.Lock()
+        self.pending_watermarks: Dict[str, Watermark] = {}
+        self.pending_feed_states: Dict[str, List[FeedFetchResult]] = {}
+        self.new_entries_by_feed: Dict[str, int] = {}
+        # Runs share the state above; one at a time (the API, the scheduler and scripts use one collector)
+        self._run_lock = threading.Lock()
+        self.deadline = Deadline()
+        self.config = IngestConfig()
+        self.sink: ArticleSink = DatabaseSink(self)
+        self.uses_openai = bool(ENABLE_SUMMARY and OPENAI_API_KEY)
+        # Everything that changes enrichment output is part of the cache's pipeline version
+        self.enrichment_cache = EnrichmentCache("enhanced", settings="-".join((
+            "openai" if self.uses_openai else "heuristic",
+            "kiwi" if nlp_service.enabled else "plain",
+            "strict" if STRICT_TECH_KEYWORDS else "loose",
+        )))
+    
+    @staticmethod
+    def _empty_stats() -> Dict:
+        return {
             'total_processed': 0,
             'total_inserted': 0,
             'total_updated': 0,
             'total_skipped': 0,
+            'total_failed': 0,
+            'total_duplicates': 0,
+            'page_fetches_skipped': 0,
+            'enrichment_cache_hits': 0,
+            'deadline_skipped': 0,
             'failed_feeds': [],
+            'skipped_feeds': [],
+            'unfinished_feeds': [],
             'successful_feeds': []
         }
     
+    def count(self, key: str, amount: int = 1) -> None:
+        """Bump a run counter; entries are processed on worker threads"""
+        with self._stats_lock:
+            self.stats[key] += amount
+    
     def canonicalize_link(self, url: str) -> str:
         """Normalize and clean URL"""
         try:
@@ -179,189 +223,118 @@ class EnhancedNewsCollector:
             logger.warning(f"URL canonicalization failed for {url}: {e}")
             return url
     
+    def polite_get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                   session: Optional[requests.Session] = None, stream: bool = False) -> requests.Response:
+        """
+        GET through the per-host scheduler, retrying 429/503 after the host's
+        backoff. A backoff longer than HOST_MAX_BLOCKING_WAIT raises
+        HostThrottled instead of holding the worker thread; a page fetch then
+        falls back to the feed's own text.
+        """
+        host = host_of(url)
+        for attempt in range(HOST_MAX_RETRIES + 1):
+            # Timeouts never outlast the run's deadline
+            self.deadline.check()
+            host_scheduler.acquire(host, HOST_MAX_BLOCKING_WAIT)
+            status, retry_after = None, None
+            try:
+                response = (session or self.session).get(
+                    url,
+                    headers={**HEADERS, **(headers or {})},
+                    timeout=self.deadline.cap_pair(CONNECT_TIMEOUT, READ_TIMEOUT),
+                    allow_redirects=True,
+                    stream=stream
+                )
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After")
+            finally:
+                throttled = host_scheduler.release(host, status, retry_after)
+            if not throttled or attempt == HOST_MAX_RETRIES:
+                break
+            # Return the pooled connection before waiting to retry
+            response.close()
+        return response
+
     def extract_main_text(self, url: str) -> str:
         """Extract main content from article URL"""
         try:
-            response = self.session.get(
-                url, 
-                headers=HEADERS, 
-                timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Remove unwanted elements
-            for element in soup(["script", "style", "nav", "footer", "aside", "advertisement"]):
-                element.decompose()
-            
-            # Try to find main content
-            content_selectors = [
-                "article",
-                "[id*='content']", "[class*='content']",
-                "[id*='article']", "[class*='article']", 
-                "[class*='post-content']", "[class*='entry-content']",
-                "[id*='story']", "[class*='story']",
-                "main", ".main-content"
-            ]
-            
-            best_content = ""
-            max_length = 0
-            
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text(separator="\n", strip=True)
-                    if len(text) > max_length and len(text) > 200:
-                        max_length = len(text)
-                        best_content = text
-            
-            # Fallback to meta description
-            if not best_content or len(best_content) < 100:
-                meta_desc = soup.find("meta", attrs={"name": "description"})
-                if not meta_desc:
-                    meta_desc = soup.find("meta", attrs={"property": "og:description"})
-                if meta_desc and meta_desc.get("content"):
-                    best_content = meta_desc["content"]
+            response = self.polite_get(url, session=ARTICLE_SESSION, stream=True)
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type")
+                if not is_html_content_type(content_type):
+                    logger.info(f"  ⏭️ Skipping non-HTML article page {url} ({content_type})")
+                    return ""
+                html = read_capped(response)
+            finally:
+                response.close()
             
-            return best_content[:3000]  # Limit length
+            charset = charset_from_content_type(content_type)
+            if self.sink.uses_backend_state:
+                html_store.put(url, html, charset)
+            result = extract_article(html, charset, self.extraction_selector(url))
+            self.observe_extraction(url, result)
+            return result.text
             
         except Exception as e:
             logger.warning(f"Failed to extract text from {url}: {e}")
             return ""
     
-    def extract_keywords(self, text: str, title: str = "", top_k: int = 15) -> List[str]:
+    def extract_keywords(self, text: str, title: str = "", top_k: int = 15,
+                         tokens: Optional[List[Tuple[str, str]]] = None) -> List[str]:
         """Enhanced keyword extraction"""
-        if not text and not title:
-            return []
-        
-        combined_text = f"{title} {text}".lower()
-        keywords = []
-        
-        # 1. Extract tech keywords
-        for keyword in TECH_KEYWORDS:
-            if keyword in combined_text:
-                keywords.append(keyword.title() if keyword.islower() else keyword)
-        
-        # 2. Extract patterns
-        patterns = [
-            r'\b[A-Z]{2,5}\b',  # Acronyms
-            r'\b\d+[A-Za-z]{1,3}\b',  # Version numbers
-            r'[가-힣]{2,8}(?:기술|시스템|플랫폼|서비스|솔루션)',  # Korean tech terms
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text + " " + title)
-            for match in matches:
-                if len(match) >= 2 and match.lower() not in STOP_WORDS:
-                    keywords.append(match)
-        
-        # 3. Remove duplicates and filter
-        unique_keywords = []
-        seen = set()
-        for kw in keywords:
-            kw_lower = kw.lower()
-            if kw_lower not in seen and kw_lower not in STOP_WORDS and len(kw) >= 2:
-                unique_keywords.append(kw)
-                seen.add(kw_lower)
-        
-        return unique_keywords[:top_k]
+        return extract_keywords(text, title, top_k, tokens)
     
-    def summarize_text(self, title: str, text: str, source: str) -> str:
+    def summarize_text(self, title: str, text: str, source: str, published: str = "") -> str:
         """Generate summary (with optional OpenAI integration)"""
-        if ENABLE_SUMMARY and OPENAI_API_KEY:
-            return self._openai_summarize(title, text, source)
+        if self.uses_openai:
+            return self._openai_summarize(title, text, source, published)
         else:
             return self._heuristic_summarize(title, text)
     
-    def _openai_summarize(self, title: str, text: str, source: str) -> str:
-        """OpenAI-based summarization"""
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            
-            prompt = f"""
-다음 기사를 3-4문장으로 한국어 요약하세요. 사실 위주로 간결하게.
-- 제목: {title}
-- 출처: {source}
-- 본문: {text[:2000]}
-
-핵심 기술/제품/수치/일정을 포함하여 요약하세요.
-"""
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 IT/기술 뉴스 전문 에디터입니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            return summary if len(summary) > 20 else self._heuristic_summarize(title, text)
-            
-        except Exception as e:
-            logger.warning(f"OpenAI summarization failed: {e}")
-            return self._heuristic_summarize(title, text)
+    def _openai_summarize(self, title: str, text: str, source: str, published: str = "") -> str:
+        """OpenAI-based summarization in the run's summary style through the shared, budgeted client"""
+        summary = llm_summarizer.summarize_sync(title, text, source, self.config.summary_style, published,
+                                                persist=self.sink.uses_backend_state)
+        return summary or self._heuristic_summarize(title, text)
     
     def _heuristic_summarize(self, title: str, text: str) -> str:
         """Rule-based summarization"""
-        if not text:
-            return title
-        
-        # Clean and split into sentences
-        clean_text = re.sub(r'\s+', ' ', text)
-        sentences = re.split(r'(?<=[.!?])\s+', clean_text)
-        
-        # Take first 2-3 sentences
-        summary_sentences = []
-        char_count = 0
-        for sentence in sentences:
-            if char_count + len(sentence) > 300:
-                break
-            summary_sentences.append(sentence.strip())
-            char_count += len(sentence)
-            if len(summary_sentences) >= 3:
-                break
-        
-        summary = " ".join(summary_sentences)
-        return summary if summary else title
+        return heuristic_summarize(title, text)
     
     def is_tech_article(self, title: str, text: str, keywords: List[str]) -> bool:
         """Determine if article is tech-related"""
-        if not STRICT_TECH_KEYWORDS:
-            return True
-        
-        combined = f"{title} {text} {' '.join(keywords)}".lower()
-        
-        # Check for tech keywords
-        tech_score = sum(1 for kw in TECH_KEYWORDS if kw in combined)
-        
-        # Check for non-tech indicators
-        non_tech_patterns = [
-            "연예", "스포츠", "예능", "드라마", "영화", "음악", "게임",
-            "요리", "여행", "패션", "뷰티", "건강", "운동", "다이어트"
-        ]
-        non_tech_score = sum(1 for pattern in non_tech_patterns if pattern in combined)
-        
-        return tech_score > non_tech_score and tech_score > 0
+        return is_tech_article(title, text, keywords)
     
-    def parse_feed(self, feed_url: str) -> Optional[object]:
-        """Parse RSS feed with error handling"""
+    def fetch_feed(self, feed_url: str) -> FeedFetchResult:
+        """Conditional GET of a feed page through the pooled session"""
+        if not self.sink.uses_backend_state:
+            return self.fetch_feed_fully(feed_url)
+        state = feed_fetcher.load_state(feed_url)
         try:
-            feed = feedparser.parse(feed_url)
-            if hasattr(feed, "entries") and feed.entries:
-                return feed
-            return None
+            response = self.polite_get(feed_url, feed_fetcher.conditional_headers(state))
+            if response.status_code != 304:
+                response.raise_for_status()
         except Exception as e:
-            logger.error(f"RSS parsing failed for {feed_url}: {e}")
-            return None
+            logger.error(f"RSS fetch failed for {feed_url}: {e}")
+            return FeedFetchResult(feed_url, None, changed=False, error=str(e))
+        return feed_fetcher.handle_response(
+            feed_url, state, response.status_code, response.headers, response.content
+        )
     
-    def expand_paged_feed_urls(self, feed_url: str, pages: int = RSS_BACKFILL_PAGES) -> List[str]:
+    def fetch_feed_fully(self, feed_url: str) -> FeedFetchResult:
+        """Plain GET for sinks without fetch state; validators are left for the backend's own runs"""
+        try:
+            response = self.polite_get(feed_url)
+            response.raise_for_status()
+        except Exception as e:
+            logger.error(f"RSS fetch failed for {feed_url}: {e}")
+            return FeedFetchResult(feed_url, None, changed=False, error=str(e))
+        return FeedFetchResult(feed_url, response.status_code, True, response.content)
+    
+    def expand_paged_feed_urls(self, feed_url: str, pages: Optional[int] = None) -> List[str]:
         """Expand WordPress-style feeds with pagination"""
+        pages = pages or self.config.max_pages
         urls = [feed_url]
         if re.search(r"/feed/?$", feed_url, re.IGNORECASE):
             for i in range(2, pages + 1):
@@ -369,66 +342,240 @@ class EnhancedNewsCollector:
                 urls.append(f"{feed_url}{sep}paged={i}")
         return urls
     
-    def process_entry(self, entry, source: str, category: str, language: str) -> Optional[Dict]:
-        """Process individual RSS entry"""
-        try:
-            title = getattr(entry, "title", "").strip()
-            link = self.canonicalize_link(getattr(entry, "link", "").strip())
-            
-            if not title or not link:
+    # Backend state (feed health, content modes, extraction profiles, caches) is
+    # only read and written for sinks that use it; other sinks run stateless
+    
+    def order_feeds(self, feeds: List[Dict]) -> List[Dict]:
+        """Feeds most likely to have new articles first (backend history only)"""
+        if not self.sink.uses_backend_state:
+            return list(feeds)
+        return prioritize_feeds(feeds)
+    
+    def feed_allowed(self, feed_url: str, source: str) -> bool:
+        """False while the feed's circuit is open; sinks without backend state poll every feed"""
+        return not self.sink.uses_backend_state or feed_health.allow(feed_url, source)
+    
+    def record_feed_poll(self, feed_url: str, source: str, latency_ms: Optional[float],
+                         error: Optional[str]) -> None:
+        if self.sink.uses_backend_state:
+            feed_health.record_poll(feed_url, source, latency_ms, error)
+    
+    def record_feed_failure(self, feed_url: str, error: str, source: str) -> None:
+        if self.sink.uses_backend_state:
+            feed_health.record_failure(feed_url, error, source)
+    
+    def feed_text(self, feed_url: Optional[str], entry) -> Optional[str]:
+        """Article body carried by the feed entry, or None when the page must be fetched"""
+        return feed_content_modes.article_text(feed_url, entry, track=self.sink.uses_backend_state)
+    
+    def extraction_selector(self, url: str) -> Optional[str]:
+        if not self.sink.uses_backend_state:
+            return None
+        return extraction_profiles.selector_for(url)
+    
+    def observe_extraction(self, url: str, result) -> None:
+        if self.sink.uses_backend_state:
+            extraction_profiles.observe(url, result)
+    
+    def load_watermark(self, feed_url: str) -> Watermark:
+        """The feed's watermark; sinks without fetch state start from an empty one"""
+        if not self.sink.uses_backend_state:
+            return Watermark()
+        return load_watermark(feed_url)
+    
+    def filter_page(self, watermark: Watermark, entries: List) -> Tuple[List, bool]:
+        """Entries of a feed page newer than the watermark, and whether the page walk can stop"""
+        reached = watermark.overlaps(entries)
+        if self.config.skip_existing:
+            entries = [entry for entry in entries if watermark.is_new(entry)]
+        since = self.config.since
+        if since:
+            times = [entry_time(entry) for entry in entries]
+            # Pages run newest to oldest: once a whole page is older than the cutoff, stop
+            if times and all(t is not None and t < since for t in times):
+                reached = True
+            entries = [entry for entry, t in zip(entries, times) if t is None or t >= since]
+        return entries, reached
+    
+    def advance_watermark(self, feed_url: str, watermark: Watermark, seen_entries: List) -> None:
+        """Queue the feed's new watermark; it is persisted once the articles are saved"""
+        if not self.sink.uses_backend_state:
+            return
+        mark = Watermark.from_entries(seen_entries)
+        if not mark or mark.guid == watermark.guid:
+            return
+        if mark.published and watermark.published and mark.published < watermark.published:
+            return
+        self.pending_watermarks[feed_url] = mark
+    
+    def hold_feed_states(self, feed_url: str, results: List[FeedFetchResult]) -> None:
+        """Queue the validators of the feed's pages; like the watermark they are saved with its articles"""
+        if self.sink.uses_backend_state and results:
+            self.pending_feed_states[feed_url] = results
+    
+    def release_feed(self, feed_url: str) -> None:
+        """Entries were left behind: keep the old watermark and validators so the next run reads them again"""
+        self.pending_watermarks.pop(feed_url, None)
+        self.pending_feed_states.pop(feed_url, None)
+    
+    def release_feeds(self, feed_urls: List[str]) -> None:
+        for feed_url in feed_urls:
+            self.release_feed(feed_url)
+    
+    def save_feed_progress(self, feed_urls: Optional[List[str]] = None) -> None:
+        """Persist the watermarks and validators of feeds whose articles are stored (default: all pending)"""
+        if feed_urls is None:
+            feed_urls = list(set(self.pending_watermarks) | set(self.pending_feed_states))
+        save_watermarks({
+            feed_url: self.pending_watermarks.pop(feed_url)
+            for feed_url in feed_urls if feed_url in self.pending_watermarks
+        })
+        for feed_url in feed_urls:
+            for result in self.pending_feed_states.pop(feed_url, []):
+                feed_fetcher.save_state(result)
+    
+    def prepare_entry(self, entry, source: str) -> Optional[Dict]:
+        """Validate an RSS entry and run the checks that avoid a page fetch"""
+        title = getattr(entry, "title", "").strip()
+        link = self.canonicalize_link(getattr(entry, "link", "").strip())
+        
+        if not title or not link:
+            return None
+        
+        # Check if already exists (if skip option is enabled)
+        if self.config.skip_existing and self.sink.contains(link):
+            return None
+        
+        rss_text = getattr(entry, "summary", "") or getattr(entry, "description", "")
+        
+        # Skip copies of an already-seen story before fetching the page
+        # (the index holds the backend database's stories, so only its sink uses it)
+        fingerprint = simhash64(title, rss_text) if self.sink.uses_backend_state else None
+        if fingerprint is not None:
+            match = simhash_index.check_and_reserve(link, fingerprint)
+            if match:
+                canonical_link, distance = match
+                simhash_index.record_duplicate(link, canonical_link, source, title, distance)
+                self.count('total_duplicates')
+                logger.info(f"  🔁 Near-duplicate of {canonical_link} (distance {distance}): {title[:60]}")
                 return None
-            
-            # Check if already exists (if skip option is enabled)
-            if SKIP_UPDATE_IF_EXISTS:
-                existing = db.execute_query(
-                    "SELECT id FROM articles WHERE link = %s" if db.db_type == "postgresql" else 
-                    "SELECT id FROM articles WHERE link = ?", 
-                    (link,)
-                )
-                if existing:
-                    return None
-            
-            published = getattr(entry, "published", "") or getattr(entry, "updated", "")
-            if not published:
+        
+        published = getattr(entry, "published", "") or getattr(entry, "updated", "")
+        if not published:
+            published = datetime.now().isoformat()
+        else:
+            try:
+                # Parse and normalize date
+                import dateutil.parser
+                parsed_date = dateutil.parser.parse(published)
+                published = parsed_date.isoformat()
+            except:
                 published = datetime.now().isoformat()
-            else:
-                try:
-                    # Parse and normalize date
-                    import dateutil.parser
-                    parsed_date = dateutil.parser.parse(published)
-                    published = parsed_date.isoformat()
-                except:
-                    published = datetime.now().isoformat()
-            
-            # Extract content
-            raw_text = self.extract_main_text(link)
-            if not raw_text:
-                raw_text = getattr(entry, "summary", "") or getattr(entry, "description", "")
-            
+        
+        return {'title': title, 'link': link, 'published': published, 'rss_text': rss_text}
+    
+    def cached_enrichment(self, title: str, raw_text: str, language: str) -> Tuple[str, Optional[CachedEnrichment]]:
+        """Cache key of an entry's text and its memoized enrichment, if any"""
+        key = content_hash(title, raw_text, language, self.enrichment_options())
+        if not self.sink.uses_backend_state:
+            return key, None
+        cached = self.enrichment_cache.get(key)
+        if cached:
+            self.count('enrichment_cache_hits')
+        return key, cached
+    
+    def enrichment_options(self) -> str:
+        """Per-run settings that change enrichment; empty for the defaults so their cache entries stay valid"""
+        defaults = IngestConfig()
+        if (self.config.summary_style, self.config.keyword_count) == (defaults.summary_style, defaults.keyword_count):
+            return ""
+        return f"{self.config.summary_style}:{self.config.keyword_count}"
+    
+    def wants_tokens(self, title: str, raw_text: str, language: str) -> bool:
+        """Korean articles get morphological nouns from the Kiwi worker pool; English ones skip it"""
+        return language == "ko" and looks_korean(raw_text or title)
+    
+    def remember_enrichment(self, key: str, enrichment: CachedEnrichment, title: str, raw_text: str,
+                            wanted_tokens: bool, tokens: Optional[List[Tuple[str, str]]]) -> None:
+        """Memoize an enrichment unless a failed OpenAI call or NLP timeout degraded it"""
+        degraded = (self.uses_openai and enrichment.summary == self._heuristic_summarize(title, raw_text)) or (
+            wanted_tokens and tokens is None and nlp_service.enabled
+        )
+        if not degraded and self.sink.uses_backend_state:
+            self.enrichment_cache.put(key, enrichment)
+    
+    def build_article(self, prepared: Dict, raw_text: str, source: str, category: str, language: str,
+                      enrichment: CachedEnrichment) -> Optional[Dict]:
+        """Article record of an enriched entry, or None when the tech filter drops it"""
+        # Filter tech articles if enabled
+        if self.config.skip_non_tech and not enrichment.is_tech:
+            simhash_index.release(prepared['link'])
+            return None
+        
+        summary = enrichment.summary
+        if SUMMARY_STYLES[self.config.summary_style].sanitize:
+            summary = sanitize_summary(summary)
+        
+        article_data = {
+            'title': prepared['title'],
+            'link': prepared['link'],
+            'published': prepared['published'],
+            'source': source,
+            'raw_text': raw_text,
+            'summary': summary,
+            'keywords': enrichment.keywords,
+            'category': category,
+            'language': language
+        }
+        
+        return article_data
+    
+    def finish_entry(self, prepared: Dict, raw_text: str, source: str, category: str, language: str) -> Optional[Dict]:
+        """Summarize, extract keywords and filter an entry whose text has been fetched"""
+        title = prepared['title']
+        if not raw_text:
+            raw_text = prepared['rss_text']
+        
+        # An unchanged body enriched before is served from the cache (no OpenAI call)
+        key, enrichment = self.cached_enrichment(title, raw_text, language)
+        if not enrichment:
             # Generate summary and keywords
-            summary = self.summarize_text(title, raw_text, source)
-            keywords = self.extract_keywords(raw_text, title)
-            
-            # Filter tech articles if enabled
-            if SKIP_NON_TECH and not self.is_tech_article(title, raw_text, keywords):
+            summary = self.summarize_text(title, raw_text, source, prepared['published'])
+            tokens = None
+            wanted_tokens = self.wants_tokens(title, raw_text, language)
+            if wanted_tokens:
+                tokens = nlp_service.tokenize(f"{title}\n{raw_text}")
+            keywords = self.extract_keywords(raw_text, title, self.config.keyword_count, tokens)
+            is_tech = self.is_tech_article(title, raw_text, keywords)
+            enrichment = CachedEnrichment(summary, keywords, is_tech, category)
+            self.remember_enrichment(key, enrichment, title, raw_text, wanted_tokens, tokens)
+        
+        return self.build_article(prepared, raw_text, source, category, language, enrichment)
+    
+    def process_entry(self, entry, source: str, category: str, language: str,
+                      feed_url: Optional[str] = None) -> Optional[Dict]:
+        """Process individual RSS entry"""
+        if self.deadline.expired:
+            self.count('deadline_skipped')
+            return None
+        prepared = None
+        try:
+            prepared = self.prepare_entry(entry, source)
+            if not prepared:
                 return None
             
-            article_data = {
-                'title': title,
-                'link': link,
-                'published': published,
-                'source': source,
-                'raw_text': raw_text,
-                'summary': summary,
-                'keywords': keywords,
-                'category': category,
-                'language': language
-            }
-            
-            return article_data
+            # Use the body the feed already carries; fetch the page only for teasers
+            raw_text = self.feed_text(feed_url, entry)
+            if raw_text:
+                self.count('page_fetches_skipped')
+            elif self.config.fetch_pages:
+                raw_text = self.extract_main_text(prepared['link'])
+            return self.finish_entry(prepared, raw_text, source, category, language)
             
         except Exception as e:
             logger.error(f"Error processing entry from {source}: {e}")
+            if prepared:
+                simhash_index.release(prepared['link'])
             return None
     
     def collect_from_feed(self, feed_config: Dict) -> List[Dict]:
@@ -441,34 +588,83 @@ class EnhancedNewsCollector:
         if not feed_url:
             return []
         
+        # Feeds that keep failing are skipped until their circuit's cooldown ends
+        if not self.feed_allowed(feed_url, source):
+            logger.info(f"⛔ {source}: circuit open, skipping")
+            self.stats['skipped_feeds'].append(source)
+            return []
+        
+        health_recorded = False
         try:
             logger.info(f"📡 Collecting from {source}")
             
-            # Expand URLs for pagination
+            # Expand URLs for pagination; the walk stops at the feed's watermark
             urls = self.expand_paged_feed_urls(feed_url)
+            watermark = self.load_watermark(feed_url)
             all_entries = []
+            seen_entries = []
+            fetched = []
+            unchanged = False
+            latency_ms, fetch_error = None, None
             
-            for url in urls[:3]:  # Limit pages
-                feed = self.parse_feed(url)
-                if feed and feed.entries:
-                    entries = feed.entries[:MAX_RESULTS]
-                    all_entries.extend(entries)
-                    logger.info(f"  📄 {len(entries)} entries from page")
+            for url in urls:
+                if self.deadline.expired:
+                    break
+                started = time.monotonic()
+                result = self.fetch_feed(url)
+                if not result.ok:
+                    # Older pages of a feed that just failed would only add more timeouts
+                    if latency_ms is None:
+                        fetch_error = result.error
+                    break
+                if latency_ms is None:
+                    latency_ms = (time.monotonic() - started) * 1000
+                fetched.append(result)
+                if not result.changed:
+                    # 304 or identical body: nothing new here or on older pages
+                    unchanged = True
+                    break
+                entries = parse_feed_content(result.content)[:self.config.max_results]
+                seen_entries.extend(entries)
+                new_entries, reached = self.filter_page(watermark, entries)
+                all_entries.extend(new_entries)
+                logger.info(f"  📄 {len(new_entries)}/{len(entries)} new entries from page")
                 
-                if len(all_entries) >= MAX_TOTAL_PER_SOURCE:
+                if reached or len(all_entries) >= self.config.max_total_per_source:
                     break
             
+            self.advance_watermark(feed_url, watermark, seen_entries)
+            self.hold_feed_states(feed_url, fetched)
+            self.new_entries_by_feed[feed_url] = len(all_entries)
+            
+            if latency_ms is None and self.deadline.expired:
+                # The run's deadline passed before the feed could be fetched; says nothing about its health
+                self.stats['unfinished_feeds'].append(source)
+                return []
+            
+            if latency_ms is not None and not (unchanged or seen_entries):
+                fetch_error = "no entries in feed"
+            self.record_feed_poll(feed_url, source, latency_ms, fetch_error)
+            health_recorded = True
+            
+            if not all_entries and (unchanged or seen_entries):
+                logger.info(f"⏸️ {source}: no new entries since last collection")
+                self.stats['successful_feeds'].append(source)
+                return []
+            
             if not all_entries:
                 logger.warning(f"❌ No entries found for {source}")
                 self.stats['failed_feeds'].append(source)
                 return []
             
+            all_entries = newest_first(all_entries)
+            
             # Process entries in parallel
             articles = []
             if PARALLEL_MAX_WORKERS > 1:
                 with ThreadPoolExecutor(max_workers=min(PARALLEL_MAX_WORKERS, 4)) as executor:
                     futures = [
-                        executor.submit(self.process_entry, entry, source, category, language)
+                        executor.submit(self.process_entry, entry, source, category, language, feed_url)
                         for entry in all_entries
                     ]
                     
@@ -482,10 +678,14 @@ class EnhancedNewsCollector:
             else:
                 # Sequential processing
                 for entry in all_entries:
-                    article = self.process_entry(entry, source, category, language)
+                    article = self.process_entry(entry, source, category, language, feed_url)
                     if article:
                         articles.append(article)
             
+            if self.deadline.expired:
+                # Entries may have been skipped; the next run has to read them again
+                self.release_feed(feed_url)
+            
             logger.info(f"✅ {source}: {len(articles)} articles processed")
             self.stats['successful_feeds'].append(source)
             return articles
@@ -493,126 +693,188 @@ class EnhancedNewsCollector:
         except Exception as e:
             logger.error(f"❌ Failed to collect from {source}: {e}")
             self.stats['failed_feeds'].append(source)
+            if not health_recorded and not self.deadline.expired:
+                self.record_feed_failure(feed_url, str(e), source)
             return []
     
     def save_articles(self, articles: List[Dict]) -> Dict[str, int]:
-        """Save articles to database"""
+        """
+        Save a batch of articles. Links are checked against the database in one
+        query and stored ones whose title, summary and keywords are unchanged
+        are skipped; that also covers a link that reached the run from two
+        feeds. The rest go through one bulk upsert that moves the keyword
+        rollup in the same transaction, then their LSH buckets and SimHash
+        fingerprints are written for the whole batch. A failed upsert counts
+        the batch as failed.
+        """
+        stats = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
         if not articles:
-            return {'inserted': 0, 'updated': 0, 'skipped': 0}
-        
-        stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
+            return stats
         
+        batch: Dict[str, Dict] = {}
         for article in articles:
-            try:
-                # Check if article exists
-                existing = db.execute_query(
-                    "SELECT id FROM articles WHERE link = %s" if db.db_type == "postgresql" else
-                    "SELECT id FROM articles WHERE link = ?",
-                    (article['link'],)
-                )
-                
-                if existing:
-                    # Update existing article
-                    if db.db_type == "postgresql":
-                        db.execute_update("""
-                            UPDATE articles SET 
-                                title = %s, summary = %s, keywords = %s, updated_at = CURRENT_TIMESTAMP
-                            WHERE link = %s
-                        """, (
-                            article['title'],
-                            article['summary'],
-                            json.dumps(article['keywords']),
-                            article['link']
-                        ))
-                    else:
-                        db.execute_update("""
-                            UPDATE articles SET 
-                                title = ?, summary = ?, keywords = ?, updated_at = datetime('now')
-                            WHERE link = ?
-                        """, (
-                            article['title'],
-                            article['summary'],
-                            json.dumps(article['keywords']),
-                            article['link']
-                        ))
-                    stats['updated'] += 1
-                else:
-                    # Insert new article
-                    article_id = db.insert_article(article)
-                    if article_id:
-                        stats['inserted'] += 1
-                    else:
-                        stats['skipped'] += 1
-                        
-            except Exception as e:
-                logger.error(f"Error saving article: {e}")
-                stats['skipped'] += 1
+            batch.setdefault(article['link'], article)
+        
+        try:
+            stored = db.get_articles_by_links(list(batch))
+        except Exception as e:
+            logger.error(f"Error looking up article batch: {e}")
+            stats['failed'] = len(batch)
+            return stats
+        
+        changed = [
+            article for link, article in batch.items()
+            if link not in stored or self._article_changed(stored[link], article)
+        ]
+        # Copies of a link within the batch count as skipped, as in the other sinks
+        stats['skipped'] = len(articles) - len(changed)
+        if not changed:
+            return stats
+        
+        try:
+            ids = db.upsert_articles(changed, stored)
+        except Exception as e:
+            logger.error(f"Error saving article batch: {e}")
+            stats['failed'] = len(changed)
+            return stats
+        
+        saved = [article for article in changed if article['link'] in ids]
+        stats['updated'] = sum(1 for article in saved if article['link'] in stored)
+        stats['inserted'] = len(saved) - stats['updated']
+        stats['failed'] = len(changed) - len(saved)
         
+        self._index_related([(ids[article['link']], article) for article in saved])
+        try:
+            simhash_index.persist_many(article['link'] for article in saved if article['link'] not in stored)
+        except Exception as e:
+            logger.warning(f"SimHash persist failed for article batch: {e}")
         return stats
     
-    def collect_all_news(self, max_feeds: Optional[int] = None) -> Dict:
-        """Collect news from all feeds"""
+    def _article_changed(self, previous: Dict, article: Dict) -> bool:
+        return (
+            previous.get('title') != article['title']
+            or previous.get('summary') != article['summary']
+            or _stored_keywords(previous.get('keywords')) != article['keywords']
+        )
+    
+    def _index_related(self, saved: List[tuple]) -> None:
+        """Store the MinHash band buckets of saved (article_id, article) pairs for related-article lookups"""
+        if related_index is None or not saved:
+            return
+        try:
+            related_index.index_articles([
+                (article_id, article['title'], article.get('keywords')) for article_id, article in saved
+            ])
+        except Exception as e:
+            logger.warning(f"LSH indexing failed for article batch: {e}")
+    
+    @property
+    def running(self) -> bool:
+        return self._run_lock.locked()
+    
+    @contextmanager
+    def exclusive_run(self):
+        """Hold the collector for one run; a second run fails fast instead of resetting this one's state"""
+        if not self._run_lock.acquire(blocking=False):
+            raise CollectionInProgress("A news collection run is already in progress")
+        try:
+            yield
+        finally:
+            self._run_lock.release()
+    
+    def begin_run(self, deadline: Optional[Deadline] = None, sink: Optional[ArticleSink] = None,
+                  config: Optional[IngestConfig] = None) -> None:
+        """Reset per-run state; articles go to the sink (default: the backend database)"""
+        self.stats = self._empty_stats()
+        self.pending_watermarks = {}
+        self.pending_feed_states = {}
+        self.new_entries_by_feed = {}
+        self.deadline = deadline or Deadline(COLLECTION_DEADLINE)
+        self.sink = sink or DatabaseSink(self)
+        self.config = config or IngestConfig()
+        llm_summarizer.begin_run()
+    
+    def collect_all_news(self, max_feeds: Optional[int] = None, feeds: Optional[List[Dict]] = None,
+                         deadline: Optional[Deadline] = None, sink: Optional[ArticleSink] = None,
+                         config: Optional[IngestConfig] = None) -> Dict:
+        """
+        Collect news from all feeds (or only the given feed configs). With a
+        deadline the run stops starting work when it passes, saves what was
+        processed and returns partial stats. Raises CollectionInProgress while
+        another run holds the collector.
+        """
+        with self.exclusive_run():
+            return self._collect_all_news(max_feeds, feeds, deadline, sink, config)
+    
+    def _collect_all_news(self, max_feeds: Optional[int], feeds: Optional[List[Dict]], deadline: Optional[Deadline],
+                          sink: Optional[ArticleSink], config: Optional[IngestConfig]) -> Dict:
         logger.info("🚀 Starting comprehensive news collection")
-        
-        # Reset stats
-        self.stats = {
-            'total_processed': 0,
-            'total_inserted': 0,
-            'total_updated': 0,
-            'total_skipped': 0,
-            'failed_feeds': [],
-            'successful_feeds': []
-        }
+        self.begin_run(deadline, sink, config)
         
         start_time = time.time()
-        feeds_to_process = FEEDS[:max_feeds] if max_feeds else FEEDS
+        if feeds is not None:
+            feeds_to_process = feeds
+        else:
+            feeds_to_process = FEEDS[:max_feeds] if max_feeds else FEEDS
+        # Feeds most likely to have new articles go first, so a deadline cuts the least
+        feeds_to_process = self.order_feeds(feeds_to_process)
         
-        all_articles = []
+        # Articles are saved in micro-batches as feeds complete; a feed's watermark
+        # and validators move forward once the batch holding its articles is stored
+        writer = ArticleBatchWriter(self.sink.write, on_flush=self.save_feed_progress,
+                                    on_failure=self.release_feeds, **self._batch_settings())
         
         # Process feeds in parallel
         if PARALLEL_MAX_WORKERS > 1:
-            with ThreadPoolExecutor(max_workers=min(PARALLEL_MAX_WORKERS, len(feeds_to_process))) as executor:
-                future_to_feed = {
-                    executor.submit(self.collect_from_feed, feed): feed 
-                    for feed in feeds_to_process
-                }
-                
-                for future in as_completed(future_to_feed):
-                    try:
-                        articles = future.result(timeout=60)  # 60 second timeout per feed
-                        all_articles.extend(articles)
-                    except Exception as e:
+            executor = ThreadPoolExecutor(max_workers=max(1, min(PARALLEL_MAX_WORKERS, len(feeds_to_process))))
+            future_to_feed = {
+                executor.submit(self.collect_from_feed, feed): feed 
+                for feed in feeds_to_process
+            }
+            pending = set(future_to_feed)
+            try:
+                while pending and not self.deadline.expired:
+                    done, pending = wait(pending, timeout=self.deadline.wait_step(), return_when=FIRST_COMPLETED)
+                    for future in done:
                         feed = future_to_feed[future]
-                        logger.error(f"Feed collection failed: {feed.get('source', 'Unknown')}: {e}")
+                        writer.add(self._feed_result(future, feed), feed.get('feed_url'))
+                    writer.maybe_flush()
+            finally:
+                # Queued feeds are dropped; running ones see the deadline and return what they have
+                executor.shutdown(wait=True, cancel_futures=True)
+            for future in pending:
+                feed = future_to_feed[future]
+                if future.cancelled():
+                    self.stats['unfinished_feeds'].append(feed.get('source', 'Unknown'))
+                else:
+                    writer.add(self._feed_result(future, feed), feed.get('feed_url'))
         else:
             # Sequential processing
             for feed in feeds_to_process:
-                articles = self.collect_from_feed(feed)
-                all_articles.extend(articles)
-        
-        # Remove duplicates based on link
-        unique_articles = []
-        seen_links = set()
-        for article in all_articles:
-            if article['link'] not in seen_links:
-                unique_articles.append(article)
-                seen_links.add(article['link'])
+                if self.deadline.expired:
+                    self.stats['unfinished_feeds'].append(feed.get('source', 'Unknown'))
+                    continue
+                writer.add(self.collect_from_feed(feed), feed.get('feed_url'))
         
-        logger.info(f"📊 Collected {len(unique_articles)} unique articles")
+        writer.flush()
+        self.stats['total_inserted'] = writer.totals['inserted']
+        self.stats['total_updated'] = writer.totals['updated']
+        self.stats['total_skipped'] = writer.totals['skipped']
+        self.stats['total_failed'] = writer.totals['failed']
+        self.stats['total_processed'] = writer.processed
+        logger.info(f"📊 Collected {writer.processed} unique articles in {writer.totals['batches']} batches")
         
-        # Save to database
-        if unique_articles:
-            save_stats = self.save_articles(unique_articles)
-            # Update stats with proper keys
-            self.stats['total_inserted'] = save_stats.get('inserted', 0)
-            self.stats['total_updated'] = save_stats.get('updated', 0)
-            self.stats['total_skipped'] = save_stats.get('skipped', 0)
-            self.stats['total_processed'] = len(unique_articles)
+        # Feeds that were cut short kept no pending watermark or validators; save the rest
+        self.save_feed_progress()
         
         end_time = time.time()
         duration = end_time - start_time
         
-        logger.info(f"✅ Collection completed in {duration:.2f} seconds")
+        partial = self.deadline.expired
+        if partial:
+            logger.warning(f"⏱️ Collection stopped early ({self.deadline.reason}) after {duration:.2f} seconds")
+        else:
+            logger.info(f"✅ Collection completed in {duration:.2f} seconds")
         logger.info(f"📈 Stats: {self.stats}")
         
         return {
@@ -621,17 +883,43 @@ class EnhancedNewsCollector:
             'stats': self.stats,
             'total_feeds': len(feeds_to_process),
             'successful_feeds': len(self.stats['successful_feeds']),
-            'failed_feeds': len(self.stats['failed_feeds'])
+            'failed_feeds': len(self.stats['failed_feeds']),
+            'skipped_feeds': len(self.stats['skipped_feeds']),
+            'partial': partial,
+            'stop_reason': self.deadline.reason if partial else None,
+            'new_entries': dict(self.new_entries_by_feed),
+            'summaries': llm_summarizer.stats()
         }
+    
+    def _batch_settings(self) -> Dict:
+        settings = {'batch_size': self.config.batch_size, 'interval': self.config.batch_interval}
+        return {key: value for key, value in settings.items() if value is not None}
+    
+    def _feed_result(self, future, feed: Dict) -> List[Dict]:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Feed collection failed: {feed.get('source', 'Unknown')}: {e}")
+            return []
 
 # Global collector instance
 collector = EnhancedNewsCollector()
 
-def collect_news_sync(max_feeds: Optional[int] = None) -> Dict:
+def collect_news_sync(max_feeds: Optional[int] = None, feeds: Optional[List[Dict]] = None,
+                      deadline: Optional[Deadline] = None, sink: Optional[ArticleSink] = None,
+                      config: Optional[IngestConfig] = None) -> Dict:
     """Synchronous news collection"""
-    return collector.collect_all_news(max_feeds)
+    return collector.collect_all_news(max_feeds, feeds, deadline, sink, config)
 
-async def collect_news_async(max_feeds: Optional[int] = None) -> Dict:
-    """Asynchronous news collection"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, collect_news_sync, max_feeds)
\ No newline at end of file
+async def collect_news_async(max_feeds: Optional[int] = None, feeds: Optional[List[Dict]] = None,
+                             deadline: Optional[Deadline] = None, sink: Optional[ArticleSink] = None,
+                             config: Optional[IngestConfig] = None) -> Dict:
+    """Asynchronous news collection on the asyncio engine"""
+    try:
+        from async_collector import async_collector
+    except ImportError as e:
+        # aiohttp not installed: run the threaded collector off the event loop
+        logger.warning(f"Async collector not available, using thread pool: {e}")
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, collect_news_sync, max_feeds, feeds, deadline, sink, config)
+    return await async_collector.collect_all_news(max_feeds, feeds, deadline, sink, config)
\ No newline at end of file
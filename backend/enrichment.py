@@ -0,0 +1,172 @@
+"""
+Article enrichment: keywords, heuristic summary, summary cleanup and tech filter
+Pure text functions with no database or session imports, shared by the
+collectors and the offline reprocessor's worker processes.
+"""
+
+import re
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+
+from term_matcher import TermMatcher
+from ingest_engine import env_flag
+
+STRICT_TECH_KEYWORDS = env_flag("STRICT_TECH_KEYWORDS", True)
+
+# Enhanced keyword processing
+STOP_WORDS = {
+    "기자", "뉴스", "특파원", "오늘", "매우", "기사", "사진", "영상", "제공", "입력",
+    "것", "수", "등", "및", "그리고", "그러나", "하지만", "지난", "이번", "관련", "대한", "통해", "대해", "위해",
+    "입니다", "한다", "했다", "하였다", "에서는", "에서", "대한", "이날", "라며", "다고", "였다", "했다가", "하며",
+    "the", "and", "for", "are", "but", "not", "you", "all", "can", "had", "her", "was", "one", "our"
+}
+
+TECH_KEYWORDS = {
+    # AI/ML
+    "ai", "인공지능", "machine learning", "머신러닝", "deep learning", "딥러닝",
+    "chatgpt", "gpt", "llm", "생성형ai", "generative ai", "신경망", "neural network",
+    
+    # Hardware/Semiconductors
+    "반도체", "semiconductor", "메모리", "memory", "dram", "nand", "hbm",
+    "gpu", "cpu", "npu", "tpu", "fpga", "asic", "칩셋", "chipset",
+    "삼성전자", "samsung", "sk하이닉스", "tsmc", "엔비디아", "nvidia",
+    
+    # Communication/Network
+    "5g", "6g", "lte", "와이파이", "wifi", "블루투스", "bluetooth",
+    "클라우드", "cloud", "데이터센터", "data center", "서버", "server",
+    "네트워크", "network", "cdn", "api", "sdk",
+    
+    # Blockchain/Fintech
+    "블록체인", "blockchain", "암호화폐", "cryptocurrency", "bitcoin", "비트코인",
+    "ethereum", "이더리움", "nft", "defi", "메타버스", "metaverse",
+    
+    # Automotive/Energy
+    "자율주행", "autonomous", "전기차", "electric vehicle", "ev", "tesla", "테슬라",
+    "배터리", "battery", "리튬", "lithium", "수소", "hydrogen",
+    
+    # Security
+    "보안", "security", "해킹", "hacking", "사이버", "cyber", "랜섬웨어", "ransomware",
+    "개인정보", "privacy", "데이터보호", "gdpr", "제로트러스트", "zero trust",
+    
+    # Software/Development
+    "오픈소스", "open source", "개발자", "developer", "프로그래밍", "programming",
+    "python", "javascript", "react", "node.js", "docker", "kubernetes",
+}
+
+# Non-tech indicators for the tech filter
+NON_TECH_PATTERNS = [
+    "연예", "스포츠", "예능", "드라마", "영화", "음악", "게임",
+    "요리", "여행", "패션", "뷰티", "건강", "운동", "다이어트"
+]
+
+# Both dictionaries compiled once; a single pass finds tech and non-tech terms
+TECH_MATCHER = TermMatcher({"tech": sorted(TECH_KEYWORDS), "non_tech": NON_TECH_PATTERNS})
+
+
+# Nouns from morphological analysis must repeat this often to count as keywords
+MIN_NOUN_FREQUENCY = 2
+
+
+def extract_keywords(text: str, title: str = "", top_k: int = 15,
+                     tokens: Optional[Sequence[Tuple[str, str]]] = None) -> List[str]:
+    """
+    Enhanced keyword extraction. `tokens` are (form, tag) pairs from the Kiwi
+    NLP service for Korean articles; frequent nouns among them are added
+    after the dictionary and pattern matches.
+    """
+    if not text and not title:
+        return []
+
+    combined_text = f"{title} {text}".lower()
+    keywords = []
+
+    # 1. Extract tech keywords (in order of first appearance)
+    for keyword in TECH_MATCHER.scan(combined_text).terms:
+        if keyword in TECH_KEYWORDS:
+            keywords.append(keyword.title() if keyword.islower() else keyword)
+
+    # 2. Extract patterns
+    patterns = [
+        r'\b[A-Z]{2,5}\b',  # Acronyms
+        r'\b\d+[A-Za-z]{1,3}\b',  # Version numbers
+        r'[가-힣]{2,8}(?:기술|시스템|플랫폼|서비스|솔루션)',  # Korean tech terms
+    ]
+
+    for pattern in patterns:
+        matches = re.findall(pattern, text + " " + title)
+        for match in matches:
+            if len(match) >= 2 and match.lower() not in STOP_WORDS:
+                keywords.append(match)
+
+    # 3. Frequent nouns from morphological analysis
+    if tokens:
+        nouns = Counter(form for form, tag in tokens if tag == "Noun" and len(form) >= 2)
+        keywords.extend(form for form, count in nouns.most_common() if count >= MIN_NOUN_FREQUENCY)
+
+    # 4. Remove duplicates and filter
+    unique_keywords = []
+    seen = set()
+    for kw in keywords:
+        kw_lower = kw.lower()
+        if kw_lower not in seen and kw_lower not in STOP_WORDS and len(kw) >= 2:
+            unique_keywords.append(kw)
+            seen.add(kw_lower)
+
+    return unique_keywords[:top_k]
+
+
+def heuristic_summarize(title: str, text: str) -> str:
+    """Rule-based summarization"""
+    if not text:
+        return title
+
+    # Clean and split into sentences
+    clean_text = re.sub(r'\s+', ' ', text)
+    sentences = re.split(r'(?<=[.!?])\s+', clean_text)
+
+    # Take first 2-3 sentences
+    summary_sentences = []
+    char_count = 0
+    for sentence in sentences:
+        if char_count + len(sentence) > 300:
+            break
+        summary_sentences.append(sentence.strip())
+        char_count += len(sentence)
+        if len(summary_sentences) >= 3:
+            break
+
+    summary = " ".join(summary_sentences)
+    return summary if summary else title
+
+
+def sanitize_summary(summary: Optional[str]) -> str:
+    """Summary without a leading [bracket tag], echoed 제목:/첫 문장: labels or runs of whitespace"""
+    if not summary:
+        return ""
+    text = str(summary).strip()
+    text = re.sub(r"^\s*\[[^\]]*\]\s*", "", text)
+    text = re.sub(r"(^|\s)제목\s*:\s*", r"\1", text)
+    text = re.sub(r"(^|\s)첫\s*문장\s*:\s*", r"\1", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def is_tech_article(title: str, text: str, keywords: List[str]) -> bool:
+    """Determine if article is tech-related"""
+    if not STRICT_TECH_KEYWORDS:
+        return True
+
+    combined = f"{title} {text} {' '.join(keywords)}".lower()
+
+    # Distinct tech keywords and non-tech indicators present
+    matches = TECH_MATCHER.scan(combined)
+    tech_score = matches.count("tech")
+    non_tech_score = matches.count("non_tech")
+
+    return tech_score > non_tech_score and tech_score > 0
+
+
+def enrich_text(title: str, text: str, tokens: Optional[Sequence[Tuple[str, str]]] = None,
+                top_k: int = 15) -> Tuple[str, List[str], bool]:
+    """(heuristic summary, keywords, is_tech) of one article; picklable for worker processes"""
+    keywords = extract_keywords(text, title, top_k, tokens)
+    return heuristic_summarize(title, text), keywords, is_tech_article(title, text, keywords)
@@ -0,0 +1,106 @@
+"""
+Content-hash memoization of article enrichment
+Summary, keywords and the tech verdict depend only on an article's title,
+body and language plus the enrichment code and settings. Results are stored
+in enrichment_cache under a hash of that content and a pipeline version, and
+looked up before enriching, so a re-seen article with an unchanged body
+(re-polled pages, SKIP_UPDATE_IF_EXISTS=false) costs one indexed read and
+no OpenAI call. Bumping ENRICHMENT_PIPELINE_VERSION, or switching the
+summarizer, changes the version and so invalidates every entry at once;
+entries of superseded versions are pruned.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database import db
+from ingest_engine import env_flag
+
+logger = logging.getLogger(__name__)
+
+ENABLE_ENRICHMENT_CACHE = env_flag("ENABLE_ENRICHMENT_CACHE", True)
+ENRICHMENT_PIPELINE_VERSION = os.getenv("ENRICHMENT_PIPELINE_VERSION", "1")
+ENRICHMENT_CACHE_TTL_DAYS = int(os.getenv("ENRICHMENT_CACHE_TTL_DAYS", "30"))
+
+
+@dataclass
+class CachedEnrichment:
+    summary: str
+    keywords: List[str]
+    is_tech: bool
+    category: Optional[str]
+
+
+def content_hash(title: str, text: str, language: str = "", options: str = "") -> str:
+    """Hash of everything enrichment reads from the article itself, plus per-run options"""
+    parts = (language or "", title or "", text or "") + ((options,) if options else ())
+    payload = "\x00".join(parts)
+    return hashlib.sha256(payload.encode("utf-8", "ignore")).hexdigest()
+
+
+class EnrichmentCache:
+    def __init__(self, namespace: str, settings: str = "", enabled: bool = ENABLE_ENRICHMENT_CACHE):
+        """
+        `namespace` separates pipelines that enrich differently (one per
+        collector); `settings` folds configuration that changes results
+        (e.g. which summarizer runs) into the version.
+        """
+        self.namespace = namespace
+        self.version = f"{namespace}:{ENRICHMENT_PIPELINE_VERSION}:{settings}"
+        self.enabled = enabled
+        self._pruned = False
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def _prune_once(self) -> None:
+        with self._lock:
+            if self._pruned:
+                return
+            self._pruned = True
+        cutoff = (datetime.now() - timedelta(days=ENRICHMENT_CACHE_TTL_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            removed = db.prune_enrichment_cache(self.namespace, self.version, cutoff)
+            if removed:
+                logger.info(f"🧹 Pruned {removed} stale enrichment cache entries")
+        except Exception as e:
+            logger.warning(f"Enrichment cache prune failed: {e}")
+
+    def get(self, key: str) -> Optional[CachedEnrichment]:
+        if not self.enabled:
+            return None
+        self._prune_once()
+        try:
+            row = db.get_cached_enrichment(key, self.version)
+        except Exception as e:
+            logger.warning(f"Enrichment cache lookup failed: {e}")
+            row = None
+        with self._lock:
+            self._stats['hits' if row else 'misses'] += 1
+        if not row:
+            return None
+        keywords = row['keywords']
+        if isinstance(keywords, str):
+            try:
+                keywords = json.loads(keywords)
+            except (json.JSONDecodeError, TypeError):
+                keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+        return CachedEnrichment(row['summary'], keywords or [], bool(row['is_tech']), row['category'])
+
+    def put(self, key: str, result: CachedEnrichment) -> None:
+        if not self.enabled:
+            return
+        try:
+            db.save_cached_enrichment(key, self.version, result.summary, result.keywords,
+                                      result.is_tech, result.category)
+        except Exception as e:
+            logger.warning(f"Enrichment cache write failed: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, version=self.version, enabled=self.enabled)
@@ -0,0 +1,131 @@
+"""
+Learned per-domain extraction profiles
+Most sources render every article with one template. While a host has no
+profile, each extraction runs the generic scorer and votes for the selector
+of its winning container; once one selector has won PROFILE_MIN_PAGES pages
+(and most of the pages seen) it is stored in extraction_profiles and later
+pages go straight to it. A profile that keeps missing (template change) is
+dropped and learning starts over.
+"""
+
+import os
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from database import db
+from host_scheduler import host_of
+from parsers import Extraction
+from ingest_engine import env_flag
+
+logger = logging.getLogger(__name__)
+
+ENABLE_EXTRACTION_PROFILES = env_flag("ENABLE_EXTRACTION_PROFILES", True)
+PROFILE_MIN_PAGES = int(os.getenv("PROFILE_MIN_PAGES", "3"))
+PROFILE_MAX_MISSES = int(os.getenv("PROFILE_MAX_MISSES", "3"))
+PROFILE_SAVE_EVERY = 25
+# Share of learning samples the winning selector needs before it is trusted
+_MIN_AGREEMENT = 2 / 3
+
+
+@dataclass
+class HostProfile:
+    selector: Optional[str] = None  # confirmed selector, None while learning
+    samples: int = 0
+    hits: int = 0
+    misses: int = 0                 # consecutive misses of the confirmed selector
+    votes: Counter = field(default_factory=Counter)
+
+
+class ExtractionProfiles:
+    def __init__(self, enabled: bool = ENABLE_EXTRACTION_PROFILES):
+        self.enabled = enabled
+        self._profiles: Dict[str, HostProfile] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        try:
+            rows = db.get_extraction_profiles()
+        except Exception as e:
+            logger.warning(f"Extraction profile lookup failed: {e}")
+            rows = []
+        with self._lock:
+            for row in rows:
+                self._profiles[row['host']] = HostProfile(
+                    selector=row['selector'], samples=row['samples'] or 0, hits=row['hits'] or 0,
+                )
+            self._loaded = True
+        if rows:
+            logger.info(f"🧭 Loaded extraction profiles for {len(rows)} hosts")
+
+    def selector_for(self, url: str) -> Optional[str]:
+        """Learned selector for the URL's host (None while still learning)"""
+        if not self.enabled:
+            return None
+        self.ensure_loaded()
+        profile = self._profiles.get(host_of(url))
+        return profile.selector if profile else None
+
+    def observe(self, url: str, result: Extraction) -> None:
+        """Fold one extraction outcome into the host's profile"""
+        if not self.enabled:
+            return
+        host = host_of(url)
+        save = delete = False
+        with self._lock:
+            profile = self._profiles.setdefault(host, HostProfile())
+            if profile.selector:
+                if result.from_profile:
+                    profile.hits += 1
+                    profile.misses = 0
+                    save = profile.hits % PROFILE_SAVE_EVERY == 0
+                else:
+                    profile.misses += 1
+                    if profile.misses >= PROFILE_MAX_MISSES:
+                        logger.info(f"🧭 Extraction profile for {host} stopped matching; relearning")
+                        profile = self._profiles[host] = HostProfile()
+                        delete = True
+            if not profile.selector:
+                profile.samples += 1
+                if result.selector:
+                    profile.votes[result.selector] += 1
+                    selector, count = profile.votes.most_common(1)[0]
+                    if count >= PROFILE_MIN_PAGES and count >= _MIN_AGREEMENT * profile.samples:
+                        profile.selector = selector
+                        profile.votes.clear()
+                        save = True
+                        logger.info(f"🧭 Learned extraction profile for {host}: {selector}")
+                if not save and profile.samples >= PROFILE_MIN_PAGES * 4:
+                    # No template dominates; start a fresh window rather than voting forever
+                    profile.samples = 0
+                    profile.votes.clear()
+            snapshot = (profile.selector, profile.samples, profile.hits, profile.misses)
+
+        try:
+            if delete:
+                db.delete_extraction_profile(host)
+            if save:
+                db.save_extraction_profile(host, *snapshot)
+        except Exception as e:
+            logger.warning(f"Extraction profile update failed for {host}: {e}")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                host: {
+                    'selector': p.selector,
+                    'samples': p.samples,
+                    'hits': p.hits,
+                    'misses': p.misses,
+                }
+                for host, p in self._profiles.items()
+            }
+
+
+# Global profile store
+extraction_profiles = ExtractionProfiles()
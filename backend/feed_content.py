@@ -0,0 +1,118 @@
+"""
+Feed-content-first extraction
+Many feeds (WordPress content:encoded, IEEE Spectrum fulltext) already carry
+the whole article. An entry whose own body is long enough and does not end
+in a "read more" stub is used as-is and the article page is never fetched.
+Each feed's share of full-text entries is tracked as an EMA and persisted in
+feed_content_mode; once a feed is known to publish full text, any
+non-trivial body it carries is trusted too.
+"""
+
+import os
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from database import db
+from parsers import MAX_MAIN_TEXT, feed_entry_text, is_full_article_text
+from ingest_engine import env_flag
+
+logger = logging.getLogger(__name__)
+
+FEED_CONTENT_FIRST = env_flag("FEED_CONTENT_FIRST", True)
+FEED_FULLTEXT_MIN_CHARS = int(os.getenv("FEED_FULLTEXT_MIN_CHARS", "800"))
+FEED_TRUSTED_MIN_CHARS = int(os.getenv("FEED_TRUSTED_MIN_CHARS", "200"))
+FEED_FULLTEXT_MIN_SAMPLES = int(os.getenv("FEED_FULLTEXT_MIN_SAMPLES", "5"))
+FEED_FULLTEXT_ALPHA = float(os.getenv("FEED_FULLTEXT_ALPHA", "0.2"))
+# Hysteresis so a feed does not flip on a single short or teaser item
+_FULL_TEXT_ON = 0.7
+_FULL_TEXT_OFF = 0.3
+_SAVE_EVERY = 10
+
+
+@dataclass
+class FeedContentMode:
+    full_text: bool = False
+    richness: float = 0.0  # EMA of the share of entries carrying the full article
+    samples: int = 0
+
+
+class FeedContentModes:
+    def __init__(self, enabled: bool = FEED_CONTENT_FIRST):
+        self.enabled = enabled
+        self._modes: Dict[str, FeedContentMode] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        try:
+            rows = db.get_feed_content_modes()
+        except Exception as e:
+            logger.warning(f"Feed content mode lookup failed: {e}")
+            rows = []
+        with self._lock:
+            for row in rows:
+                self._modes[row['feed_url']] = FeedContentMode(
+                    bool(row['full_text']), float(row['richness'] or 0.0), row['samples'] or 0
+                )
+            self._loaded = True
+
+    def article_text(self, feed_url: Optional[str], entry, track: bool = True) -> Optional[str]:
+        """
+        Article text taken from the entry itself, or None when the page must be
+        fetched. Every call also updates the feed's full-text estimate; with
+        track=False (sinks without backend state) only the entry's own body
+        counts and nothing is loaded or saved.
+        """
+        if not self.enabled or not feed_url:
+            return None
+        text = feed_entry_text(entry)
+        rich = is_full_article_text(text, FEED_FULLTEXT_MIN_CHARS)
+        if not track:
+            return text[:MAX_MAIN_TEXT] if rich else None
+        self.ensure_loaded()
+
+        with self._lock:
+            mode = self._modes.setdefault(feed_url, FeedContentMode())
+            was_full_text = mode.full_text
+            mode.samples += 1
+            if mode.samples == 1:
+                mode.richness = 1.0 if rich else 0.0
+            else:
+                mode.richness = FEED_FULLTEXT_ALPHA * rich + (1 - FEED_FULLTEXT_ALPHA) * mode.richness
+            if mode.samples >= FEED_FULLTEXT_MIN_SAMPLES:
+                if mode.richness >= _FULL_TEXT_ON:
+                    mode.full_text = True
+                elif mode.richness <= _FULL_TEXT_OFF:
+                    mode.full_text = False
+            trusted = mode.full_text
+            save = trusted != was_full_text or mode.samples % _SAVE_EVERY == 0
+            snapshot = (mode.full_text, mode.richness, mode.samples)
+
+        if trusted != was_full_text:
+            state = "carries full articles" if trusted else "needs article pages"
+            logger.info(f"📰 Feed {feed_url} {state} (richness {snapshot[1]:.2f})")
+        if save:
+            try:
+                db.save_feed_content_mode(feed_url, *snapshot)
+            except Exception as e:
+                logger.warning(f"Feed content mode update failed for {feed_url}: {e}")
+
+        if rich or (trusted and is_full_article_text(text, FEED_TRUSTED_MIN_CHARS)):
+            return text[:MAX_MAIN_TEXT]
+        return None
+
+    def snapshot(self) -> Dict[str, Dict]:
+        self.ensure_loaded()
+        with self._lock:
+            return {
+                url: {'full_text': m.full_text, 'richness': round(m.richness, 3), 'samples': m.samples}
+                for url, m in self._modes.items()
+            }
+
+
+# Global feed content mode tracker
+feed_content_modes = FeedContentModes()
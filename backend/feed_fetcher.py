@@ -0,0 +1,125 @@
+"""
+Conditional feed fetching
+Feeds are fetched through a pooled session with connect/read timeouts,
+sending the stored ETag / Last-Modified validators. A 304 or a body whose
+hash matches the last fetch means nothing changed, so parsing is skipped.
+A response's own validators are only saved (save_state) once the entries
+read from it are stored: a run cut short by its deadline must not leave the
+next poll a 304 for entries it never reached.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+FEED_CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "10.0"))
+FEED_READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "15.0"))
+FEED_HEADERS = {"User-Agent": "Mozilla/5.0 (NewsAgent/2.0; +https://github.com/newsbot)"}
+
+
+@dataclass
+class FeedFetchResult:
+    url: str
+    status: Optional[int]
+    changed: bool
+    content: Optional[bytes] = None
+    error: Optional[str] = None
+    # Validators to persist with FeedFetcher.save_state
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FeedFetcher:
+    def __init__(self, session: Optional[requests.Session] = None):
+        self._session = session
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled session for collectors that do not bring their own"""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=1)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    @staticmethod
+    def load_state(feed_url: str) -> Optional[Dict]:
+        try:
+            return db.get_feed_state(feed_url)
+        except Exception as e:
+            logger.warning(f"Feed state lookup failed for {feed_url}: {e}")
+            return None
+
+    @staticmethod
+    def conditional_headers(state: Optional[Dict]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since from the stored validators"""
+        headers = {}
+        if state:
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def handle_response(self, feed_url: str, state: Optional[Dict], status: int,
+                        headers, content: Optional[bytes]) -> FeedFetchResult:
+        """Compare a (successful or 304) response with the stored state"""
+        if status == 304:
+            return FeedFetchResult(feed_url, status, changed=False)
+
+        content = content or b""
+        content_hash = hashlib.sha256(content).hexdigest()
+        changed = not state or state.get('content_hash') != content_hash
+        return FeedFetchResult(feed_url, status, changed, content if changed else None,
+                               etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'),
+                               content_hash=content_hash)
+
+    @staticmethod
+    def save_state(result: FeedFetchResult) -> None:
+        """Persist a fetch's validators; call once the entries read from it are stored"""
+        if not result.ok or result.status is None:
+            return
+        try:
+            db.save_feed_state(result.url, result.etag, result.last_modified, result.content_hash,
+                               result.status, result.changed)
+        except Exception as e:
+            logger.warning(f"Feed state update failed for {result.url}: {e}")
+
+    def fetch(self, feed_url: str, session: Optional[requests.Session] = None) -> FeedFetchResult:
+        """Conditional GET of a feed; content is only returned when the body changed (validators are not saved)"""
+        state = self.load_state(feed_url)
+        try:
+            response = (session or self.session).get(
+                feed_url,
+                headers={**FEED_HEADERS, **self.conditional_headers(state)},
+                timeout=(FEED_CONNECT_TIMEOUT, FEED_READ_TIMEOUT),
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Feed fetch failed for {feed_url}: {e}")
+            return FeedFetchResult(feed_url, None, changed=False, error=str(e))
+        return self.handle_response(feed_url, state, response.status_code, response.headers, response.content)
+
+
+# Global fetcher instance
+feed_fetcher = FeedFetcher()
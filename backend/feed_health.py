@@ -0,0 +1,244 @@
+"""
+Per-feed health tracking and circuit breaker
+Every feed poll reports its outcome: the fetch latency of its first page, or
+the error when no page could be fetched or the feed held no entries. Health
+(recent latencies, failure streak, last success/error) is kept in memory and
+persisted to feed_health, so it survives restarts and collection runs.
+
+After FEED_FAILURE_THRESHOLD consecutive failures a feed's circuit opens and
+collectors skip it instead of spending connect/read timeouts and retries on
+it. Once the cooldown has passed the circuit goes half-open and the next run
+polls the feed once as a probe: success closes the circuit, failure opens it
+again with the cooldown doubled (up to FEED_MAX_COOLDOWN).
+"""
+
+import os
+import json
+import logging
+import threading
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database import db
+from ingest_engine import env_flag
+
+logger = logging.getLogger(__name__)
+
+ENABLE_FEED_CIRCUIT_BREAKER = env_flag("ENABLE_FEED_CIRCUIT_BREAKER", True)
+FEED_FAILURE_THRESHOLD = int(os.getenv("FEED_FAILURE_THRESHOLD", "3"))
+FEED_COOLDOWN = float(os.getenv("FEED_COOLDOWN", "1800"))
+FEED_MAX_COOLDOWN = float(os.getenv("FEED_MAX_COOLDOWN", "86400"))
+FEED_LATENCY_WINDOW = int(os.getenv("FEED_LATENCY_WINDOW", "50"))
+# Feeds whose p95 fetch latency exceeds this are reported as slow
+FEED_SLOW_MS = float(os.getenv("FEED_SLOW_MS", "5000"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _now() -> str:
+    return datetime.now().strftime(_TIME_FORMAT)
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value)[:19], _TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class FeedHealth:
+    feed_url: str
+    source: Optional[str] = None
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    trips: int = 0
+    total_successes: int = 0
+    total_failures: int = 0
+    latencies: List[float] = field(default_factory=list)
+    last_latency_ms: Optional[float] = None
+    last_error: Optional[str] = None
+    last_success_at: Optional[str] = None
+    last_failure_at: Optional[str] = None
+    open_until: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "FeedHealth":
+        try:
+            latencies = json.loads(row.get('latencies') or "[]")
+        except (json.JSONDecodeError, TypeError):
+            latencies = []
+        times = {
+            key: (value.strftime(_TIME_FORMAT) if isinstance(value, datetime) else value)
+            for key in ('last_success_at', 'last_failure_at', 'open_until')
+            for value in [row.get(key)]
+        }
+        return cls(
+            feed_url=row['feed_url'], source=row.get('source'), state=row.get('state') or CLOSED,
+            consecutive_failures=row.get('consecutive_failures') or 0, trips=row.get('trips') or 0,
+            total_successes=row.get('total_successes') or 0, total_failures=row.get('total_failures') or 0,
+            latencies=latencies, last_latency_ms=row.get('last_latency_ms'), last_error=row.get('last_error'),
+            **times,
+        )
+
+    def to_row(self) -> Dict:
+        return dict(asdict(self), latencies=json.dumps(self.latencies))
+
+    def summary(self) -> Dict:
+        p95 = percentile(self.latencies, 95)
+        return {
+            'feed_url': self.feed_url,
+            'source': self.source,
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'trips': self.trips,
+            'total_successes': self.total_successes,
+            'total_failures': self.total_failures,
+            'latency_ms': {
+                'p50': percentile(self.latencies, 50),
+                'p90': percentile(self.latencies, 90),
+                'p95': p95,
+                'last': self.last_latency_ms,
+                'samples': len(self.latencies),
+            },
+            'slow': p95 is not None and p95 > FEED_SLOW_MS,
+            'last_success_at': self.last_success_at,
+            'last_failure_at': self.last_failure_at,
+            'last_error': self.last_error,
+            'open_until': self.open_until,
+        }
+
+
+class FeedHealthTracker:
+    def __init__(self, enabled: bool = ENABLE_FEED_CIRCUIT_BREAKER):
+        self.enabled = enabled
+        self._feeds: Dict[str, FeedHealth] = {}
+        self._probing: set = set()
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            for row in db.get_feed_health():
+                self._feeds[row['feed_url']] = FeedHealth.from_row(row)
+        except Exception as e:
+            logger.warning(f"Feed health load failed: {e}")
+
+    def _health(self, feed_url: str, source: Optional[str] = None) -> FeedHealth:
+        self._load()
+        health = self._feeds.get(feed_url)
+        if health is None:
+            health = self._feeds[feed_url] = FeedHealth(feed_url, source)
+        if source:
+            health.source = source
+        return health
+
+    def _save(self, health: FeedHealth) -> None:
+        try:
+            db.save_feed_health(health.to_row())
+        except Exception as e:
+            logger.warning(f"Feed health update failed for {health.feed_url}: {e}")
+
+    def allow(self, feed_url: str, source: Optional[str] = None) -> bool:
+        """Whether the feed should be polled now; a half-open circuit lets one probe through"""
+        if not self.enabled:
+            return True
+        with self._lock:
+            health = self._health(feed_url, source)
+            if health.state == CLOSED:
+                return True
+            if feed_url in self._probing:
+                return False
+            if health.state == OPEN:
+                open_until = _parse_time(health.open_until)
+                if open_until and datetime.now() < open_until:
+                    return False
+                health.state = HALF_OPEN
+            self._probing.add(feed_url)
+        logger.info(f"🩺 {source or feed_url}: circuit half-open, probing")
+        self._save(health)
+        return True
+
+    def record_success(self, feed_url: str, latency_ms: float, source: Optional[str] = None) -> None:
+        with self._lock:
+            health = self._health(feed_url, source)
+            recovered = health.state != CLOSED
+            health.state = CLOSED
+            health.consecutive_failures = 0
+            health.total_successes += 1
+            health.open_until = None
+            health.last_success_at = _now()
+            health.last_latency_ms = round(latency_ms, 1)
+            health.latencies = (health.latencies + [health.last_latency_ms])[-FEED_LATENCY_WINDOW:]
+            self._probing.discard(feed_url)
+        if recovered:
+            logger.info(f"💚 {source or feed_url}: circuit closed")
+        self._save(health)
+
+    def record_failure(self, feed_url: str, error: str, source: Optional[str] = None) -> None:
+        with self._lock:
+            health = self._health(feed_url, source)
+            health.consecutive_failures += 1
+            health.total_failures += 1
+            health.last_failure_at = _now()
+            health.last_error = (error or "")[:500]
+            trip = health.state == HALF_OPEN or (
+                health.state == CLOSED and health.consecutive_failures >= FEED_FAILURE_THRESHOLD
+            )
+            if trip and self.enabled:
+                health.trips += 1
+                cooldown = min(FEED_MAX_COOLDOWN, FEED_COOLDOWN * 2 ** (health.trips - 1))
+                health.state = OPEN
+                health.open_until = (datetime.now() + timedelta(seconds=cooldown)).strftime(_TIME_FORMAT)
+            self._probing.discard(feed_url)
+        if trip and self.enabled:
+            logger.warning(f"🔌 {source or feed_url}: circuit open for {cooldown:.0f}s after "
+                           f"{health.consecutive_failures} failures ({health.last_error})")
+        self._save(health)
+
+    def record_poll(self, feed_url: str, source: Optional[str], latency_ms: Optional[float],
+                    error: Optional[str] = None) -> None:
+        """Outcome of one poll: a failure when there is an error or no page was fetched"""
+        if error is None and latency_ms is not None:
+            self.record_success(feed_url, latency_ms, source)
+        else:
+            self.record_failure(feed_url, error or "fetch failed", source)
+
+    def reset(self, feed_url: str) -> Optional[Dict]:
+        """Close a feed's circuit by hand (e.g. after fixing its URL)"""
+        with self._lock:
+            self._load()
+            health = self._feeds.get(feed_url)
+            if health is None:
+                return None
+            health.state = CLOSED
+            health.consecutive_failures = 0
+            health.open_until = None
+            self._probing.discard(feed_url)
+        self._save(health)
+        return health.summary()
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            self._load()
+            return [health.summary() for health in self._feeds.values()]
+
+
+# Global health tracker instance
+feed_health = FeedHealthTracker()
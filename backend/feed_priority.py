@@ -0,0 +1,75 @@
+"""
+Feed ordering by expected yield
+When a run has a deadline, the feeds most likely to have new articles should
+go first. A feed's expected yield is its learned publish rate (feed_schedule,
+maintained by the poll scheduler, or the source's recent article history)
+times the hours since it was last polled, halved for every consecutive
+failure recorded in feed_health. Feeds nothing is known about get the
+median so new sources are neither starved nor put ahead of everything.
+"""
+
+import logging
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from database import db
+from feed_health import feed_health
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DAYS = 14
+MAX_HOURS_SINCE_POLL = 48.0
+DEFAULT_HOURS_SINCE_POLL = 24.0
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _hours_since(value, now: datetime) -> float:
+    if value is None:
+        return DEFAULT_HOURS_SINCE_POLL
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.strptime(str(value)[:19], _TIME_FORMAT)
+        except ValueError:
+            return DEFAULT_HOURS_SINCE_POLL
+    return min(MAX_HOURS_SINCE_POLL, max(0.0, (now - value).total_seconds() / 3600))
+
+
+def expected_yields(feeds: List[Dict]) -> Dict[str, float]:
+    """Expected new entries per feed_url right now"""
+    now = datetime.now()
+    try:
+        schedules = {row['feed_url']: row for row in db.get_feed_schedules()}
+        history = db.get_source_publish_counts(now - timedelta(days=HISTORY_DAYS))
+    except Exception as e:
+        logger.warning(f"Feed yield history unavailable: {e}")
+        schedules, history = {}, {}
+    failures = {h['feed_url']: h['consecutive_failures'] for h in feed_health.snapshot()}
+
+    yields: Dict[str, float] = {}
+    for feed in feeds:
+        url = feed.get("feed_url")
+        schedule = schedules.get(url)
+        if schedule and schedule.get('rate_per_hour') is not None:
+            rate, since = schedule['rate_per_hour'], schedule.get('last_polled_at')
+        elif feed.get("source") in history:
+            rate, since = history[feed["source"]] / (HISTORY_DAYS * 24), None
+        else:
+            continue
+        yields[url] = rate * _hours_since(since, now) * 0.5 ** failures.get(url, 0)
+
+    known = list(yields.values())
+    default = statistics.median(known) if known else 1.0
+    for feed in feeds:
+        url = feed.get("feed_url")
+        if url not in yields:
+            yields[url] = default * 0.5 ** failures.get(url, 0)
+    return yields
+
+
+def prioritize_feeds(feeds: List[Dict]) -> List[Dict]:
+    """Feeds sorted by expected yield, highest first (stable for ties)"""
+    if len(feeds) < 2:
+        return list(feeds)
+    yields = expected_yields(feeds)
+    return sorted(feeds, key=lambda feed: -yields.get(feed.get("feed_url"), 0.0))
@@ -0,0 +1,101 @@
+"""
+Per-feed incremental watermarks
+Records the newest entry (GUID/link and published time) seen for each feed
+so paged feeds stop walking as soon as a page reaches already-known items,
+and entries older than the watermark are dropped before processing.
+"""
+
+import logging
+import calendar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def entry_guid(entry) -> str:
+    """Stable entry identity: RSS guid / Atom id, falling back to the link"""
+    return (entry.get("id") or entry.get("guid") or entry.get("link") or "").strip()
+
+
+def entry_time(entry) -> Optional[datetime]:
+    """Published (or updated) time as naive UTC, None when the feed omits it"""
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    if not parsed:
+        return None
+    try:
+        return datetime.utcfromtimestamp(calendar.timegm(parsed))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def newest_first(entries: List) -> List:
+    """Entries ordered newest-first; undated entries keep their feed order at the end"""
+    return sorted(entries, key=lambda e: entry_time(e) or datetime.min, reverse=True)
+
+
+@dataclass
+class Watermark:
+    guid: Optional[str] = None
+    published: Optional[datetime] = None
+
+    def is_new(self, entry) -> bool:
+        """True when the entry is newer than the watermark"""
+        guid = entry_guid(entry)
+        if self.guid and guid == self.guid:
+            return False
+        published = entry_time(entry)
+        if self.published is None or published is None:
+            return True
+        return published >= self.published
+
+    def overlaps(self, entries: List) -> bool:
+        """A page overlaps once any of its entries is at or behind the watermark"""
+        if self.guid is None and self.published is None:
+            return False
+        return any(not self.is_new(entry) for entry in entries)
+
+    @classmethod
+    def from_entries(cls, entries: List) -> Optional["Watermark"]:
+        """Watermark for the newest of the given entries"""
+        dated = [e for e in entries if entry_time(e) and entry_guid(e)]
+        if dated:
+            newest = max(dated, key=entry_time)
+            return cls(entry_guid(newest), entry_time(newest))
+        for entry in entries:
+            if entry_guid(entry):
+                return cls(entry_guid(entry), None)
+        return None
+
+
+def load_watermark(feed_url: str) -> Watermark:
+    try:
+        row = db.get_feed_watermark(feed_url)
+    except Exception as e:
+        logger.warning(f"Watermark lookup failed for {feed_url}: {e}")
+        row = None
+    if not row:
+        return Watermark()
+    published = row.get('last_published')
+    if published and not isinstance(published, datetime):
+        try:
+            published = datetime.strptime(str(published)[:19], _TIME_FORMAT)
+        except ValueError:
+            published = None
+    return Watermark(row.get('last_guid'), published)
+
+
+def save_watermarks(pending: Dict[str, Watermark]) -> None:
+    """Persist advanced watermarks (call once the collected articles are stored)"""
+    for feed_url, mark in pending.items():
+        try:
+            db.save_feed_watermark(
+                feed_url, mark.guid, mark.published.strftime(_TIME_FORMAT) if mark.published else None
+            )
+        except Exception as e:
+            logger.warning(f"Watermark update failed for {feed_url}: {e}")
@@ -0,0 +1,193 @@
+"""
+Per-host politeness scheduler
+Caps concurrent connections and spaces request starts per host, honours
+Retry-After and adapts each host's rate AIMD-style: additive increase on
+success, multiplicative decrease on 429/503. Callers wait for a host slot
+before taking a global fetch slot, so a throttled host never blocks others.
+Threaded callers do not sleep through a long throttle backoff: acquire()
+raises HostThrottled instead, freeing the worker thread for other hosts.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+HOST_MAX_CONNECTIONS = int(os.getenv("HOST_MAX_CONNECTIONS", "2"))
+HOST_MIN_INTERVAL = float(os.getenv("HOST_MIN_INTERVAL", "0.25"))
+HOST_MAX_INTERVAL = float(os.getenv("HOST_MAX_INTERVAL", "30"))
+HOST_RATE_STEP = float(os.getenv("HOST_RATE_STEP", "0.25"))
+HOST_BACKOFF_FACTOR = float(os.getenv("HOST_BACKOFF_FACTOR", "0.5"))
+HOST_MAX_RETRY_AFTER = float(os.getenv("HOST_MAX_RETRY_AFTER", "300"))
+HOST_MAX_RETRIES = int(os.getenv("HOST_MAX_RETRIES", "2"))
+# Longest throttle backoff a worker thread sleeps through before giving up on the request
+HOST_MAX_BLOCKING_WAIT = float(os.getenv("HOST_MAX_BLOCKING_WAIT", "2"))
+# Per-domain overrides: "rss.etnews.com:1:1.0,zdnet.co.kr:2:0.5" (host:max_connections:min_interval)
+HOST_LIMITS = os.getenv("HOST_LIMITS", "")
+
+THROTTLE_STATUSES = {429, 503}
+_POLL_INTERVAL = 0.05
+
+
+class HostThrottled(RuntimeError):
+    """The host is backing off for longer than a blocking caller waits"""
+
+
+def _parse_host_limits(spec: str) -> Dict[str, Tuple[int, float]]:
+    limits = {}
+    for item in spec.split(","):
+        parts = item.strip().split(":")
+        if len(parts) != 3:
+            continue
+        try:
+            limits[parts[0].lower()] = (max(1, int(parts[1])), max(0.0, float(parts[2])))
+        except ValueError:
+            logger.warning(f"Ignoring invalid HOST_LIMITS entry: {item}")
+    return limits
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date); None if absent or invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+@dataclass
+class HostState:
+    max_connections: int
+    min_interval: float
+    rate: float                 # current requests/second
+    active: int = 0
+    next_start: float = 0.0     # monotonic time of the next allowed request start
+    blocked_until: float = 0.0  # monotonic time set by Retry-After / backoff
+    throttled: int = 0
+
+
+class HostScheduler:
+    def __init__(self, max_connections: int = HOST_MAX_CONNECTIONS,
+                 min_interval: float = HOST_MIN_INTERVAL, limits: Optional[str] = HOST_LIMITS):
+        self.max_connections = max_connections
+        self.min_interval = min_interval
+        self.limits = _parse_host_limits(limits or "")
+        self._hosts: Dict[str, HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            max_connections, min_interval = self.max_connections, self.min_interval
+            for domain, limit in self.limits.items():
+                if host == domain or host.endswith("." + domain):
+                    max_connections, min_interval = limit
+                    break
+            max_rate = 1.0 / min_interval if min_interval > 0 else float("inf")
+            state = HostState(max_connections, min_interval, max_rate)
+            self._hosts[host] = state
+        return state
+
+    def _try_acquire(self, host: str, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Take a slot and return how long to sleep before starting (-1 if no slot
+        is free, None if the host's throttle backoff lasts longer than max_wait)
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            if max_wait is not None and state.blocked_until - now > max_wait:
+                return None
+            if state.active >= state.max_connections:
+                return -1.0
+            start = max(now, state.next_start, state.blocked_until)
+            state.next_start = start + (1.0 / state.rate if state.rate != float("inf") else 0.0)
+            state.active += 1
+            return start - now
+
+    def acquire(self, host: str, max_wait: Optional[float] = None) -> None:
+        """
+        Blocking acquire for threaded collectors. With max_wait, raises
+        HostThrottled rather than sleeping through a longer throttle backoff.
+        """
+        while True:
+            delay = self._try_acquire(host, max_wait)
+            if delay is None:
+                raise HostThrottled(f"{host} is throttled; not waiting for its backoff")
+            if delay >= 0:
+                if delay:
+                    time.sleep(delay)
+                return
+            time.sleep(_POLL_INTERVAL)
+
+    async def acquire_async(self, host: str) -> None:
+        """Non-blocking acquire for the asyncio engine; other hosts keep running"""
+        while True:
+            delay = self._try_acquire(host)
+            if delay >= 0:
+                if delay:
+                    await asyncio.sleep(delay)
+                return
+            await asyncio.sleep(_POLL_INTERVAL)
+
+    def release(self, host: str, status: Optional[int] = None, retry_after: Optional[str] = None) -> bool:
+        """
+        Return a slot and feed the response back into the host's rate.
+        Returns True when the response was a throttle signal worth retrying.
+        """
+        with self._lock:
+            state = self._state(host)
+            state.active = max(0, state.active - 1)
+            max_rate = 1.0 / state.min_interval if state.min_interval > 0 else float("inf")
+
+            if status in THROTTLE_STATUSES:
+                state.throttled += 1
+                current = state.rate if state.rate != float("inf") else 1.0
+                state.rate = max(1.0 / HOST_MAX_INTERVAL, current * HOST_BACKOFF_FACTOR)
+                wait = parse_retry_after(retry_after)
+                if wait is None:
+                    wait = 1.0 / state.rate
+                wait = min(wait, HOST_MAX_RETRY_AFTER)
+                state.blocked_until = max(state.blocked_until, time.monotonic() + wait)
+                logger.info(f"🐢 {host} throttled ({status}); pausing {wait:.1f}s, rate {state.rate:.2f}/s")
+                return True
+
+            if status is not None and status < 400 and state.rate < max_rate:
+                state.rate = min(max_rate, state.rate + HOST_RATE_STEP)
+            return False
+
+    def snapshot(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    'active': s.active,
+                    'rate': round(s.rate, 3) if s.rate != float("inf") else None,
+                    'blocked_for': round(max(0.0, s.blocked_until - now), 1),
+                    'throttled': s.throttled,
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+# Global scheduler instance
+host_scheduler = HostScheduler()
@@ -0,0 +1,222 @@
+"""
+Content-addressed raw HTML store
+Every fetched article page is kept as a zstd-compressed blob named by the
+SHA-256 of its bytes (identical pages are stored once) and indexed by
+canonical link and fetch time in html_snapshots, so extraction and
+enrichment can be replayed offline after the logic changes. A dictionary
+trained on stored pages (`python html_store.py train-dict`) improves the
+ratio on small pages; each blob records the dictionary it was written with.
+Once the store exceeds HTML_STORE_MAX_BYTES the oldest snapshots and their
+orphaned blobs are evicted.
+"""
+
+import os
+import sys
+import zlib
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from database import db
+from ingest_engine import env_flag
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ENABLE_HTML_STORE = env_flag("ENABLE_HTML_STORE", True)
+HTML_STORE_DIR = os.getenv("HTML_STORE_DIR", "/tmp/html_store")
+HTML_STORE_MAX_BYTES = int(os.getenv("HTML_STORE_MAX_BYTES", str(1024 ** 3)))
+HTML_STORE_LEVEL = int(os.getenv("HTML_STORE_LEVEL", "9"))
+HTML_STORE_DICT_SIZE = int(os.getenv("HTML_STORE_DICT_SIZE", str(112 * 1024)))
+# Size is checked against the limit every this many new blobs
+_EVICT_EVERY = 50
+_EVICT_BATCH = 50
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class HtmlStore:
+    def __init__(self, root: str = HTML_STORE_DIR, max_bytes: int = HTML_STORE_MAX_BYTES,
+                 enabled: bool = ENABLE_HTML_STORE):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._new_blobs = 0
+        self._dict: Optional["zstandard.ZstdCompressionDict"] = None
+        self._dict_id: Optional[str] = None
+        self._dicts: Dict[str, "zstandard.ZstdCompressionDict"] = {}
+        self._dict_loaded = False
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "blobs", sha256[:2], sha256[2:4], sha256)
+
+    def _dict_path(self, dict_id: str) -> str:
+        return os.path.join(self.root, "dicts", f"{dict_id}.dict")
+
+    def _load_dictionary(self, dict_id: str) -> Optional["zstandard.ZstdCompressionDict"]:
+        if dict_id not in self._dicts:
+            try:
+                with open(self._dict_path(dict_id), "rb") as f:
+                    self._dicts[dict_id] = zstandard.ZstdCompressionDict(f.read())
+            except OSError:
+                return None
+        return self._dicts[dict_id]
+
+    def _current_dictionary(self) -> Tuple[Optional[str], Optional["zstandard.ZstdCompressionDict"]]:
+        """Most recently trained dictionary (CURRENT file), if any"""
+        if not self._dict_loaded:
+            self._dict_loaded = True
+            try:
+                with open(os.path.join(self.root, "dicts", "CURRENT")) as f:
+                    dict_id = f.read().strip()
+            except OSError:
+                dict_id = ""
+            if dict_id and self._load_dictionary(dict_id) is not None:
+                self._dict_id, self._dict = dict_id, self._dicts[dict_id]
+        return self._dict_id, self._dict
+
+    def _compress(self, raw: bytes) -> Tuple[bytes, str, Optional[str]]:
+        if not ZSTD_AVAILABLE:
+            return zlib.compress(raw, 6), "zlib", None
+        dict_id, dictionary = self._current_dictionary()
+        compressor = zstandard.ZstdCompressor(level=HTML_STORE_LEVEL, dict_data=dictionary)
+        return compressor.compress(raw), "zstd", dict_id
+
+    def _decompress(self, data: bytes, codec: str, dict_id: Optional[str]) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read zstd blobs")
+        dictionary = self._load_dictionary(dict_id) if dict_id else None
+        if dict_id and dictionary is None:
+            raise RuntimeError(f"zstd dictionary {dict_id} is missing")
+        return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(data)
+
+    def put(self, link: str, html: bytes, charset: Optional[str] = None,
+            fetched_at: Optional[datetime] = None) -> Optional[str]:
+        """Store a fetched page for a canonical link; returns its SHA-256 (None when disabled or on error)"""
+        if not self.enabled or not html:
+            return None
+        sha256 = hashlib.sha256(html).hexdigest()
+        path = self._blob_path(sha256)
+        try:
+            compressed = None if os.path.exists(path) else self._compress(html)
+            # Under the eviction lock so a blob cannot be removed between the check and the snapshot
+            with self._lock:
+                if not os.path.exists(path):
+                    data, codec, dict_id = compressed or self._compress(html)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp, path)
+                    if db.save_html_blob(sha256, codec, dict_id, len(html), len(data)):
+                        self._new_blobs += 1
+                db.add_html_snapshot(link, sha256, charset, (fetched_at or datetime.now()).strftime(_TIME_FORMAT))
+                evict = self._new_blobs >= _EVICT_EVERY
+                if evict:
+                    self._new_blobs = 0
+        except Exception as e:
+            logger.warning(f"HTML store write failed for {link}: {e}")
+            return None
+
+        if evict:
+            self.evict()
+        return sha256
+
+    def get(self, sha256: str, codec: str = "zstd", dict_id: Optional[str] = None) -> Optional[bytes]:
+        try:
+            with open(self._blob_path(sha256), "rb") as f:
+                return self._decompress(f.read(), codec, dict_id)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"HTML blob {sha256} unreadable: {e}")
+            return None
+
+    def latest(self, link: str) -> Optional[Tuple[bytes, Optional[str], str]]:
+        """Newest stored page of a link as (html, charset, fetched_at)"""
+        snapshot = db.get_html_snapshot(link)
+        if not snapshot:
+            return None
+        html = self.get(snapshot['sha256'], snapshot['codec'], snapshot['dict_id'])
+        if html is None:
+            return None
+        return html, snapshot['charset'], str(snapshot['fetched_at'])
+
+    def evict(self) -> int:
+        """Drop the oldest snapshots and orphaned blobs until the store fits; returns blobs removed"""
+        removed = 0
+        with self._lock:
+            try:
+                stored = db.get_html_store_stats()['stored_bytes']
+                while stored > self.max_bytes:
+                    if not db.delete_oldest_html_snapshots(_EVICT_BATCH):
+                        break
+                    orphans = db.get_orphan_html_blobs()
+                    for blob in orphans:
+                        try:
+                            os.remove(self._blob_path(blob['sha256']))
+                        except FileNotFoundError:
+                            pass
+                        stored -= blob['stored_size'] or 0
+                    db.delete_html_blobs([blob['sha256'] for blob in orphans])
+                    removed += len(orphans)
+            except Exception as e:
+                logger.warning(f"HTML store eviction failed: {e}")
+        if removed:
+            logger.info(f"🗑️ Evicted {removed} HTML blobs to stay under {self.max_bytes} bytes")
+        return removed
+
+    def train_dictionary(self, samples: int = 2000) -> Optional[str]:
+        """Train a zstd dictionary on the newest stored pages and make it current for new blobs"""
+        if not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed; cannot train a dictionary")
+            return None
+        rows = db.get_recent_html_blobs(samples)
+        pages = [page for page in (self.get(r['sha256'], r['codec'], r['dict_id']) for r in rows) if page]
+        if len(pages) < 10:
+            logger.warning(f"Only {len(pages)} stored pages; not enough to train a dictionary")
+            return None
+
+        dictionary = zstandard.train_dictionary(HTML_STORE_DICT_SIZE, pages)
+        dict_id = str(dictionary.dict_id())
+        os.makedirs(os.path.join(self.root, "dicts"), exist_ok=True)
+        with open(self._dict_path(dict_id), "wb") as f:
+            f.write(dictionary.as_bytes())
+        with open(os.path.join(self.root, "dicts", "CURRENT"), "w") as f:
+            f.write(dict_id)
+        self._dicts[dict_id] = dictionary
+        self._dict_id, self._dict, self._dict_loaded = dict_id, dictionary, True
+        logger.info(f"📚 Trained zstd dictionary {dict_id} on {len(pages)} pages")
+        return dict_id
+
+    def stats(self) -> Dict:
+        stats = db.get_html_store_stats()
+        stats['codec'] = "zstd" if ZSTD_AVAILABLE else "zlib"
+        stats['dictionary'] = self._current_dictionary()[0] if ZSTD_AVAILABLE else None
+        stats['max_bytes'] = self.max_bytes
+        if stats['stored_bytes']:
+            stats['ratio'] = round(stats['raw_bytes'] / stats['stored_bytes'], 2)
+        return stats
+
+
+# Global HTML store instance
+html_store = HtmlStore()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    db.init_database()
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "train-dict":
+        html_store.train_dictionary()
+    elif command == "evict":
+        html_store.evict()
+    print(html_store.stats())
@@ -0,0 +1,322 @@
+"""
+Unified ingest engine
+Every entry point (the API, the news_collector / integrated / simple
+scripts, the Streamlit app's ingest and the archive backfill) runs feeds
+through the same engine: the enhanced collector's pooled, polite HTTP and
+lxml extraction, the async stage pipeline when aiohttp is installed, cached
+enrichment and micro-batched saves. Front-ends differ only in their
+IngestConfig and in where the articles go, which is a sink:
+
+    DatabaseSink  the backend database (bulk link lookup, keyword rollups, LSH index)
+    SqliteSink    an articles table in a standalone SQLite file (bulk upsert)
+    JsonlSink     one JSON object per line
+    CsvSink       spreadsheet-friendly CSV (UTF-8 with BOM)
+    TeeSink       several of the above at once
+
+Only the backend database keeps fetch state between runs: conditional GET
+validators, feed watermarks, the near-duplicate index, stored pages, feed
+health and priority, feed content modes, extraction profiles and the
+enrichment / LLM caches. Runs into other sinks never touch the backend
+database: they see every entry the feeds currently carry and decide for
+themselves which links they already have.
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from collection_deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Boolean setting; accepts true/1/yes/on so the Streamlit .env files keep working"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "t", "yes", "y", "on")
+
+
+# Shared collection settings
+MAX_RESULTS = int(os.getenv("MAX_RESULTS", "15"))
+MAX_TOTAL_PER_SOURCE = int(os.getenv("MAX_TOTAL_PER_SOURCE", "200"))
+RSS_BACKFILL_PAGES = int(os.getenv("RSS_BACKFILL_PAGES", "3"))
+
+CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "10.0"))
+READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "15.0"))
+PARALLEL_MAX_WORKERS = int(os.getenv("PARALLEL_MAX_WORKERS", "8"))
+
+SKIP_UPDATE_IF_EXISTS = env_flag("SKIP_UPDATE_IF_EXISTS", True)
+SKIP_NON_TECH = env_flag("SKIP_NON_TECH", False)
+
+ARTICLE_FIELDS = ["title", "link", "published", "source", "category", "language", "summary", "keywords"]
+
+
+@dataclass
+class IngestConfig:
+    """Per-run collection settings; defaults come from the shared environment settings"""
+    max_results: int = MAX_RESULTS                      # entries read from each feed page
+    max_pages: int = RSS_BACKFILL_PAGES                 # WordPress-style ?paged=N pages walked
+    max_total_per_source: int = MAX_TOTAL_PER_SOURCE
+    skip_existing: bool = SKIP_UPDATE_IF_EXISTS         # drop links the sink already holds
+    skip_non_tech: bool = SKIP_NON_TECH
+    fetch_pages: bool = True                            # fetch article pages for teaser entries
+    since: Optional[datetime] = None                    # drop entries published before this (naive UTC)
+    batch_size: Optional[int] = None                    # None: the collector's own batch settings
+    batch_interval: Optional[float] = None
+    summary_style: str = "brief"                        # llm_summarizer.SUMMARY_STYLES key
+    keyword_count: int = 15                             # keywords kept per article
+
+
+class ArticleSink:
+    """Where collected articles go; write() gets micro-batches from the engine"""
+    # Sinks backed by the backend database share its fetch state (see module docstring)
+    uses_backend_state = False
+
+    def write(self, articles: List[Dict]) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def contains(self, link: str) -> bool:
+        """Whether the sink already holds a link (checked before an entry is fetched)"""
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class DatabaseSink(ArticleSink):
+    """The backend database, through the collector's batched save"""
+    uses_backend_state = True
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def write(self, articles: List[Dict]) -> Dict[str, int]:
+        return self.collector.save_articles(articles)
+
+    def contains(self, link: str) -> bool:
+        # Imported here: process-safe modules (enrichment, nlp_service) import this one for env_flag
+        from database import db
+        return bool(db.execute_query(f"SELECT id FROM articles WHERE link = {db.placeholder}", (link,)))
+
+
+class SqliteSink(ArticleSink):
+    """
+    An articles table in a standalone SQLite file, as used by the Streamlit
+    app and the legacy scripts. Each batch is one link lookup plus one
+    executemany upsert. Only the columns the table has are written, so older
+    schemas without raw_text or keywords keep working.
+    """
+
+    def __init__(self, path: str, update_existing: bool = True):
+        self.path = path
+        self.update_existing = update_existing
+        self._conn: Optional[sqlite3.Connection] = None
+        self._columns: List[str] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT,
+                    link TEXT UNIQUE,
+                    published TEXT,
+                    source TEXT,
+                    raw_text TEXT,
+                    summary TEXT,
+                    keywords TEXT,
+                    category TEXT,
+                    created_at TEXT DEFAULT (datetime('now'))
+                )
+            """)
+            self._conn.commit()
+            table = {row[1] for row in self._conn.execute("PRAGMA table_info(articles)")}
+            self._columns = [c for c in ("title", "link", "published", "source", "raw_text",
+                                         "summary", "keywords", "category") if c in table]
+        return self._conn
+
+    def _existing(self, conn: sqlite3.Connection, links: List[str]) -> set:
+        found = set()
+        for start in range(0, len(links), 500):
+            chunk = links[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(row[0] for row in conn.execute(f"SELECT link FROM articles WHERE link IN ({marks})", chunk))
+        return found
+
+    @staticmethod
+    def _row(article: Dict, columns: List[str]) -> tuple:
+        values = []
+        for column in columns:
+            value = article.get(column)
+            if column == "keywords" and not isinstance(value, str):
+                value = json.dumps(value or [], ensure_ascii=False)
+            values.append(value)
+        return tuple(values)
+
+    def write(self, articles: List[Dict]) -> Dict[str, int]:
+        batch = {}
+        for article in articles:
+            batch.setdefault(article['link'], article)
+        with self._lock:
+            conn = self._connect()
+            existing = self._existing(conn, list(batch))
+            new = [a for link, a in batch.items() if link not in existing]
+            stored = [a for link, a in batch.items() if link in existing] if self.update_existing else []
+
+            columns = ", ".join(self._columns)
+            marks = ", ".join("?" * len(self._columns))
+            conn.executemany(f"INSERT OR IGNORE INTO articles ({columns}) VALUES ({marks})",
+                             [self._row(a, self._columns) for a in new])
+            if stored:
+                updates = [c for c in self._columns if c != "link"]
+                assignments = ", ".join(f"{c} = ?" for c in updates)
+                conn.executemany(f"UPDATE articles SET {assignments} WHERE link = ?",
+                                 [self._row(a, updates) + (a['link'],) for a in stored])
+            conn.commit()
+        return {
+            'inserted': len(new),
+            'updated': len(stored),
+            'skipped': len(articles) - len(new) - len(stored),
+        }
+
+    def contains(self, link: str) -> bool:
+        with self._lock:
+            conn = self._connect()
+            return conn.execute("SELECT 1 FROM articles WHERE link = ? LIMIT 1", (link,)).fetchone() is not None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _FileSink(ArticleSink):
+    """
+    Appends records to a file. The first open of a run truncates it (unless
+    append); links written once are skipped afterwards.
+    """
+    encoding = "utf-8"
+
+    def __init__(self, path: str, fields: Sequence[str] = ARTICLE_FIELDS, append: bool = False):
+        self.path = path
+        self.fields = list(fields)
+        self.append = append
+        self._file = None
+        self._opened = False
+        self._links = set()
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._file is None:
+            mode = "a" if self.append or self._opened else "w"
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, mode, newline="", encoding=self.encoding)
+            if mode == "w" or self._file.tell() == 0:
+                self._start(self._file)
+            self._opened = True
+        return self._file
+
+    def _start(self, handle) -> None:
+        pass
+
+    def _write_record(self, handle, record: Dict) -> None:
+        raise NotImplementedError
+
+    def write(self, articles: List[Dict]) -> Dict[str, int]:
+        stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
+        with self._lock:
+            handle = self._open()
+            for article in articles:
+                if article['link'] in self._links:
+                    stats['skipped'] += 1
+                    continue
+                self._links.add(article['link'])
+                self._write_record(handle, {field: article.get(field) for field in self.fields})
+                stats['inserted'] += 1
+            handle.flush()
+        return stats
+
+    def contains(self, link: str) -> bool:
+        with self._lock:
+            return link in self._links
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._opened:
+                # A run that found nothing still leaves an (empty, headed) file
+                self._open()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JsonlSink(_FileSink):
+    def _write_record(self, handle, record: Dict) -> None:
+        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CsvSink(_FileSink):
+    # The BOM lets Excel detect UTF-8 (Korean titles)
+    encoding = "utf-8-sig"
+
+    def _start(self, handle) -> None:
+        csv.writer(handle).writerow(self.fields)
+
+    def _write_record(self, handle, record: Dict) -> None:
+        if isinstance(record.get("keywords"), list):
+            record["keywords"] = ", ".join(record["keywords"])
+        csv.writer(handle).writerow(["" if record[f] is None else record[f] for f in self.fields])
+
+
+class TeeSink(ArticleSink):
+    """Writes every batch to several sinks; stats and lookups come from the first"""
+
+    def __init__(self, *sinks: ArticleSink):
+        self.sinks = sinks
+        self.uses_backend_state = any(sink.uses_backend_state for sink in sinks)
+
+    def write(self, articles: List[Dict]) -> Dict[str, int]:
+        results = [sink.write(articles) for sink in self.sinks]
+        return results[0]
+
+    def contains(self, link: str) -> bool:
+        return self.sinks[0].contains(link)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+async def ingest_async(feeds: List[Dict], sink: Optional[ArticleSink] = None, config: Optional[IngestConfig] = None,
+                       deadline: Optional[Deadline] = None) -> Dict:
+    """Collect the given feed configs into a sink (default: the backend database) and close it"""
+    # Imported here: the collectors import this module for their configuration
+    from enhanced_news_collector import collect_news_async
+    try:
+        return await collect_news_async(feeds=feeds, deadline=deadline, sink=sink, config=config)
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+def ingest(feeds: List[Dict], sink: Optional[ArticleSink] = None, config: Optional[IngestConfig] = None,
+           deadline: Optional[Deadline] = None) -> Dict:
+    """Blocking entry point for scripts and the Streamlit app"""
+    return asyncio.run(ingest_async(feeds, sink, config, deadline))
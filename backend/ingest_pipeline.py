@@ -0,0 +1,518 @@
+"""
+Staged ingest pipeline
+A collection run is split into stages connected by bounded asyncio queues:
+
+    feed fetch → entry filter → page fetch → extract/enrich → persist
+
+Network stages (feed and page fetch) wait on aiohttp inside the collector's
+in-flight budget; the entry filter runs its DB lookups and simhash checks in
+threads; extraction and keyword/summary enrichment run in the collector's
+worker process pool, so BeautifulSoup/lxml work no longer competes with
+network waits for the same slots. Entries whose feed already carries the
+full body skip the page fetch stage. Persistence writes articles to the
+run's sink in batches of PIPELINE_PERSIST_BATCH, or whatever arrived within
+PIPELINE_PERSIST_INTERVAL (unless the run's IngestConfig sets its own).
+
+Every stage has its own worker count, and because the queues are bounded a
+slow stage makes the ones before it wait (backpressure) instead of piling
+up fetched pages in memory. Each stage reports items/s, utilization and the
+time it spent blocked on the next stage's queue.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from enrichment import enrich_text
+from enrichment_cache import CachedEnrichment
+from near_duplicates import simhash_index
+from feed_watermarks import newest_first
+from html_store import html_store
+from parsers import parse_feed_content, extract_article, charset_from_content_type
+from nlp_service import nlp_service
+from llm_summarizer import llm_summarizer
+from collection_deadline import DEADLINE_GRACE
+from micro_batch import PERSIST_BATCH_SIZE, PERSIST_BATCH_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_FEED_WORKERS = int(os.getenv("PIPELINE_FEED_WORKERS", "8"))
+PIPELINE_FILTER_WORKERS = int(os.getenv("PIPELINE_FILTER_WORKERS", "4"))
+PIPELINE_PAGE_WORKERS = int(os.getenv("PIPELINE_PAGE_WORKERS", "16"))
+# Enough to keep the process pool busy while some workers wait on the LLM
+PIPELINE_ENRICH_WORKERS = int(os.getenv("PIPELINE_ENRICH_WORKERS", "8"))
+PIPELINE_PERSIST_WORKERS = int(os.getenv("PIPELINE_PERSIST_WORKERS", "1"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+PIPELINE_PERSIST_BATCH = int(os.getenv("PIPELINE_PERSIST_BATCH", str(PERSIST_BATCH_SIZE)))
+PIPELINE_PERSIST_INTERVAL = float(os.getenv("PIPELINE_PERSIST_INTERVAL", str(PERSIST_BATCH_INTERVAL)))
+
+_DONE = object()
+
+
+@dataclass
+class FeedRun:
+    """One feed's progress through a run"""
+    config: Dict
+    queued: int = 0
+    # Set when entries were skipped or cancelled; the feed's watermark and validators then stay put
+    incomplete: bool = False
+
+    @property
+    def feed_url(self) -> Optional[str]:
+        return self.config.get("feed_url")
+
+    @property
+    def source(self) -> str:
+        return self.config.get("source", "Unknown")
+
+    @property
+    def category(self) -> str:
+        return self.config.get("category", "News")
+
+    @property
+    def language(self) -> str:
+        return self.config.get("lang", "en")
+
+
+@dataclass
+class EntryItem:
+    """An RSS entry on its way to becoming an article"""
+    feed: FeedRun
+    entry: Any
+    prepared: Optional[Dict] = None
+    raw_text: str = ""
+    html: Optional[bytes] = None
+    charset: Optional[str] = None
+    article: Optional[Dict] = None
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    queue_size: int
+    processed: int = 0
+    emitted: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def snapshot(self, queue_depth: int) -> Dict:
+        end = self.finished_at or time.monotonic()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'emitted': self.emitted,
+            'errors': self.errors,
+            'items_per_second': round(self.processed / elapsed, 2) if elapsed else 0.0,
+            # Share of worker time spent on items (not idle, not blocked downstream)
+            'utilization': round(self.busy_seconds / (self.workers * elapsed), 3) if elapsed else 0.0,
+            'backpressure_seconds': round(self.blocked_seconds, 3),
+            'queue_depth': queue_depth,
+            'queue_size': self.queue_size,
+            'elapsed_seconds': round(elapsed, 3),
+        }
+
+
+Handler = Callable[[Any], Awaitable[Iterable[Tuple["Stage", Any]]]]
+
+
+class Stage:
+    """
+    A pool of workers draining one bounded queue. The handler returns
+    (next stage, item) pairs; putting them blocks while that stage's queue
+    is full. With batch_size > 1 the handler receives a list of items.
+    """
+
+    def __init__(self, name: str, workers: int, handler: Handler, queue_size: int = PIPELINE_QUEUE_SIZE,
+                 on_drop: Optional[Callable[[Any, str], None]] = None,
+                 batch_size: int = 1, batch_interval: float = 0.0):
+        self.name = name
+        self.workers = max(1, workers)
+        self.handler = handler
+        self.on_drop = on_drop
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.metrics = StageMetrics(name, self.workers, self.inbox.maxsize)
+        self.targets: List["Stage"] = []
+        self._upstreams = 0
+        self._finished_upstreams = 0
+        self._closed = False
+
+    def connect(self, *stages: "Stage") -> None:
+        """Declare the stages this one emits to; each closes once all its upstreams finish"""
+        for stage in stages:
+            self.targets.append(stage)
+            stage._upstreams += 1
+
+    async def close(self) -> None:
+        """No more input: every worker exits after draining the queue"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self.workers):
+            await self.inbox.put(_DONE)
+
+    async def _upstream_finished(self) -> None:
+        self._finished_upstreams += 1
+        if self._finished_upstreams >= self._upstreams:
+            await self.close()
+
+    async def run(self) -> None:
+        self.metrics.started_at = time.monotonic()
+        worker = self._work_batches if self.batch_size > 1 else self._work
+        try:
+            await asyncio.gather(*(worker() for _ in range(self.workers)))
+        finally:
+            self.metrics.finished_at = time.monotonic()
+        for target in self.targets:
+            await target._upstream_finished()
+
+    async def _work(self) -> None:
+        while True:
+            item = await self.inbox.get()
+            if item is _DONE:
+                return
+            await self._handle(item, 1)
+
+    async def _work_batches(self) -> None:
+        while True:
+            item = await self.inbox.get()
+            if item is _DONE:
+                return
+            batch, done = [item], False
+            flush_at = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_size:
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.inbox.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            await self._handle(batch, len(batch))
+            if done:
+                return
+
+    async def _handle(self, item: Any, count: int) -> None:
+        started, blocked = time.monotonic(), 0.0
+        try:
+            outputs = await self.handler(item)
+            for target, output in outputs or ():
+                put_started = time.monotonic()
+                await target.inbox.put(output)
+                blocked += time.monotonic() - put_started
+                self.metrics.emitted += 1
+        except asyncio.CancelledError:
+            self._drop(item, "cancelled")
+            raise
+        except Exception as e:
+            self.metrics.errors += 1
+            logger.error(f"Pipeline stage {self.name} failed: {e}")
+            self._drop(item, "error")
+        finally:
+            self.metrics.processed += count
+            self.metrics.busy_seconds += time.monotonic() - started - blocked
+            self.metrics.blocked_seconds += blocked
+
+    def _drop(self, item: Any, reason: str) -> None:
+        if self.on_drop is None:
+            return
+        for each in (item if isinstance(item, list) else [item]):
+            self.on_drop(each, reason)
+
+    def drain(self) -> List[Any]:
+        """Items left in the queue (after the stage was cancelled)"""
+        items = []
+        while not self.inbox.empty():
+            item = self.inbox.get_nowait()
+            if item is not _DONE:
+                items.append(item)
+        return items
+
+
+class IngestPipeline:
+    def __init__(self, collector, session):
+        self.collector = collector
+        # The run's aiohttp session; requests share the collector's in-flight budget
+        self.session = session
+        self.base = collector.base
+        self.stats = collector.stats
+        self.deadline = collector.deadline
+        self.config = self.base.config
+        self.sink = self.base.sink
+        self.feed_runs: List[FeedRun] = []
+        self._produced = 0
+
+        self.fetch = Stage("feed_fetch", PIPELINE_FEED_WORKERS, self._fetch_feed, on_drop=self._drop_feed)
+        self.filter = Stage("entry_filter", PIPELINE_FILTER_WORKERS, self._filter_entry, on_drop=self._drop_entry)
+        self.pages = Stage("page_fetch", PIPELINE_PAGE_WORKERS, self._fetch_page, on_drop=self._drop_entry)
+        self.enrich = Stage("enrich", PIPELINE_ENRICH_WORKERS, self._enrich_entry, on_drop=self._drop_entry)
+        self.persist = Stage("persist", PIPELINE_PERSIST_WORKERS, self._persist_batch, on_drop=self._drop_unsaved,
+                             batch_size=self.config.batch_size or PIPELINE_PERSIST_BATCH,
+                             batch_interval=self.config.batch_interval or PIPELINE_PERSIST_INTERVAL)
+        self.fetch.connect(self.filter)
+        self.filter.connect(self.pages, self.enrich)
+        self.pages.connect(self.enrich)
+        self.enrich.connect(self.persist)
+        self.stages = [self.fetch, self.filter, self.pages, self.enrich, self.persist]
+
+    # Stage handlers
+
+    async def _fetch_feed(self, run: FeedRun) -> List[Tuple[Stage, EntryItem]]:
+        """Walk a feed's pages down to the watermark and queue its new entries, newest first"""
+        feed_url, source = run.feed_url, run.source
+        if not feed_url:
+            return []
+        if self.deadline.expired:
+            self.stats['unfinished_feeds'].append(source)
+            return []
+
+        # Feeds that keep failing are skipped until their circuit's cooldown ends
+        if not await asyncio.to_thread(self.base.feed_allowed, feed_url, source):
+            logger.info(f"⛔ {source}: circuit open, skipping")
+            self.stats['skipped_feeds'].append(source)
+            return []
+
+        health_recorded = False
+        try:
+            logger.info(f"📡 Collecting from {source}")
+
+            watermark = await asyncio.to_thread(self.base.load_watermark, feed_url)
+            all_entries = []
+            seen_entries = []
+            fetched = []
+            unchanged = False
+            latency_ms, fetch_error = None, None
+            for url in self.base.expand_paged_feed_urls(feed_url):
+                if self.deadline.expired:
+                    break
+                started = time.monotonic()
+                result = await self.collector.fetch_feed(self.session, url)
+                if not result.ok:
+                    # Older pages of a feed that just failed would only add more timeouts
+                    if latency_ms is None:
+                        fetch_error = result.error
+                    break
+                if latency_ms is None:
+                    latency_ms = (time.monotonic() - started) * 1000
+                fetched.append(result)
+                if not result.changed:
+                    # 304 or identical body: nothing new here or on older pages
+                    unchanged = True
+                    break
+                entries = (await self.collector._run_cpu(parse_feed_content, result.content))[:self.config.max_results]
+                seen_entries.extend(entries)
+                new_entries, reached = self.base.filter_page(watermark, entries)
+                all_entries.extend(new_entries)
+                logger.info(f"  📄 {len(new_entries)}/{len(entries)} new entries from page")
+
+                if reached or len(all_entries) >= self.config.max_total_per_source:
+                    break
+
+            self.base.advance_watermark(feed_url, watermark, seen_entries)
+            self.base.hold_feed_states(feed_url, fetched)
+            self.base.new_entries_by_feed[feed_url] = len(all_entries)
+
+            if self.deadline.expired:
+                # The page walk may have been cut short
+                run.incomplete = True
+                if latency_ms is None:
+                    # The deadline passed before the feed could be fetched; says nothing about its health
+                    self.stats['unfinished_feeds'].append(source)
+                    return []
+
+            if latency_ms is not None and not (unchanged or seen_entries):
+                fetch_error = "no entries in feed"
+            await asyncio.to_thread(self.base.record_feed_poll, feed_url, source, latency_ms, fetch_error)
+            health_recorded = True
+
+            if not all_entries and (unchanged or seen_entries):
+                logger.info(f"⏸️ {source}: no new entries since last collection")
+                self.stats['successful_feeds'].append(source)
+                return []
+
+            if not all_entries:
+                logger.warning(f"❌ No entries found for {source}")
+                self.stats['failed_feeds'].append(source)
+                return []
+
+            logger.info(f"✅ {source}: {len(all_entries)} entries queued")
+            self.stats['successful_feeds'].append(source)
+            run.queued = len(all_entries)
+            return [(self.filter, EntryItem(run, entry)) for entry in newest_first(all_entries)]
+
+        except Exception as e:
+            logger.error(f"❌ Failed to collect from {source}: {e}")
+            self.stats['failed_feeds'].append(source)
+            if not health_recorded and not self.deadline.expired:
+                await asyncio.to_thread(self.base.record_feed_failure, feed_url, str(e), source)
+            return []
+
+    async def _filter_entry(self, item: EntryItem) -> List[Tuple[Stage, EntryItem]]:
+        """Drop known links and near-duplicates; entries with a full body in the feed skip the page fetch"""
+        if self.deadline.expired:
+            self._skip(item)
+            return []
+        item.prepared = await asyncio.to_thread(self.base.prepare_entry, item.entry, item.feed.source)
+        if not item.prepared:
+            return []
+        item.raw_text = await asyncio.to_thread(self.base.feed_text, item.feed.feed_url, item.entry)
+        if item.raw_text:
+            self.base.count('page_fetches_skipped')
+            return [(self.enrich, item)]
+        if not self.config.fetch_pages:
+            return [(self.enrich, item)]
+        return [(self.pages, item)]
+
+    async def _fetch_page(self, item: EntryItem) -> List[Tuple[Stage, EntryItem]]:
+        if self.deadline.expired:
+            # Checked before waiting for a host slot, so the queue drains at once
+            self._skip(item)
+            return []
+        link = item.prepared['link']
+        response = await self.collector.request(self.session, link, html_only=True)
+        if response is None and self.deadline.expired:
+            self._skip(item)
+            return []
+        if response:
+            status, headers, item.html = response
+            item.charset = charset_from_content_type(headers.get("Content-Type"))
+            if self.sink.uses_backend_state:
+                await asyncio.to_thread(html_store.put, link, item.html, item.charset)
+        # A failed fetch still yields an article from the feed's own text
+        return [(self.enrich, item)]
+
+    async def _enrich_entry(self, item: EntryItem) -> List[Tuple[Stage, EntryItem]]:
+        """Extract the page and enrich the text in worker processes; LLM summaries stay on the loop"""
+        prepared, run = item.prepared, item.feed
+        link, title = prepared['link'], prepared['title']
+        if item.html is not None:
+            selector = await asyncio.to_thread(self.base.extraction_selector, link)
+            result = await self.collector._run_cpu(extract_article, item.html, item.charset, selector)
+            await asyncio.to_thread(self.base.observe_extraction, link, result)
+            item.raw_text, item.html = result.text, None
+        raw_text = item.raw_text or prepared['rss_text']
+
+        # An unchanged body enriched before is served from the cache (no OpenAI call)
+        key, enrichment = await asyncio.to_thread(self.base.cached_enrichment, title, raw_text, run.language)
+        if not enrichment:
+            wanted_tokens = self.base.wants_tokens(title, raw_text, run.language)
+            tokens = None
+            if wanted_tokens:
+                tokens = await asyncio.to_thread(nlp_service.tokenize, f"{title}\n{raw_text}")
+            config = self.base.config
+            summary, keywords, is_tech = await self.collector._run_cpu(
+                enrich_text, title, raw_text, tokens, config.keyword_count
+            )
+            if self.base.uses_openai:
+                summary = await llm_summarizer.summarize(
+                    title, raw_text, run.source, config.summary_style, prepared['published'],
+                    persist=self.sink.uses_backend_state,
+                ) or summary
+            enrichment = CachedEnrichment(summary, keywords, is_tech, run.category)
+            await asyncio.to_thread(
+                self.base.remember_enrichment, key, enrichment, title, raw_text, wanted_tokens, tokens
+            )
+
+        item.article = self.base.build_article(prepared, raw_text, run.source, run.category, run.language, enrichment)
+        return [(self.persist, item)] if item.article else []
+
+    async def _persist_batch(self, items: List[EntryItem]) -> List:
+        # Sinks check the batch against what they hold, which also drops a link
+        # that arrived from two feeds in this run
+        save_stats = await asyncio.to_thread(self.sink.write, [item.article for item in items])
+        for key in ('inserted', 'updated', 'skipped'):
+            self.stats[f'total_{key}'] += save_stats.get(key, 0)
+            self.stats['total_processed'] += save_stats.get(key, 0)
+        if save_stats.get('failed'):
+            self.stats['total_failed'] += save_stats['failed']
+            for item in items:
+                self._drop_unsaved(item, "failed")
+        logger.info(f"💾 Saved batch of {len(items)} articles "
+                    f"({save_stats.get('inserted', 0)} new, {save_stats.get('updated', 0)} updated)")
+        return []
+
+    # Skipped and cancelled work
+
+    def _skip(self, item: EntryItem) -> None:
+        """An entry not processed because the deadline passed"""
+        self.stats['deadline_skipped'] += 1
+        self._drop_entry(item, "deadline")
+
+    def _drop_entry(self, item: EntryItem, reason: str) -> None:
+        if item.prepared:
+            simhash_index.release(item.prepared['link'])
+        if reason != "error":
+            item.feed.incomplete = True
+
+    def _drop_unsaved(self, item: EntryItem, reason: str) -> None:
+        """A batch that did not reach the sink: its feeds are read again next run"""
+        item.feed.incomplete = True
+        if reason == "error":
+            self.stats['total_failed'] += 1
+
+    def _drop_feed(self, run: FeedRun, reason: str) -> None:
+        if reason == "cancelled":
+            run.incomplete = True
+            self.stats['unfinished_feeds'].append(run.source)
+            logger.warning(f"⏱️ Cancelled {run.source} at the deadline")
+
+    # Run
+
+    async def _produce(self) -> None:
+        for run in self.feed_runs:
+            await self.fetch.inbox.put(run)
+            self._produced += 1
+        await self.fetch.close()
+
+    async def run(self, feeds: List[Dict]) -> None:
+        """
+        Push feeds through every stage and wait for the last save. Once the
+        deadline passes no new entries start; in-flight work gets
+        DEADLINE_GRACE seconds, then the upstream stages are cancelled and
+        whatever reached persist is still saved.
+        """
+        self.feed_runs = [FeedRun(feed) for feed in feeds]
+        upstream = [asyncio.create_task(self._produce())]
+        upstream += [asyncio.create_task(stage.run()) for stage in self.stages[:-1]]
+        persist = asyncio.create_task(self.persist.run())
+
+        pending = set(upstream)
+        while pending and not self.deadline.expired:
+            _, pending = await asyncio.wait(pending, timeout=self.deadline.wait_step(),
+                                            return_when=asyncio.FIRST_COMPLETED)
+        if pending:
+            _, pending = await asyncio.wait(pending, timeout=DEADLINE_GRACE)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for run in self.fetch.drain() + self.feed_runs[self._produced:]:
+                run.incomplete = True
+                self.stats['unfinished_feeds'].append(run.source)
+            for stage in self.stages[1:-1]:
+                for item in stage.drain():
+                    self.stats['deadline_skipped'] += 1
+                    self._drop_entry(item, "cancelled")
+            await self.persist.close()
+        await persist
+
+        for run in self.feed_runs:
+            if run.incomplete:
+                # Entries were left behind; the next run has to read them again
+                self.base.release_feed(run.feed_url)
+        await asyncio.to_thread(self.base.save_feed_progress)
+
+    def metrics(self) -> Dict[str, Dict]:
+        return {stage.name: stage.metrics.snapshot(stage.inbox.qsize()) for stage in self.stages}
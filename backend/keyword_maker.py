@@ -1,46 +1,154 @@
-import openai
 import os
-from typing import List
+import json
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
+from database import db
+from enrichment import extract_keywords as extract_local_keywords
+from llm_summarizer import llm_summarizer, truncate_to_tokens
+
+try:
+    from related_articles import related_index
+except ImportError:
+    related_index = None
+
 load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+logger = logging.getLogger(__name__)
+
+MAX_KEYWORDS = 8
+MAX_KEYWORD_CHARS = 40
+KEYWORD_MAX_INPUT_TOKENS = int(os.getenv("KEYWORD_MAX_INPUT_TOKENS", "600"))
+KEYWORD_MAX_OUTPUT_TOKENS = int(os.getenv("KEYWORD_MAX_OUTPUT_TOKENS", "100"))
+# 기사 조회/저장 단위 (동시 요청 수는 SUMMARY_CONCURRENCY가 제한)
+KEYWORD_BATCH_CHUNK = int(os.getenv("KEYWORD_BATCH_CHUNK", "100"))
+
+KEYWORD_SYSTEM_PROMPT = "당신은 IT/기술 뉴스의 키워드를 추출하는 전문가입니다."
+KEYWORD_PROMPT = """
+다음 텍스트에서 핵심 키워드를 추출해주세요. IT/기술 관련 키워드를 우선적으로 선택하고,
+최대 8개까지 중요한 순서대로 나열해주세요. 각 키워드는 쉼표로 구분하여 반환해주세요.
+
+텍스트: {text}
+"""
+
+
+def parse_keywords(content: str) -> List[str]:
+    """모델 응답(쉼표 구분)을 키워드 목록으로 변환"""
+    keywords = []
+    for part in content.replace("\n", ",").split(","):
+        keyword = part.strip().strip("#-*•·.\"'").strip()
+        # 문장이 섞여 나온 응답은 키워드로 쓰지 않음
+        if keyword and len(keyword) <= MAX_KEYWORD_CHARS and keyword not in keywords:
+            keywords.append(keyword)
+    return keywords[:MAX_KEYWORDS]
+
+
+def _keyword_prompt(text: str) -> str:
+    return KEYWORD_PROMPT.format(text=truncate_to_tokens(text, KEYWORD_MAX_INPUT_TOKENS))
+
 
 def extract_keywords(text: str) -> List[str]:
     """텍스트에서 키워드를 추출합니다."""
-    if not text or not OPENAI_API_KEY:
+    if not text:
         return []
-    
-    try:
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        prompt = f"""
-        다음 텍스트에서 핵심 키워드를 추출해주세요. IT/기술 관련 키워드를 우선적으로 선택하고, 
-        최대 8개까지 중요한 순서대로 나열해주세요. 각 키워드는 쉼표로 구분하여 반환해주세요.
-        
-        텍스트: {text[:1000]}
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "당신은 IT/기술 뉴스의 키워드를 추출하는 전문가입니다."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=100,
-            temperature=0.3
-        )
-        
-        keywords_text = response.choices[0].message.content.strip()
-        keywords = [k.strip() for k in keywords_text.split(',') if k.strip()]
-        
-        return keywords[:8]
-        
-    except Exception as e:
-        print(f"키워드 추출 오류: {e}")
-        # 오류 시 기본 키워드 추출 로직 (간단한 방식)
-        return extract_simple_keywords(text)
+    content = llm_summarizer.complete_sync(KEYWORD_SYSTEM_PROMPT, _keyword_prompt(text), KEYWORD_MAX_OUTPUT_TOKENS)
+    keywords = parse_keywords(content) if content else []
+    # 오류/예산 초과 시 로컬 추출기 사용
+    return keywords or extract_local_keywords(text, top_k=MAX_KEYWORDS)
+
+
+async def extract_keywords_async(title: str, text: str) -> Tuple[List[str], str]:
+    """(키워드, 'llm' | 'local') - 공유 클라이언트로 추출, 실패 시 로컬 추출기"""
+    combined = f"{title} {text or ''}".strip()
+    if not combined:
+        return [], 'local'
+    content = await llm_summarizer.complete(KEYWORD_SYSTEM_PROMPT, _keyword_prompt(combined), KEYWORD_MAX_OUTPUT_TOKENS)
+    keywords = parse_keywords(content) if content else []
+    if keywords:
+        return keywords, 'llm'
+    return extract_local_keywords(text or "", title, top_k=MAX_KEYWORDS), 'local'
+
+
+def _stored_keywords(row: Dict) -> List[str]:
+    keywords = row.get('keywords') or []
+    if isinstance(keywords, str):
+        try:
+            keywords = json.loads(keywords)
+        except (json.JSONDecodeError, TypeError):
+            keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+    return keywords if isinstance(keywords, list) else []
+
+
+async def _extract_chunk(rows: List[Dict]) -> Tuple[List[Dict], Dict[str, int]]:
+    """청크의 기사들을 동시에 처리하고, 바뀐 기사만 일괄 저장"""
+    results = await asyncio.gather(*[
+        extract_keywords_async(row['title'], f"{row.get('summary') or ''}\n{row.get('raw_text') or ''}")
+        for row in rows
+    ])
+    counts = {'llm': 0, 'local': 0}
+    items, updates = [], []
+    for row, (keywords, origin) in zip(rows, results):
+        counts[origin] += 1
+        items.append({'id': row['id'], 'keywords': keywords, 'source': origin})
+        if keywords and set(keywords) != set(_stored_keywords(row)):
+            updates.append(dict(row, keywords=keywords))
+    if updates:
+        # The rollup moves by each article's keyword change in the same transaction
+        await asyncio.to_thread(db.bulk_update_enrichment, updates, {row['id']: row for row in rows})
+        if related_index is not None:
+            for row in updates:
+                related_index.index_article(row['id'], row['title'], row['keywords'])
+    counts['updated'] = len(updates)
+    return items, counts
+
+
+async def extract_keywords_batch(article_ids: Optional[List[int]] = None, since: Optional[str] = None,
+                                 until: Optional[str] = None, sources: Optional[List[str]] = None,
+                                 limit: int = 100) -> Dict:
+    """
+    ID 목록(또는 발행일/출처 필터로 고른 최대 limit건)의 키워드를 다시 추출합니다.
+    요청은 공유 LLM 클라이언트(캐시·동시성 제한·예산)로 동시에 보내고,
+    결과는 JSON 키워드로 bulk_update_enrichment를 통해 저장합니다.
+    """
+    items: List[Dict] = []
+    totals = {'llm': 0, 'local': 0, 'updated': 0}
+    found = set()
+
+    if article_ids:
+        ids = list(dict.fromkeys(article_ids))
+        for start in range(0, len(ids), KEYWORD_BATCH_CHUNK):
+            rows = await asyncio.to_thread(db.get_articles_by_ids, ids[start:start + KEYWORD_BATCH_CHUNK])
+            found.update(row['id'] for row in rows)
+            chunk_items, counts = await _extract_chunk(rows)
+            items.extend(chunk_items)
+            for key, value in counts.items():
+                totals[key] += value
+    else:
+        after_id = 0
+        while len(items) < limit:
+            rows = await asyncio.to_thread(
+                db.get_articles_for_reprocess, after_id, min(KEYWORD_BATCH_CHUNK, limit - len(items)),
+                since, until, sources,
+            )
+            if not rows:
+                break
+            after_id = rows[-1]['id']
+            chunk_items, counts = await _extract_chunk(rows)
+            items.extend(chunk_items)
+            for key, value in counts.items():
+                totals[key] += value
+
+    return {
+        'processed': len(items),
+        'updated': totals['updated'],
+        'llm': totals['llm'],
+        'local_fallback': totals['local'],
+        'missing': [i for i in (article_ids or []) if i not in found],
+        'articles': items,
+    }
+
 
 def extract_simple_keywords(text: str) -> List[str]:
     """간단한 키워드 추출 (백업 방식)"""
@@ -53,10 +161,10 @@ def extract_simple_keywords(text: str) -> List[str]:
         '양자컴퓨팅', '사이버보안', '해킹', '랜섬웨어', '개인정보보호',
         '스타트업', '유니콘', '벤처캐피탈', 'IPO', 'M&A'
     ]
-    
+
     text_lower = text.lower()
     for term in tech_terms:
         if term.lower() in text_lower:
             keywords.append(term)
-    
-    return keywords[:8]
\ No newline at end of file
+
+    return keywords[:8]
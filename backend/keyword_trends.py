@@ -0,0 +1,139 @@
+"""
+Keyword trend time series and burst detection
+Reads the per-day keyword rollup and computes rolling windows with NumPy
+"""
+
+import re
+import logging
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+MAX_TREND_KEYWORDS = 100
+MAX_WINDOW_DAYS = 3 * 365
+
+_WINDOW_UNITS = {"d": 1, "w": 7, "m": 30, "y": 365}
+
+
+def parse_window(window: str) -> int:
+    """Parse a window such as '90d', '12w', '6m' or '1y' into a number of days"""
+    match = re.fullmatch(r"\s*(\d+)\s*([dwmy]?)\s*", (window or "").lower())
+    if not match:
+        raise ValueError(f"Invalid window '{window}' (expected e.g. 30d, 12w, 6m, 1y)")
+    days = int(match.group(1)) * _WINDOW_UNITS[match.group(2) or "d"]
+    if days < 1 or days > MAX_WINDOW_DAYS:
+        raise ValueError(f"Window must be between 1 and {MAX_WINDOW_DAYS} days")
+    return days
+
+
+def _trailing_sum(values: np.ndarray, width: int, include_current: bool) -> np.ndarray:
+    """Sum over the trailing `width` days along axis 1 using a cumulative sum"""
+    csum = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)], axis=1)
+    idx = np.arange(values.shape[1])
+    end = idx + 1 if include_current else idx
+    start = np.maximum(end - width, 0)
+    return csum[:, end] - csum[:, start]
+
+
+def compute_trends(counts: np.ndarray, rolling: int = 7, baseline: int = 28,
+                   z_threshold: float = 2.0, min_count: int = 3) -> Dict[str, np.ndarray]:
+    """
+    Compute rolling averages and burst flags for a (keywords x days) count matrix.
+    The z-score of each day is taken against the `baseline` days before it,
+    so a burst is measured against history that does not include itself.
+    """
+    counts = counts.astype(float)
+    n_days = counts.shape[1]
+    idx = np.arange(n_days)
+
+    roll_width = np.minimum(idx + 1, rolling)
+    rolling_avg = _trailing_sum(counts, rolling, include_current=True) / roll_width
+
+    base_n = np.minimum(idx, baseline).astype(float)
+    base_sum = _trailing_sum(counts, baseline, include_current=False)
+    base_sq = _trailing_sum(counts ** 2, baseline, include_current=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(base_n > 0, base_sum / base_n, 0.0)
+        var = np.where(base_n > 0, base_sq / base_n - mean ** 2, 0.0)
+        std = np.sqrt(np.clip(var, 0.0, None))
+        # A flat history (std=0) would make every spike infinite; use a floor of 1 count
+        zscore = (counts - mean) / np.maximum(std, 1.0)
+    zscore[:, base_n == 0] = 0.0
+
+    burst = (zscore >= z_threshold) & (counts >= min_count)
+    return {"rolling_avg": rolling_avg, "zscore": zscore, "burst": burst}
+
+
+def build_keyword_trends(keywords: List[str], window: str = "90d", rolling: int = 7,
+                         baseline: int = 28, z_threshold: float = 2.0,
+                         end: Optional[date] = None) -> Dict:
+    """Build per-day counts, rolling averages and burst flags for the requested keywords"""
+    keywords = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    if not keywords:
+        raise ValueError("At least one keyword is required")
+    if len(keywords) > MAX_TREND_KEYWORDS:
+        raise ValueError(f"At most {MAX_TREND_KEYWORDS} keywords per request")
+
+    window_days = parse_window(window)
+    end_day = end or date.today()
+    start_day = end_day - timedelta(days=window_days - 1)
+    # Load extra history before the window so the first days have a baseline
+    history_start = start_day - timedelta(days=baseline)
+    total_days = window_days + baseline
+
+    rows = db.get_keyword_daily_counts(
+        keywords, history_start.isoformat(), end_day.isoformat()
+    )
+
+    kw_index = {kw: i for i, kw in enumerate(keywords)}
+    counts = np.zeros((len(keywords), total_days), dtype=np.int64)
+    if rows:
+        ki = np.fromiter((kw_index[r['keyword']] for r in rows), dtype=np.int64, count=len(rows))
+        di = np.fromiter(
+            ((_as_date(r['day']) - history_start).days for r in rows), dtype=np.int64, count=len(rows)
+        )
+        values = np.fromiter((r['count'] for r in rows), dtype=np.int64, count=len(rows))
+        valid = (di >= 0) & (di < total_days)
+        np.add.at(counts, (ki[valid], di[valid]), values[valid])
+
+    trends = compute_trends(counts, rolling=rolling, baseline=baseline, z_threshold=z_threshold)
+
+    visible = slice(baseline, total_days)
+    dates = [(start_day + timedelta(days=i)).isoformat() for i in range(window_days)]
+    series = []
+    for kw, i in kw_index.items():
+        kw_counts = counts[i, visible]
+        kw_burst = trends["burst"][i, visible]
+        series.append({
+            "keyword": kw,
+            "total": int(kw_counts.sum()),
+            "counts": kw_counts.tolist(),
+            "rolling_avg": np.round(trends["rolling_avg"][i, visible], 3).tolist(),
+            "zscore": np.round(trends["zscore"][i, visible], 3).tolist(),
+            "burst": kw_burst.tolist(),
+            "burst_dates": [dates[j] for j in np.flatnonzero(kw_burst)],
+        })
+
+    return {
+        "window_days": window_days,
+        "start": start_day.isoformat(),
+        "end": end_day.isoformat(),
+        "rolling": rolling,
+        "baseline": baseline,
+        "z_threshold": z_threshold,
+        "dates": dates,
+        "keywords": series,
+    }
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
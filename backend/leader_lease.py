@@ -0,0 +1,91 @@
+"""
+DB-backed leader lease
+One row per lease name in the locks table records the owner and an expiry.
+The holder renews it on every heartbeat; when the holder dies the row
+expires and the next process to heartbeat takes over.
+"""
+
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+LEASE_TTL = float(os.getenv("LEASE_TTL", "60"))
+LEASE_HEARTBEAT = float(os.getenv("LEASE_HEARTBEAT", "20"))
+
+
+class LeaderLease:
+    def __init__(self, name: str, ttl: float = LEASE_TTL, heartbeat: float = LEASE_HEARTBEAT):
+        if heartbeat >= ttl:
+            raise ValueError("heartbeat must be shorter than the lease ttl")
+        self.name = name
+        self.ttl = ttl
+        self.heartbeat = heartbeat
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._valid_until = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        """Held and renewed recently enough that no other process can have taken it"""
+        return time.monotonic() < self._valid_until
+
+    def try_acquire(self) -> bool:
+        """Acquire or renew the lease; returns whether this process is the leader"""
+        started = time.monotonic()
+        was_leader = self.is_leader
+        try:
+            acquired = db.try_acquire_lock(self.name, self.owner, self.ttl)
+        except Exception as e:
+            logger.warning(f"Lease heartbeat failed for {self.name}: {e}")
+            acquired = False
+        # Count validity from before the round trip so a slow write cannot overstate it
+        self._valid_until = started + self.ttl if acquired else 0.0
+
+        if acquired and not was_leader:
+            logger.info(f"👑 Acquired lease '{self.name}' as {self.owner}")
+        elif was_leader and not acquired:
+            logger.warning(f"⚠️ Lost lease '{self.name}'")
+        return acquired
+
+    def release(self) -> None:
+        if not self.is_leader:
+            return
+        self._valid_until = 0.0
+        try:
+            db.release_lock(self.name, self.owner)
+            logger.info(f"Released lease '{self.name}'")
+        except Exception as e:
+            logger.warning(f"Lease release failed for {self.name}: {e}")
+
+    async def maintain(self, stop: asyncio.Event) -> None:
+        """Heartbeat until `stop` is set, then hand the lease back"""
+        while not stop.is_set():
+            await asyncio.to_thread(self.try_acquire)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.heartbeat)
+            except asyncio.TimeoutError:
+                pass
+        await asyncio.to_thread(self.release)
+
+    def status(self) -> Dict:
+        try:
+            row: Optional[Dict] = db.get_lock(self.name)
+        except Exception as e:
+            logger.warning(f"Lease lookup failed for {self.name}: {e}")
+            row = None
+        return {
+            'name': self.name,
+            'holder': row['owner'] if row else None,
+            'acquired_at': str(row['acquired_at']) if row else None,
+            'heartbeat_at': str(row['heartbeat_at']) if row else None,
+            'expires_at': str(row['expires_at']) if row else None,
+            'this_process': self.owner,
+            'is_leader': self.is_leader,
+        }
@@ -0,0 +1,411 @@
+"""
+Shared LLM summarization service
+One aiohttp session to an OpenAI-compatible chat completions endpoint
+(OPENAI_BASE_URL, so a local mock server works too) with keep-alive
+connections and at most SUMMARY_CONCURRENCY requests in flight. The service
+runs its own event loop thread; collector worker threads call
+`summarize_sync`, the async engine can await `summarize`. Other prompts
+(keyword extraction) go through `complete` / `complete_sync` and share the
+pool, cache and budget.
+
+- Summaries follow a named SummaryStyle: the default 'brief' prompt, or the
+  Streamlit app's 'editor' prompt (gpt-4o-mini, 4-6 sentences, hashtags).
+- Article text is cut to the style's input tokens (SUMMARY_MAX_INPUT_TOKENS
+  for 'brief'; tiktoken when installed, otherwise a Hangul-aware estimate)
+  at a sentence boundary.
+- Responses are cached by a hash of the full request in memory and in
+  llm_cache, so an identical prompt is never paid for twice.
+- Every collection run gets a token and cost budget (begin_run); once it is
+  spent, and on timeouts or API errors, callers get None and fall back to
+  the heuristic summarizer.
+"""
+
+import os
+import re
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+from database import db
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "gpt-3.5-turbo")
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "8"))
+SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "20"))
+SUMMARY_MAX_INPUT_TOKENS = int(os.getenv("SUMMARY_MAX_INPUT_TOKENS", "1200"))
+SUMMARY_MAX_OUTPUT_TOKENS = int(os.getenv("SUMMARY_MAX_OUTPUT_TOKENS", "200"))
+SUMMARY_CACHE_SIZE = int(os.getenv("SUMMARY_CACHE_SIZE", "2000"))
+# Per-run budgets; 0 disables the limit
+SUMMARY_RUN_MAX_TOKENS = int(os.getenv("SUMMARY_RUN_MAX_TOKENS", "0"))
+SUMMARY_RUN_MAX_COST = float(os.getenv("SUMMARY_RUN_MAX_COST", "0"))
+# USD per 1K tokens, used for the cost budget
+SUMMARY_INPUT_PRICE = float(os.getenv("SUMMARY_INPUT_PRICE", "0.0005"))
+SUMMARY_OUTPUT_PRICE = float(os.getenv("SUMMARY_OUTPUT_PRICE", "0.0015"))
+
+SYSTEM_PROMPT = "당신은 IT/기술 뉴스 전문 에디터입니다."
+PROMPT_TEMPLATE = """
+다음 기사를 3-4문장으로 한국어 요약하세요. 사실 위주로 간결하게.
+- 제목: {title}
+- 출처: {source}
+- 본문: {text}
+
+핵심 기술/제품/수치/일정을 포함하여 요약하세요.
+"""
+MIN_SUMMARY_CHARS = 20
+
+
+@dataclass(frozen=True)
+class SummaryStyle:
+    """Prompt and limits of one kind of summary; `model` None means SUMMARY_MODEL"""
+    system: str
+    template: str                   # {title} {source} {published} {text}
+    max_input_tokens: int
+    max_output_tokens: int
+    min_chars: int                  # shorter responses fall back to the heuristic
+    model: Optional[str] = None
+    sanitize: bool = False          # strip bracket tags and echoed labels (enrichment.sanitize_summary)
+
+
+# Selected per run with IngestConfig.summary_style
+SUMMARY_STYLES = {
+    'brief': SummaryStyle(SYSTEM_PROMPT, PROMPT_TEMPLATE, SUMMARY_MAX_INPUT_TOKENS,
+                          SUMMARY_MAX_OUTPUT_TOKENS, MIN_SUMMARY_CHARS + 1),
+    # The Streamlit app's editor summary: 4-6 sentences, implication line and hashtags
+    'editor': SummaryStyle(
+        system="너는 공학·IT 뉴스 한국어 에디터다. 사실만 간결히.",
+        template="""
+다음 기사를 사실 위주로 4~6문장 한국어 요약하세요. 과장/의견 없이 핵심만.
+- 제목: {title}
+- 매체: {source}
+- 게시일: {published}
+- 본문(발췌): {text}
+요구사항:
+1) 핵심 기술/제품/조치/수치/일정
+2) 산업적 함의 1줄
+3) 마지막에 #키워드 3~5개 (쉼표 구분, 기술 관련)
+""",
+        max_input_tokens=6000,
+        max_output_tokens=420,
+        min_chars=60,
+        model="gpt-4o-mini",
+        sanitize=True,
+    ),
+}
+
+_WIDE_CHAR_RE = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏一-鿿가-힣]")
+_SENTENCE_END_RE = re.compile(r"[.!?。]\s|다\.\s?")
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of a text: exact with tiktoken, else ~1 per Hangul/CJK char and ~4 chars per token otherwise"""
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        return len(_encoding().encode(text))
+    wide = len(_WIDE_CHAR_RE.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+_ENCODING = None
+
+
+def _encoding():
+    global _ENCODING
+    if _ENCODING is None:
+        try:
+            _ENCODING = tiktoken.encoding_for_model(SUMMARY_MODEL)
+        except KeyError:
+            _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return _ENCODING
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix within max_tokens, cut back to a sentence end when one is near"""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    cut = int(len(text) * max_tokens / tokens)
+    while cut > 0 and estimate_tokens(text[:cut]) > max_tokens:
+        cut = int(cut * 0.9)
+    head = text[:cut]
+    ends = [m.end() for m in _SENTENCE_END_RE.finditer(head)]
+    if ends and ends[-1] >= cut * 0.6:
+        head = head[:ends[-1]]
+    return head.rstrip()
+
+
+def summary_prompt(title: str, text: str, source: str, style: SummaryStyle = SUMMARY_STYLES['brief'],
+                   published: str = "") -> str:
+    return style.template.format(
+        title=title, source=source, published=published,
+        text=truncate_to_tokens(text or "", style.max_input_tokens),
+    )
+
+
+class LLMSummarizer:
+    def __init__(self, api_key: str = OPENAI_API_KEY, base_url: str = OPENAI_BASE_URL,
+                 model: str = SUMMARY_MODEL, concurrency: int = SUMMARY_CONCURRENCY,
+                 timeout: float = SUMMARY_TIMEOUT):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_run_tokens = SUMMARY_RUN_MAX_TOKENS
+        self.max_run_cost = SUMMARY_RUN_MAX_COST
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._run = self._new_run()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.api_key)
+
+    @staticmethod
+    def _new_run() -> Dict:
+        return {
+            'requests': 0, 'cache_hits': 0, 'timeouts': 0, 'errors': 0, 'budget_skipped': 0,
+            'prompt_tokens': 0, 'completion_tokens': 0, 'reserved_tokens': 0, 'cost': 0.0,
+        }
+
+    def begin_run(self) -> None:
+        """Start a new budget window (one collection run)"""
+        with self._lock:
+            self._run = self._new_run()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            run = dict(self._run)
+        run['cost'] = round(run['cost'], 6)
+        run.pop('reserved_tokens', None)
+        return dict(run, enabled=self.enabled, model=self.model)
+
+    # ---- budget ----
+
+    def _cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * SUMMARY_INPUT_PRICE + completion_tokens * SUMMARY_OUTPUT_PRICE) / 1000
+
+    def _reserve(self, tokens: int) -> bool:
+        """Hold the worst-case tokens of one request against the run budget"""
+        with self._lock:
+            run = self._run
+            spent = run['prompt_tokens'] + run['completion_tokens'] + run['reserved_tokens']
+            if self.max_run_tokens and spent + tokens > self.max_run_tokens:
+                run['budget_skipped'] += 1
+                return False
+            committed_cost = run['cost'] + self._cost(run['reserved_tokens'], 0)
+            if self.max_run_cost and committed_cost + self._cost(tokens, 0) > self.max_run_cost:
+                run['budget_skipped'] += 1
+                return False
+            run['reserved_tokens'] += tokens
+            return True
+
+    def _settle(self, reserved: int, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        with self._lock:
+            run = self._run
+            run['reserved_tokens'] = max(0, run['reserved_tokens'] - reserved)
+            run['prompt_tokens'] += prompt_tokens
+            run['completion_tokens'] += completion_tokens
+            run['cost'] += self._cost(prompt_tokens, completion_tokens)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._run[key] += 1
+
+    # ---- cache ----
+
+    def build_payload(self, system: str, prompt: str, max_tokens: int,
+                      model: Optional[str] = None) -> Tuple[Dict, str]:
+        """Chat completion payload and the hash its response is cached under"""
+        payload = {
+            'model': model or self.model,
+            'messages': [
+                {'role': 'system', 'content': system},
+                {'role': 'user', 'content': prompt},
+            ],
+            'max_tokens': max_tokens,
+            'temperature': 0.3,
+        }
+        key = hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        return payload, key
+
+    def build_request(self, title: str, text: str, source: str, style: str = 'brief',
+                      published: str = "") -> Tuple[Dict, str]:
+        """Summary request for an article"""
+        summary_style = SUMMARY_STYLES[style]
+        return self.build_payload(summary_style.system, summary_prompt(title, text, source, summary_style, published),
+                                  summary_style.max_output_tokens, summary_style.model)
+
+    def _cached(self, key: str, persist: bool = True) -> Optional[str]:
+        with self._lock:
+            summary = self._cache.get(key)
+            if summary is not None:
+                self._cache.move_to_end(key)
+        if summary is None and persist:
+            try:
+                row = db.get_llm_response(key)
+            except Exception as e:
+                logger.warning(f"LLM cache lookup failed: {e}")
+                row = None
+            summary = row['response'] if row else None
+            if summary is not None:
+                self._remember(key, summary)
+        return summary
+
+    def _remember(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._cache[key] = summary
+            self._cache.move_to_end(key)
+            while len(self._cache) > SUMMARY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    # ---- requests ----
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="llm-summarizer", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Only ever called on the service loop, so no lock is needed
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Authorization': f"Bearer {self.api_key}", 'Content-Type': 'application/json'},
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def _complete(self, payload: Dict) -> Tuple[str, int, int]:
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.post(f"{self.base_url}/chat/completions", json=payload,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
+                if resp.status != 200:
+                    body = (await resp.text())[:200]
+                    raise aiohttp.ClientResponseError(
+                        resp.request_info, resp.history, status=resp.status, message=body
+                    )
+                data = await resp.json(content_type=None)
+        content = (data['choices'][0]['message'].get('content') or "").strip()
+        usage = data.get('usage') or {}
+        prompt_tokens = usage.get('prompt_tokens') or sum(estimate_tokens(m['content']) for m in payload['messages'])
+        completion_tokens = usage.get('completion_tokens') or estimate_tokens(content)
+        return content, prompt_tokens, completion_tokens
+
+    async def _request(self, payload: Dict, key: str, min_chars: int, persist: bool = True) -> Optional[str]:
+        cached = await asyncio.to_thread(self._cached, key, persist)
+        if cached is not None:
+            self._count('cache_hits')
+            return cached
+
+        reserved = sum(estimate_tokens(m['content']) for m in payload['messages']) + payload['max_tokens']
+        if not self._reserve(reserved):
+            return None
+        self._count('requests')
+        try:
+            content, prompt_tokens, completion_tokens = await self._complete(payload)
+        except asyncio.TimeoutError:
+            self._settle(reserved)
+            self._count('timeouts')
+            logger.warning(f"LLM request timed out after {self.timeout}s")
+            return None
+        except (aiohttp.ClientError, KeyError, IndexError, ValueError) as e:
+            self._settle(reserved)
+            self._count('errors')
+            logger.warning(f"LLM request failed: {e}")
+            return None
+
+        self._settle(reserved, prompt_tokens, completion_tokens)
+        if len(content) < min_chars:
+            return None
+        self._remember(key, content)
+        if not persist:
+            return content
+        try:
+            await asyncio.to_thread(db.save_llm_response, key, payload['model'], content, prompt_tokens, completion_tokens)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+        return content
+
+    async def complete(self, system: str, prompt: str, max_tokens: int, min_chars: int = 1,
+                       model: Optional[str] = None, persist: bool = True) -> Optional[str]:
+        """
+        Cached, budgeted chat completion from any event loop; None when
+        disabled, over budget, failed or shorter than min_chars. With
+        persist=False only the in-memory cache is used, not llm_cache.
+        """
+        if not self.enabled:
+            return None
+        payload, key = self.build_payload(system, prompt, max_tokens, model)
+        request = self._request(payload, key, min_chars, persist)
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await request
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(request, loop))
+
+    def complete_sync(self, system: str, prompt: str, max_tokens: int, min_chars: int = 1,
+                      model: Optional[str] = None, persist: bool = True) -> Optional[str]:
+        """Blocking variant for worker threads; requests from all threads share the pool"""
+        if not self.enabled:
+            return None
+        payload, key = self.build_payload(system, prompt, max_tokens, model)
+        future = asyncio.run_coroutine_threadsafe(self._request(payload, key, min_chars, persist), self._ensure_loop())
+        try:
+            return future.result()
+        except Exception as e:
+            logger.warning(f"LLM request failed: {e}")
+            return None
+
+    async def summarize(self, title: str, text: str, source: str, style: str = 'brief',
+                        published: str = "", persist: bool = True) -> Optional[str]:
+        """Summary of an article, or None when the caller should fall back to the heuristic"""
+        summary_style = SUMMARY_STYLES[style]
+        return await self.complete(summary_style.system, summary_prompt(title, text, source, summary_style, published),
+                                   summary_style.max_output_tokens, summary_style.min_chars, summary_style.model,
+                                   persist)
+
+    def summarize_sync(self, title: str, text: str, source: str, style: str = 'brief',
+                       published: str = "", persist: bool = True) -> Optional[str]:
+        summary_style = SUMMARY_STYLES[style]
+        return self.complete_sync(summary_style.system, summary_prompt(title, text, source, summary_style, published),
+                                  summary_style.max_output_tokens, summary_style.min_chars, summary_style.model,
+                                  persist)
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(timeout=5)
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+
+
+# Global summarizer instance
+llm_summarizer = LLMSummarizer()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
@@ -26,13 +26,17 @@ except ImportError:
 # Import enhanced modules
 try:
     from database import db, init_db, get_db_connection
-    from enhanced_news_collector import collector, collect_news_async
+    from enhanced_news_collector import collector, collect_news_async, CollectionInProgress
+    from collection_deadline import COLLECT_NOW_DEADLINE, Deadline
     ENHANCED_MODULES_AVAILABLE = True
     logger.info("✅ Enhanced modules loaded successfully")
 except ImportError as e:
     logger.error(f"❌ Failed to load enhanced modules: {e}")
     ENHANCED_MODULES_AVAILABLE = False
 
+    class CollectionInProgress(RuntimeError):
+        """Never raised without the enhanced collector; keeps the endpoints' handlers valid"""
+
 # Fallback imports
 if not ENHANCED_MODULES_AVAILABLE:
     logger.info("🔄 Using fallback modules")
@@ -43,6 +47,71 @@ if not ENHANCED_MODULES_AVAILABLE:
         SIMPLE_COLLECTOR_AVAILABLE = False
         logger.error("❌ No news collector available")
 
+# Keyword trend analysis (requires numpy)
+try:
+    from keyword_trends import build_keyword_trends
+    KEYWORD_TRENDS_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Keyword trends not available: {e}")
+    KEYWORD_TRENDS_AVAILABLE = False
+
+# Related-article LSH index (requires numpy)
+try:
+    from related_articles import related_index
+    RELATED_ARTICLES_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Related articles not available: {e}")
+    RELATED_ARTICLES_AVAILABLE = False
+
+# Adaptive per-feed polling scheduler
+try:
+    from poll_scheduler import poll_scheduler, ENABLE_POLL_SCHEDULER
+    POLL_SCHEDULER_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Poll scheduler not available: {e}")
+    POLL_SCHEDULER_AVAILABLE = False
+    ENABLE_POLL_SCHEDULER = False
+
+# Warm Kiwi worker pool for Korean keyword extraction
+try:
+    from nlp_service import nlp_service
+    NLP_SERVICE_AVAILABLE = ENHANCED_MODULES_AVAILABLE and nlp_service.enabled
+except ImportError as e:
+    logger.warning(f"NLP service not available: {e}")
+    NLP_SERVICE_AVAILABLE = False
+
+# Shared OpenAI summarization client (connection pool, cache, per-run budget)
+try:
+    from llm_summarizer import llm_summarizer
+    LLM_SUMMARIZER_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"LLM summarizer not available: {e}")
+    LLM_SUMMARIZER_AVAILABLE = False
+
+# Offline reprocessing of stored articles (process pool)
+try:
+    from reprocess import reprocessor, ReprocessOptions, ALL_FIELDS
+    REPROCESS_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Reprocessing not available: {e}")
+    REPROCESS_AVAILABLE = False
+
+# Per-feed health and circuit breaker
+try:
+    from feed_health import feed_health
+    FEED_HEALTH_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Feed health tracking not available: {e}")
+    FEED_HEALTH_AVAILABLE = False
+
+# Keyword extraction through the shared LLM client
+try:
+    from keyword_maker import extract_keywords_batch
+    KEYWORD_BATCH_AVAILABLE = ENHANCED_MODULES_AVAILABLE
+except ImportError as e:
+    logger.warning(f"Keyword extraction not available: {e}")
+    KEYWORD_BATCH_AVAILABLE = False
+
 app = FastAPI(
     title="News IT's Issue API",
     description="Enhanced IT/Tech News Collection and Analysis Platform",
@@ -74,6 +143,8 @@ async def ensure_db_initialized():
         try:
             if ENHANCED_MODULES_AVAILABLE:
                 db.init_database()
+                if RELATED_ARTICLES_AVAILABLE:
+                    related_index.backfill()
             else:
                 # Fallback initialization
                 import sqlite3
@@ -110,6 +181,23 @@ async def startup_event():
     logger.info(f"Enhanced modules: {'Available' if ENHANCED_MODULES_AVAILABLE else 'Not Available'}")
     logger.info(f"OpenAI API: {'Configured' if OPENAI_API_KEY else 'Not Configured'}")
     logger.info(f"PostgreSQL: {'Available' if DATABASE_URL else 'Not Available'}")
+    
+    if POLL_SCHEDULER_AVAILABLE and ENABLE_POLL_SCHEDULER:
+        poll_scheduler.start()
+    
+    if NLP_SERVICE_AVAILABLE:
+        # Load the Kiwi models in the background so the first collection does not wait for them
+        asyncio.create_task(asyncio.to_thread(nlp_service.start))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Application shutdown event"""
+    if POLL_SCHEDULER_AVAILABLE and ENABLE_POLL_SCHEDULER:
+        await poll_scheduler.stop()
+    if NLP_SERVICE_AVAILABLE:
+        nlp_service.shutdown()
+    if LLM_SUMMARIZER_AVAILABLE:
+        await asyncio.to_thread(llm_summarizer.close)
 
 class Article(BaseModel):
     id: int
@@ -155,6 +243,13 @@ class NewsCollectionRequest(BaseModel):
     days: int = 30
     max_pages: int = 5
 
+class KeywordBatchRequest(BaseModel):
+    article_ids: Optional[List[int]] = None
+    since: Optional[str] = None
+    until: Optional[str] = None
+    sources: Optional[List[str]] = None
+    limit: int = 100
+
 # get_db_connection is now imported from database module
 
 @app.get("/api/articles")
@@ -214,6 +309,28 @@ async def get_articles(
         logger.error(f"Error fetching articles: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/articles/{article_id}/related")
+async def get_related_articles(
+    article_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    min_similarity: float = Query(0.1, ge=0.0, le=1.0)
+):
+    """Get similar stories from any source via the MinHash LSH index"""
+    await ensure_db_initialized()
+
+    if not RELATED_ARTICLES_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Related articles are not available")
+
+    try:
+        related = related_index.find_related(article_id, limit=limit, min_similarity=min_similarity)
+    except Exception as e:
+        logger.error(f"Error finding related articles: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if related is None:
+        raise HTTPException(status_code=404, detail="기사를 찾을 수 없습니다.")
+    return related
+
 @app.get("/api/sources")
 async def get_sources():
     conn = get_db_connection()
@@ -264,6 +381,34 @@ async def get_keyword_stats(limit: int = Query(50, le=200)):
         logger.error(f"Error getting keyword stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/keywords/trends")
+async def get_keyword_trends(
+    keywords: str = Query(..., description="Comma-separated keywords"),
+    window: str = Query("90d", description="Time window, e.g. 30d, 12w, 1y"),
+    rolling: int = Query(7, ge=1, le=90, description="Rolling average width in days"),
+    baseline: int = Query(28, ge=2, le=365, description="Baseline days for the burst z-score"),
+    z_threshold: float = Query(2.0, gt=0, description="Z-score at which a day counts as a burst")
+):
+    """Get per-day keyword counts with rolling averages and burst flags"""
+    await ensure_db_initialized()
+
+    if not KEYWORD_TRENDS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Keyword trends are not available")
+
+    try:
+        return build_keyword_trends(
+            keywords.split(','),
+            window=window,
+            rolling=rolling,
+            baseline=baseline,
+            z_threshold=z_threshold
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting keyword trends: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/keywords/network")
 async def get_keyword_network(limit: int = Query(30, le=100)):
     conn = get_db_connection()
@@ -392,7 +537,18 @@ def collect_from_rss(feed_url: str, source: str, max_items: int = 10):
         
         print(f"📡 Collecting from {source}...")
         
-        feed = feedparser.parse(feed_url)
+        try:
+            from feed_fetcher import feed_fetcher
+            result = feed_fetcher.fetch(feed_url)
+            if not result.ok or not result.changed:
+                return []
+            content = result.content
+        except ImportError:
+            response = requests.get(feed_url, timeout=(10, 15))
+            response.raise_for_status()
+            content = response.content
+        
+        feed = feedparser.parse(content)
         if not hasattr(feed, 'entries') or not feed.entries:
             return []
         
@@ -531,6 +687,8 @@ def save_articles_to_db(articles):
 @app.post("/api/collect-news")
 async def collect_news(background_tasks: BackgroundTasks):
     """Start news collection in background"""
+    if ENHANCED_MODULES_AVAILABLE and collector.running:
+        raise HTTPException(status_code=409, detail="뉴스 수집이 이미 진행 중입니다.")
     try:
         await ensure_db_initialized()
         background_tasks.add_task(run_background_collection)
@@ -556,12 +714,25 @@ async def run_background_collection():
             logger.info("Using fallback collector")
             # Implement basic collection here if needed
             
+    except CollectionInProgress:
+        logger.info("⏭️ Background collection skipped: another run is in progress")
     except Exception as e:
         logger.error(f"❌ Background collection error: {e}")
 
+async def cancel_on_disconnect(request: Request, deadline: "Deadline") -> None:
+    """Stop a collection run cooperatively once its HTTP client has gone away"""
+    while not deadline.expired:
+        if await request.is_disconnected():
+            logger.info("🔌 Client disconnected; stopping collection")
+            deadline.cancel("client disconnected")
+            return
+        await asyncio.sleep(0.5)
+
 @app.post("/api/collect-news-now")
 async def collect_news_now(
-    max_feeds: Optional[int] = Query(None, description="Maximum number of feeds to process")
+    request: Request,
+    max_feeds: Optional[int] = Query(None, description="Maximum number of feeds to process"),
+    deadline: Optional[float] = Query(None, gt=0, description="Seconds until the run returns partial results")
 ):
     """Immediate news collection with full response"""
     try:
@@ -569,7 +740,12 @@ async def collect_news_now(
         
         if ENHANCED_MODULES_AVAILABLE:
             logger.info("🚀 Starting enhanced news collection")
-            result = await collect_news_async(max_feeds)
+            run_deadline = Deadline(deadline or COLLECT_NOW_DEADLINE)
+            watcher = asyncio.create_task(cancel_on_disconnect(request, run_deadline))
+            try:
+                result = await collect_news_async(max_feeds, deadline=run_deadline)
+            finally:
+                watcher.cancel()
             
             # Get updated statistics
             try:
@@ -587,18 +763,25 @@ async def collect_news_now(
                 by_source = {row['source']: row['count'] for row in sources_result}
                 
                 return {
-                    "message": f"뉴스 수집 완료: {result['stats']['total_inserted']}개 신규, {result['stats']['total_updated']}개 업데이트",
+                    "message": f"뉴스 수집 {'중단(부분 결과)' if result.get('partial') else '완료'}: {result['stats']['total_inserted']}개 신규, {result['stats']['total_updated']}개 업데이트",
                     "status": "success",
                     "duration": result['duration'],
                     "processed": result['stats']['total_processed'],
                     "inserted": result['stats']['total_inserted'],
                     "updated": result['stats']['total_updated'],
                     "skipped": result['stats']['total_skipped'],
+                    "duplicates": result['stats'].get('total_duplicates', 0),
                     "total_articles": total_articles,
                     "by_source": by_source,
                     "successful_feeds": result['successful_feeds'],
                     "failed_feeds": result['failed_feeds'],
+                    "skipped_feeds": result.get('skipped_feeds', 0),
                     "total_feeds": result['total_feeds'],
+                    "partial": result.get('partial', False),
+                    "stop_reason": result.get('stop_reason'),
+                    "unfinished_feeds": result['stats'].get('unfinished_feeds', []),
+                    "deadline_skipped": result['stats'].get('deadline_skipped', 0),
+                    "stages": result.get('stages'),
                     "timestamp": datetime.now().isoformat()
                 }
             except Exception as stats_e:
@@ -622,6 +805,8 @@ async def collect_news_now(
             else:
                 raise HTTPException(status_code=500, detail="No news collector available")
             
+    except CollectionInProgress:
+        raise HTTPException(status_code=409, detail="뉴스 수집이 이미 진행 중입니다.")
     except Exception as e:
         logger.error(f"❌ News collection error: {e}")
         raise HTTPException(status_code=500, detail=f"뉴스 수집 오류: {str(e)}")
@@ -661,6 +846,12 @@ async def get_collection_status():
                 "top_sources": top_sources,
                 "database_type": db.db_type,
                 "enhanced_features": True,
+                "scheduler": {
+                    "enabled": ENABLE_POLL_SCHEDULER,
+                    "lease": await asyncio.to_thread(poll_scheduler.lease.status)
+                } if POLL_SCHEDULER_AVAILABLE else None,
+                "nlp": nlp_service.stats() if NLP_SERVICE_AVAILABLE else None,
+                "summaries": llm_summarizer.stats() if LLM_SUMMARIZER_AVAILABLE else None,
                 "timestamp": datetime.now().isoformat()
             }
         else:
@@ -674,6 +865,112 @@ async def get_collection_status():
         logger.error(f"Error getting collection status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/poll-schedule")
+async def get_poll_schedule():
+    """Per-feed learned publish rate and next scheduled poll"""
+    if not POLL_SCHEDULER_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Poll scheduler not available")
+    await ensure_db_initialized()
+    await asyncio.to_thread(poll_scheduler.ensure_loaded)
+    return {
+        "enabled": ENABLE_POLL_SCHEDULER,
+        "feeds": poll_scheduler.snapshot(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/feed-health")
+async def get_feed_health(
+    state: Optional[str] = Query(None, description="Only feeds in this circuit state (closed/open/half_open)")
+):
+    """Per-feed fetch latency percentiles, failure streak and circuit-breaker state"""
+    if not FEED_HEALTH_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Feed health tracking not available")
+    await ensure_db_initialized()
+    feeds = await asyncio.to_thread(feed_health.snapshot)
+    if state:
+        feeds = [f for f in feeds if f['state'] == state]
+    feeds.sort(key=lambda f: (f['state'] == 'closed', -f['consecutive_failures'], f['source'] or ''))
+    return {
+        "enabled": feed_health.enabled,
+        "feeds": feeds,
+        "open": sum(1 for f in feeds if f['state'] != 'closed'),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.post("/api/feed-health/reset")
+async def reset_feed_health(feed_url: str = Query(..., description="Feed whose circuit to close")):
+    """Close a feed's circuit so the next run polls it again"""
+    if not FEED_HEALTH_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Feed health tracking not available")
+    await ensure_db_initialized()
+    health = await asyncio.to_thread(feed_health.reset, feed_url)
+    if health is None:
+        raise HTTPException(status_code=404, detail="Feed not tracked")
+    return health
+
+async def run_reprocess_job(job: str, options, restart: bool):
+    """Background reprocess task; progress and errors are recorded in reprocess_jobs"""
+    try:
+        await asyncio.to_thread(reprocessor.run, job, options, restart)
+    except Exception as e:
+        logger.error(f"❌ Reprocess job '{job}' could not start: {e}")
+
+@app.post("/api/admin/reprocess")
+async def start_reprocess(
+    background_tasks: BackgroundTasks,
+    job: str = Query("default", description="Job name; progress is checkpointed under it"),
+    since: Optional[str] = Query(None, description="Published on or after (YYYY-MM-DD)"),
+    until: Optional[str] = Query(None, description="Published before (YYYY-MM-DD)"),
+    source: Optional[List[str]] = Query(None, description="Limit to these sources"),
+    fields: str = Query("keywords,summary,category", description="Fields to recompute"),
+    from_html: bool = Query(False, description="Re-extract article text from the HTML store"),
+    drop_non_tech: bool = Query(False, description="Delete articles failing the tech filter"),
+    restart: bool = Query(False, description="Ignore the checkpoint and start over")
+):
+    """Re-run enrichment over stored articles in the background (resumes an unfinished job)"""
+    if not REPROCESS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Reprocessing not available")
+    field_list = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(field_list) - set(ALL_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    await ensure_db_initialized()
+    current = await asyncio.to_thread(reprocessor.status, job)
+    if current and current['running_here']:
+        raise HTTPException(status_code=409, detail=f"Job '{job}' is already running")
+
+    options = ReprocessOptions(
+        since=since, until=until, sources=source or [], fields=field_list,
+        from_html=from_html, drop_non_tech=drop_non_tech,
+    )
+    background_tasks.add_task(run_reprocess_job, job, options, restart)
+    return {
+        "job": job,
+        "status": "started",
+        "resumed_from": current['last_id'] if current and current['status'] != 'done' and not restart else 0,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/admin/reprocess/{job}")
+async def get_reprocess_status(job: str):
+    """Checkpointed progress of a reprocess job"""
+    if not REPROCESS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Reprocessing not available")
+    await ensure_db_initialized()
+    status = await asyncio.to_thread(reprocessor.status, job)
+    if not status:
+        raise HTTPException(status_code=404, detail=f"Job '{job}' not found")
+    return status
+
+@app.post("/api/admin/reprocess/{job}/stop")
+async def stop_reprocess(job: str):
+    """Stop a running job after its current chunk; it can be resumed later"""
+    if not REPROCESS_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Reprocessing not available")
+    if not reprocessor.request_stop(job):
+        raise HTTPException(status_code=404, detail=f"Job '{job}' is not running in this process")
+    return {"job": job, "status": "stopping"}
+
 # 정적 파일 서빙 설정 (React 빌드 파일)
 frontend_dist = Path(__file__).parent.parent / "frontend" / "news-app" / "dist"
 if frontend_dist.exists():
@@ -763,31 +1060,37 @@ async def create_collection(request: CollectionRequest):
         raise HTTPException(status_code=500, detail=f"컬렉션 생성 실패: {str(e)}")
 
 # 키워드 추출 API  
+@app.post("/api/extract-keywords/batch")
+async def extract_keywords_for_articles(request: KeywordBatchRequest):
+    """여러 기사의 키워드를 동시에 추출합니다 (ID 목록 또는 발행일/출처 필터)."""
+    if not KEYWORD_BATCH_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Keyword extraction not available")
+    if not request.article_ids and not (1 <= request.limit <= 1000):
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    if request.article_ids and len(request.article_ids) > 1000:
+        raise HTTPException(status_code=400, detail="At most 1000 article ids per request")
+    await ensure_db_initialized()
+    try:
+        result = await extract_keywords_batch(
+            request.article_ids, request.since, request.until, request.sources, request.limit
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"키워드 추출 실패: {str(e)}")
+    return dict(result, message="키워드 추출 완료", timestamp=datetime.now().isoformat())
+
 @app.post("/api/extract-keywords/{article_id}")
 async def extract_article_keywords(article_id: int):
     """특정 기사의 키워드를 추출합니다."""
+    if not KEYWORD_BATCH_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Keyword extraction not available")
+    await ensure_db_initialized()
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT title, summary FROM articles WHERE id = ?", (article_id,))
-        article = cursor.fetchone()
-        
-        if not article:
-            raise HTTPException(status_code=404, detail="기사를 찾을 수 없습니다.")
-        
-        text = f"{article['title']} {article['summary'] or ''}"
-        keywords = extract_keywords(text)
-        
-        # 키워드 업데이트
-        cursor.execute("UPDATE articles SET keywords = ? WHERE id = ?", 
-                      (",".join(keywords), article_id))
-        conn.commit()
-        conn.close()
-        
-        return {"keywords": keywords, "message": "키워드 추출 완료"}
-        
+        result = await extract_keywords_batch([article_id])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"키워드 추출 실패: {str(e)}")
+    if result['missing']:
+        raise HTTPException(status_code=404, detail="기사를 찾을 수 없습니다.")
+    return {"keywords": result['articles'][0]['keywords'], "message": "키워드 추출 완료"}
 
 # 번역 API
 @app.post("/api/translate/{article_id}")  
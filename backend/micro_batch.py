@@ -0,0 +1,86 @@
+"""
+Micro-batch article persistence
+Collectors hand articles to an ArticleBatchWriter as each feed completes
+instead of holding the whole run in memory. It saves every
+PERSIST_BATCH_SIZE articles or every PERSIST_BATCH_INTERVAL seconds,
+whichever comes first, so new articles are visible in the API while a sweep
+is still running and peak memory is bounded by one batch. Deduplication is
+left to the save function, which checks each batch's links against the
+database. A batch that raises or reports failed articles does not advance
+its feeds: on_failure gets them instead of on_flush, so their pages are
+read again next run.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "50"))
+PERSIST_BATCH_INTERVAL = float(os.getenv("PERSIST_BATCH_INTERVAL", "5.0"))
+
+
+class ArticleBatchWriter:
+    def __init__(self, save: Callable[[List[Dict]], Dict[str, int]],
+                 batch_size: int = PERSIST_BATCH_SIZE, interval: float = PERSIST_BATCH_INTERVAL,
+                 on_flush: Optional[Callable[[List[str]], None]] = None,
+                 on_failure: Optional[Callable[[List[str]], None]] = None):
+        self.save = save
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        # Called with the feeds whose articles are now all stored (e.g. to save their watermarks)
+        self.on_flush = on_flush
+        self.on_failure = on_failure
+        self.totals = {'inserted': 0, 'updated': 0, 'skipped': 0, 'failed': 0, 'batches': 0}
+        self._articles: List[Dict] = []
+        self._feeds: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def processed(self) -> int:
+        return self.totals['inserted'] + self.totals['updated'] + self.totals['skipped']
+
+    def add(self, articles: List[Dict], feed_url: Optional[str] = None) -> None:
+        """Queue a completed feed's articles; saves once a batch is full or due"""
+        with self._lock:
+            self._articles.extend(articles)
+            if feed_url:
+                self._feeds.append(feed_url)
+        self.maybe_flush()
+
+    def due(self) -> bool:
+        with self._lock:
+            if len(self._articles) >= self.batch_size:
+                return True
+            return bool(self._articles or self._feeds) and time.monotonic() - self._last_flush >= self.interval
+
+    def maybe_flush(self) -> None:
+        if self.due():
+            self.flush()
+
+    def flush(self) -> Dict[str, int]:
+        """Save everything queued so far"""
+        with self._lock:
+            articles, feeds = self._articles, self._feeds
+            self._articles, self._feeds = [], []
+            self._last_flush = time.monotonic()
+            stats: Dict[str, int] = {}
+            if articles:
+                try:
+                    stats = self.save(articles)
+                except Exception as e:
+                    logger.error(f"❌ Failed to save batch of {len(articles)} articles: {e}")
+                    stats = {'failed': len(articles)}
+                for key in ('inserted', 'updated', 'skipped', 'failed'):
+                    self.totals[key] += stats.get(key, 0)
+                self.totals['batches'] += 1
+                logger.info(f"💾 Saved batch of {len(articles)} articles "
+                            f"({stats.get('inserted', 0)} new, {stats.get('updated', 0)} updated)")
+            callback = self.on_failure if stats.get('failed') else self.on_flush
+            if feeds and callback:
+                callback(feeds)
+            return stats
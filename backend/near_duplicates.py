@@ -0,0 +1,188 @@
+"""
+Cross-source near-duplicate detection with SimHash
+Fingerprints RSS titles and summaries before the article page is fetched,
+so copies of an already-seen story skip the HTTP fetch, NLP pass and row.
+"""
+
+import os
+import re
+import html
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_MAX_DISTANCE = int(os.getenv("SIMHASH_MAX_DISTANCE", "3"))
+SIMHASH_WINDOW_HOURS = int(os.getenv("SIMHASH_WINDOW_HOURS", "72"))
+SIMHASH_MIN_FEATURES = int(os.getenv("SIMHASH_MIN_FEATURES", "8"))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+")
+_MASK64 = (1 << 64) - 1
+
+
+def _features(title: str, summary: str) -> Dict[str, int]:
+    """Weighted character 3-grams; title grams count double"""
+    weights: Dict[str, int] = {}
+    for text, weight in ((title, 2), (summary, 1)):
+        plain = html.unescape(_TAG_RE.sub(" ", text or "")).lower()
+        for token in _TOKEN_RE.findall(plain):
+            grams = [token] if len(token) <= 3 else [token[i:i + 3] for i in range(len(token) - 2)]
+            for gram in grams:
+                weights[gram] = weights.get(gram, 0) + weight
+    return weights
+
+
+def simhash64(title: str, summary: str = "") -> Optional[int]:
+    """64-bit SimHash of a title/summary pair (None when there is too little text)"""
+    features = _features(title, summary)
+    if len(features) < SIMHASH_MIN_FEATURES:
+        return None
+    vector = [0] * 64
+    for gram, weight in features.items():
+        h = int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(64):
+            if h >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+    return sum(1 << bit for bit in range(64) if vector[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+class SimHashIndex:
+    """
+    Hamming-distance index over a recent time window.
+    Fingerprints are split into max_distance+1 blocks: two hashes within the
+    distance must agree exactly on at least one block, so only entries sharing
+    a block value are compared.
+    """
+
+    def __init__(self, max_distance: int = SIMHASH_MAX_DISTANCE, window_hours: int = SIMHASH_WINDOW_HOURS):
+        self.max_distance = max_distance
+        self.window = timedelta(hours=window_hours)
+        blocks = max_distance + 1
+        width = 64 // blocks
+        self._blocks: List[Tuple[int, int]] = [
+            (i * width, width if i < blocks - 1 else 64 - i * width) for i in range(blocks)
+        ]
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._entries: Dict[str, Tuple[int, datetime]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        return [(i, (fingerprint >> shift) & ((1 << width) - 1))
+                for i, (shift, width) in enumerate(self._blocks)]
+
+    def _add(self, link: str, fingerprint: int, seen_at: datetime) -> None:
+        self._remove(link)
+        self._entries[link] = (fingerprint, seen_at)
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, set()).add(link)
+
+    def _remove(self, link: str) -> None:
+        entry = self._entries.pop(link, None)
+        if not entry:
+            return
+        for key in self._keys(entry[0]):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(link)
+                if not bucket:
+                    del self._buckets[key]
+
+    def _prune(self, now: datetime) -> None:
+        cutoff = now - self.window
+        for link in [l for l, (_, seen_at) in self._entries.items() if seen_at < cutoff]:
+            self._remove(link)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        cutoff = datetime.now() - self.window
+        try:
+            rows = db.execute_query(
+                f"SELECT link, simhash, created_at FROM article_simhash WHERE created_at >= {db.placeholder}",
+                (cutoff.strftime("%Y-%m-%d %H:%M:%S"),)
+            )
+        except Exception as e:
+            logger.warning(f"SimHash index load failed: {e}")
+            return
+        for row in rows:
+            seen_at = row['created_at']
+            if not isinstance(seen_at, datetime):
+                seen_at = datetime.fromisoformat(str(seen_at))
+            self._add(row['link'], int(row['simhash']) & _MASK64, seen_at)
+        logger.info(f"🧬 SimHash index loaded with {len(rows)} recent fingerprints")
+
+    def check_and_reserve(self, link: str, fingerprint: int) -> Optional[Tuple[str, int]]:
+        """
+        Return (canonical_link, distance) if a near-duplicate is already indexed;
+        otherwise reserve the fingerprint for `link` so concurrent copies match it.
+        """
+        now = datetime.now()
+        with self._lock:
+            self._ensure_loaded()
+            self._prune(now)
+            best: Optional[Tuple[str, int]] = None
+            for key in self._keys(fingerprint):
+                for other in self._buckets.get(key, ()):
+                    if other == link:
+                        continue
+                    distance = hamming(fingerprint, self._entries[other][0])
+                    if distance <= self.max_distance and (best is None or distance < best[1]):
+                        best = (other, distance)
+            if best is None:
+                self._add(link, fingerprint, now)
+            return best
+
+    def release(self, link: str) -> None:
+        """Drop a reservation for an entry that was not stored"""
+        with self._lock:
+            self._remove(link)
+
+    def persist(self, link: str) -> None:
+        """Store the fingerprint of a saved article so restarts keep the window"""
+        self.persist_many([link])
+
+    def persist_many(self, links: Iterable[str]) -> None:
+        """Store the fingerprints of a saved batch in one executemany"""
+        with self._lock:
+            entries = [(link, self._entries.get(link)) for link in links]
+        p = db.placeholder
+        db.execute_many(f"""
+            INSERT INTO article_simhash (link, simhash, created_at) VALUES ({p}, {p}, {p})
+            ON CONFLICT (link) DO UPDATE SET simhash = EXCLUDED.simhash
+        """, [
+            (link, _to_signed(entry[0]), entry[1].strftime("%Y-%m-%d %H:%M:%S"))
+            for link, entry in entries if entry
+        ])
+
+    def record_duplicate(self, link: str, canonical_link: str, source: str, title: str, distance: int) -> None:
+        """Link a skipped copy to its canonical story"""
+        p = db.placeholder
+        db.execute_update(f"""
+            INSERT INTO article_duplicates (link, canonical_link, source, title, distance)
+            VALUES ({p}, {p}, {p}, {p}, {p})
+            ON CONFLICT (link) DO UPDATE SET
+                canonical_link = EXCLUDED.canonical_link,
+                distance = EXCLUDED.distance
+        """, (link, canonical_link, source, title, distance))
+
+
+# Global index instance
+simhash_index = SimHashIndex()
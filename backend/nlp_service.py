@@ -0,0 +1,258 @@
+"""
+Korean morphological analysis service
+Loading a Kiwi model takes seconds, and tokenizing one short text per call
+spends most of its time in per-call overhead. The service keeps a small
+process pool whose workers load Kiwi once (and are warmed up front), and
+runs Kiwi's multi-threaded batch tokenizer on batches of texts. Callers on
+collector threads ask for one text at a time; a dispatcher thread gathers
+concurrent requests into batches of up to NLP_BATCH_SIZE texts, waiting at
+most NLP_BATCH_WAIT_MS for a batch to fill. Results are cached by text hash.
+
+Only Korean text is worth sending: `looks_korean` screens English articles
+out before they reach the pool.
+"""
+
+import os
+import re
+import queue
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ingest_engine import env_flag
+
+try:
+    from kiwipiepy import Kiwi
+    KIWI_AVAILABLE = True
+except ImportError:
+    KIWI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ENABLE_NLP_SERVICE = env_flag("ENABLE_NLP_SERVICE", True)
+NLP_WORKERS = int(os.getenv("NLP_WORKERS", "2"))
+NLP_THREADS_PER_WORKER = int(os.getenv("NLP_THREADS_PER_WORKER", "2"))
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "64"))
+NLP_BATCH_WAIT_MS = float(os.getenv("NLP_BATCH_WAIT_MS", "20"))
+NLP_CACHE_SIZE = int(os.getenv("NLP_CACHE_SIZE", "5000"))
+NLP_TIMEOUT = float(os.getenv("NLP_TIMEOUT", "30"))
+# Texts are cut before analysis; keywords come from the lead of an article anyway
+NLP_MAX_CHARS = int(os.getenv("NLP_MAX_CHARS", "3000"))
+
+# (form, tag) with Kiwi's tags mapped to the coarse classes the keyword code uses
+Token = Tuple[str, str]
+CONTENT_TAGS = {"Noun", "Verb", "Adjective", "Alpha"}
+
+_HANGUL_RE = re.compile(r"[가-힣]")
+_LETTER_RE = re.compile(r"[A-Za-z가-힣]")
+
+
+def looks_korean(text: str, min_ratio: float = 0.3) -> bool:
+    """Whether Hangul makes up a meaningful share of the letters in the text"""
+    if not text:
+        return False
+    sample = text[:2000]
+    letters = len(_LETTER_RE.findall(sample))
+    return letters > 0 and len(_HANGUL_RE.findall(sample)) / letters >= min_ratio
+
+
+# ---- worker process side ----
+
+_kiwi = None
+
+
+def _init_worker(num_threads: int) -> None:
+    global _kiwi
+    _kiwi = Kiwi(num_workers=num_threads)
+    _kiwi.tokenize("워밍업")
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _map_tag(tag: str) -> str:
+    if tag.startswith("NN"):
+        return "Noun"
+    if tag.startswith("VV"):
+        return "Verb"
+    if tag.startswith("VA"):
+        return "Adjective"
+    if tag == "SL":
+        return "Alpha"
+    return tag
+
+
+def _tokenize_batch(texts: List[str]) -> List[List[Token]]:
+    """Content tokens of each text; Kiwi spreads the batch over its own threads"""
+    results = []
+    for tokens in _kiwi.tokenize(texts):
+        pairs = []
+        for token in tokens:
+            tag = _map_tag(str(token.tag))
+            if tag in CONTENT_TAGS:
+                pairs.append((token.form, tag))
+        results.append(pairs)
+    return results
+
+
+# ---- caller side ----
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=16).digest()
+
+
+class NlpService:
+    def __init__(self, workers: int = NLP_WORKERS, batch_size: int = NLP_BATCH_SIZE,
+                 batch_wait_ms: float = NLP_BATCH_WAIT_MS, cache_size: int = NLP_CACHE_SIZE,
+                 enabled: bool = ENABLE_NLP_SERVICE):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = batch_wait_ms / 1000
+        self.cache_size = cache_size
+        self.enabled = enabled and KIWI_AVAILABLE
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queue: "queue.Queue[Tuple[bytes, str]]" = queue.Queue()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._cache: "OrderedDict[bytes, List[Token]]" = OrderedDict()
+        self._inflight: Dict[bytes, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'cache_hits': 0, 'batches': 0, 'texts_tokenized': 0, 'errors': 0}
+
+    def start(self) -> bool:
+        """Start and warm the worker pool (idempotent); False when Kiwi is unavailable"""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if self._pool is not None:
+                return True
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(NLP_THREADS_PER_WORKER,)
+            )
+            self._dispatcher = threading.Thread(target=self._dispatch, name="nlp-dispatcher", daemon=True)
+            self._dispatcher.start()
+        try:
+            # One trivial task per worker forces every process to spawn and load its model now
+            pids = {f.result(timeout=NLP_TIMEOUT * 4) for f in [self._pool.submit(_warm) for _ in range(self.workers)]}
+            logger.info(f"🧠 NLP pool ready: {len(pids)} Kiwi workers")
+        except Exception as e:
+            logger.warning(f"NLP pool warm-up failed: {e}")
+        return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            self._queue.put((b"", ""))  # wake the dispatcher so it exits
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cached(self, key: bytes) -> Optional[List[Token]]:
+        with self._lock:
+            tokens = self._cache.get(key)
+            if tokens is not None:
+                self._cache.move_to_end(key)
+                self._stats['cache_hits'] += 1
+            return tokens
+
+    def _remember(self, key: bytes, tokens: List[Token]) -> None:
+        with self._lock:
+            self._cache[key] = tokens
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _dispatch(self) -> None:
+        """Gather queued texts into batches and hand them to the pool"""
+        while True:
+            key, text = self._queue.get()
+            if self._pool is None:
+                break
+            batch = [(key, text)]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get(timeout=self.batch_wait))
+            except queue.Empty:
+                pass
+            batch = [(k, t) for k, t in batch if k]
+            pool = self._pool
+            if pool is None:
+                break
+            try:
+                future = pool.submit(_tokenize_batch, [t for _, t in batch])
+            except Exception as e:
+                self._fail([k for k, _ in batch], e)
+                continue
+            future.add_done_callback(lambda f, keys=[k for k, _ in batch]: self._complete(keys, f))
+
+    def _complete(self, keys: List[bytes], future: Future) -> None:
+        try:
+            results = future.result()
+        except Exception as e:
+            self._fail(keys, e)
+            return
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['texts_tokenized'] += len(keys)
+            waiters = [self._inflight.pop(key, None) for key in keys]
+        for key, tokens, waiter in zip(keys, results, waiters):
+            self._remember(key, tokens)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(tokens)
+
+    def _fail(self, keys: List[bytes], error: Exception) -> None:
+        logger.warning(f"Kiwi batch of {len(keys)} texts failed: {error}")
+        with self._lock:
+            self._stats['errors'] += 1
+            waiters = [self._inflight.pop(key, None) for key in keys]
+        for waiter in waiters:
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(error)
+
+    def submit(self, text: str) -> Optional[Future]:
+        """Future resolving to the text's content tokens; None when the service is off"""
+        if not self.enabled or not text or not self.start():
+            return None
+        text = text[:NLP_MAX_CHARS]
+        key = _text_key(text)
+        with self._lock:
+            self._stats['requests'] += 1
+        tokens = self._cached(key)
+        if tokens is not None:
+            future: Future = Future()
+            future.set_result(tokens)
+            return future
+        with self._lock:
+            # Identical texts requested concurrently share one analysis
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+        self._queue.put((key, text))
+        return future
+
+    def tokenize(self, text: str) -> Optional[List[Token]]:
+        """Content tokens of one text, batched with concurrent callers; None if unavailable"""
+        return self.tokenize_batch([text])[0]
+
+    def tokenize_batch(self, texts: List[str]) -> List[Optional[List[Token]]]:
+        futures = [self.submit(text) for text in texts]
+        results: List[Optional[List[Token]]] = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=NLP_TIMEOUT) if future is not None else None)
+            except Exception as e:
+                logger.warning(f"Kiwi tokenization unavailable: {e}")
+                results.append(None)
+        return results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, cached=len(self._cache), enabled=self.enabled,
+                        running=self._pool is not None)
+
+
+# Global NLP service instance
+nlp_service = NlpService()
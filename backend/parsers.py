@@ -0,0 +1,339 @@
+"""
+CPU-bound parsing helpers shared by the collectors
+Kept free of database/session imports so they can run in worker processes.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import feedparser
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# "lxml" (density-scored single pass) or "bs4" (selector-based)
+EXTRACTOR = os.getenv("EXTRACTOR", "lxml").lower()
+MAX_MAIN_TEXT = 3000
+# A learned per-domain selector must yield at least this much text to be trusted
+PROFILE_MIN_TEXT = int(os.getenv("PROFILE_MIN_TEXT", "200"))
+
+# Main content candidates, tried in order
+CONTENT_SELECTORS = [
+    "article",
+    "[id*='content']", "[class*='content']",
+    "[id*='article']", "[class*='article']",
+    "[class*='post-content']", "[class*='entry-content']",
+    "[id*='story']", "[class*='story']",
+    "main", ".main-content"
+]
+
+
+def parse_feed_content(content: Union[bytes, str]) -> List[dict]:
+    """Parse an RSS/Atom document and return its entries"""
+    feed = feedparser.parse(content)
+    return list(getattr(feed, "entries", []) or [])
+
+
+def extract_main_text_from_html(html: Union[bytes, str]) -> str:
+    """Extract main article text from an HTML document"""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove unwanted elements
+    for element in soup(["script", "style", "nav", "footer", "aside", "advertisement"]):
+        element.decompose()
+
+    best_content = ""
+    max_length = 0
+
+    for selector in CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        for element in elements:
+            text = element.get_text(separator="\n", strip=True)
+            if len(text) > max_length and len(text) > 200:
+                max_length = len(text)
+                best_content = text
+
+    # Fallback to meta description
+    if not best_content or len(best_content) < 100:
+        meta_desc = soup.find("meta", attrs={"name": "description"})
+        if not meta_desc:
+            meta_desc = soup.find("meta", attrs={"property": "og:description"})
+        if meta_desc and meta_desc.get("content"):
+            best_content = meta_desc["content"]
+
+    return best_content[:MAX_MAIN_TEXT]  # Limit length
+
+
+# --- lxml extractor -------------------------------------------------------
+
+_STRIP_TAGS = {
+    "script", "style", "noscript", "nav", "footer", "aside", "header", "form",
+    "iframe", "button", "select", "svg", "canvas", "template", "advertisement",
+}
+_INLINE_TAGS = {
+    "a", "abbr", "b", "bdi", "big", "cite", "code", "em", "font", "i", "img", "kbd", "label",
+    "mark", "q", "s", "small", "span", "strike", "strong", "sub", "sup", "time", "u", "wbr",
+}
+# Paragraph-like blocks credit their container; other blocks hold their own text (e.g. <br> runs)
+_PARAGRAPH_TAGS = {"p", "pre", "blockquote", "li", "dd", "h2", "h3", "h4"}
+_LINE_BREAK_TAGS = _PARAGRAPH_TAGS | {"br", "div", "section", "article", "td", "tr", "h1", "h5", "h6", "ul", "ol", "table"}
+_NEGATIVE_RE = re.compile(
+    r"comment|share|sns|social|related|recommend|popular|ranking|banner|advert|\bads?\b|\bad[-_]|"
+    r"sidebar|\bside[-_]|footer|gnb|lnb|menu|breadcrumb|copyright|subscribe|newsletter|tag[-_]?list|byline|reporter",
+    re.IGNORECASE,
+)
+_POSITIVE_RE = re.compile(r"article|content|entry|story|post|body|view|text|news[-_]?(?:body|text|view)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w-]+)", re.IGNORECASE)
+_SPACE_RE = re.compile(r"[ \t\r\f\v\xa0\u200b]+")
+_MIN_BLOCK_CHARS = 25
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """charset parameter of a Content-Type header (None when absent)"""
+    if not content_type:
+        return None
+    match = re.search(r"charset\s*=\s*[\"']?([\w-]+)", content_type, re.IGNORECASE)
+    return match.group(1).lower() if match else None
+
+
+def _parse_html(html: Union[bytes, str], encoding: Optional[str] = None):
+    """Parse bytes directly; without a header or <meta> charset, UTF-8 is tried before libxml2's latin-1 default"""
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+        encoding = "utf-8"
+    if not encoding and not _META_CHARSET_RE.search(html[:4096]):
+        try:
+            html.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            pass
+    parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+    return lxml.html.document_fromstring(html, parser=parser)
+
+
+def _is_boilerplate(el) -> bool:
+    if el.tag in _STRIP_TAGS:
+        return True
+    hint = f"{el.get('class', '')} {el.get('id', '')}"
+    return bool(hint.strip()) and bool(_NEGATIVE_RE.search(hint)) and el.tag not in ("body", "html", "article", "main")
+
+
+def _class_weight(el) -> float:
+    if el.tag in ("article", "main"):
+        return 1.3
+    hint = f"{el.get('class', '')} {el.get('id', '')}"
+    return 1.25 if hint.strip() and _POSITIVE_RE.search(hint) else 1.0
+
+
+def _collect_text(root) -> str:
+    """Text of a subtree with line breaks at block boundaries, skipping boilerplate subtrees"""
+    parts: List[str] = []
+    stack = [(root, False)]
+    while stack:
+        el, closing = stack.pop()
+        if closing:
+            if el.tag in _LINE_BREAK_TAGS:
+                parts.append("\n")
+            if el.tail and el is not root:
+                parts.append(el.tail)
+            continue
+        if not isinstance(el.tag, str) or (el is not root and _is_boilerplate(el)):
+            if el.tail:
+                parts.append(el.tail)
+            continue
+        if el.tag in _LINE_BREAK_TAGS:
+            parts.append("\n")
+        if el.text:
+            parts.append(el.text)
+        stack.append((el, True))
+        stack.extend((child, False) for child in reversed(el))
+
+    lines = (_SPACE_RE.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+@dataclass
+class Extraction:
+    text: str
+    selector: Optional[str] = None  # XPath of the winning container, for per-domain profiles
+    from_profile: bool = False      # True when the supplied selector produced the text
+
+
+def node_selector(el) -> Optional[str]:
+    """
+    XPath that finds this container again on pages with the same template:
+    its id, or one of its class tokens (content-looking ones first). Tokens
+    with digits are skipped as per-article, and the XPath must be unique in
+    this page. None when the container has no usable name.
+    """
+    root = el.getroottree().getroot()
+    candidates = []
+    el_id = (el.get("id") or "").strip()
+    if el_id and not re.search(r"\d|[\"\s]", el_id):
+        candidates.append(f'//{el.tag}[@id="{el_id}"]')
+    tokens = [t for t in (el.get("class") or "").split() if not re.search(r"\d|\"", t)]
+    tokens.sort(key=lambda t: not _POSITIVE_RE.search(t))
+    candidates.extend(
+        f'//{el.tag}[contains(concat(" ", normalize-space(@class), " "), " {t} ")]' for t in tokens
+    )
+    for xpath in candidates:
+        if len(root.xpath(xpath)) == 1:
+            return xpath
+    return None
+
+
+def _best_container(root):
+    """
+    Single walk of the tree: boilerplate subtrees are skipped as they are
+    reached; each block's own text (text, tails and inline children) is
+    scored by length and link density and credited to its container.
+    """
+    scores: Dict = {}
+    stack = [root]
+    while stack:
+        el = stack.pop()
+        if not isinstance(el.tag, str) or _is_boilerplate(el):
+            continue
+
+        text_len = len((el.text or "").strip())
+        link_len = 0
+        for child in el:
+            if child.tail:
+                text_len += len(child.tail.strip())
+            if not isinstance(child.tag, str):
+                continue
+            if child.tag in _INLINE_TAGS:
+                inline_len = len(child.text_content().strip())
+                text_len += inline_len
+                if child.tag == "a":
+                    link_len += inline_len
+                else:
+                    link_len += sum(len(a.text_content().strip()) for a in child.iter("a"))
+            stack.append(child)
+
+        if el.tag in _INLINE_TAGS or text_len < _MIN_BLOCK_CHARS:
+            continue
+        score = text_len * (1.0 - link_len / text_len)
+        parent = el.getparent()
+        if el.tag in _PARAGRAPH_TAGS:
+            targets = [(parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)]
+        else:
+            targets = [(el, 1.0), (parent, 0.5)]
+        for target, weight in targets:
+            if target is not None:
+                scores[target] = scores.get(target, 0.0) + score * weight
+
+    if not scores:
+        return None
+    return max(scores, key=lambda e: scores[e] * _class_weight(e))
+
+
+def _meta_description(root) -> str:
+    for xpath in ('//meta[@name="description"]/@content', '//meta[@property="og:description"]/@content'):
+        values = root.xpath(xpath)
+        if values and values[0].strip():
+            return values[0].strip()
+    return ""
+
+
+def _extract_lxml(html: Union[bytes, str], encoding: Optional[str], selector: Optional[str],
+                  learn: bool) -> Extraction:
+    try:
+        root = _parse_html(html, encoding)
+    except (etree.ParserError, ValueError):
+        return Extraction("")
+
+    if selector:
+        try:
+            nodes = root.xpath(selector)
+        except etree.XPathError:
+            nodes = []
+        if nodes and isinstance(nodes[0], etree.ElementBase):
+            text = _collect_text(nodes[0])
+            if len(text) >= PROFILE_MIN_TEXT:
+                return Extraction(text[:MAX_MAIN_TEXT], selector, from_profile=True)
+
+    best = _best_container(root)
+    best_content = _collect_text(best) if best is not None else ""
+    learned = None
+    if learn and best is not None and len(best_content) >= PROFILE_MIN_TEXT:
+        learned = node_selector(best)
+
+    # Fallback to meta description
+    if len(best_content) < 100:
+        best_content = _meta_description(root) or best_content
+
+    return Extraction(best_content[:MAX_MAIN_TEXT], learned)
+
+
+def extract_main_text_lxml(html: Union[bytes, str], encoding: Optional[str] = None) -> str:
+    """Extract main article text in a single walk of the lxml tree"""
+    return _extract_lxml(html, encoding, None, learn=False).text
+
+
+def extract_article(html: Union[bytes, str], encoding: Optional[str] = None,
+                    selector: Optional[str] = None) -> Extraction:
+    """
+    Main-text extraction with the configured extractor, trying a learned
+    per-domain selector first. When the selector is missing from the page
+    or yields under PROFILE_MIN_TEXT characters, generic scoring runs on the
+    same tree and reports the selector of its winning container.
+    """
+    if EXTRACTOR == "lxml" and LXML_AVAILABLE:
+        return _extract_lxml(html, encoding, selector, learn=True)
+    return Extraction(extract_main_text_from_html(html))
+
+
+def extract_article_text(html: Union[bytes, str], encoding: Optional[str] = None) -> str:
+    """Main-text extraction with the configured extractor"""
+    return extract_article(html, encoding).text
+
+
+# --- feed-carried article bodies ----------------------------------------------
+
+# Endings that mark a feed body as a teaser rather than the whole article
+_TRUNCATED_RE = re.compile(
+    r"(\.\.\.|…|\[…\]|\[\.\.\.\]|read more|continue reading|keep reading|더 ?보기|원문 ?보기|기사 ?전문)\W*$",
+    re.IGNORECASE,
+)
+# WordPress appends "The post X appeared first on Y." to full-content items
+_WP_FOOTER_RE = re.compile(r"\n?The post .{0,300} appeared first on .{0,120}$", re.IGNORECASE | re.DOTALL)
+
+
+def html_fragment_text(fragment: str) -> str:
+    """Plain text of an HTML fragment with line breaks at block boundaries"""
+    if LXML_AVAILABLE:
+        try:
+            return _collect_text(lxml.html.fragment_fromstring(fragment, create_parent="div"))
+        except (etree.ParserError, ValueError):
+            return ""
+    return BeautifulSoup(fragment, "html.parser").get_text(separator="\n", strip=True)
+
+
+def feed_entry_text(entry) -> str:
+    """Longest body the entry carries itself (content:encoded / Atom content, else summary), as text"""
+    candidates = [c.get("value") or "" for c in entry.get("content") or []]
+    detail = entry.get("summary_detail") or {}
+    candidates.append(detail.get("value") or entry.get("summary") or "")
+
+    best = ""
+    for value in candidates:
+        if not value:
+            continue
+        text = html_fragment_text(value) if "<" in value else _SPACE_RE.sub(" ", value).strip()
+        text = _WP_FOOTER_RE.sub("", text).strip()
+        if len(text) > len(best):
+            best = text
+    return best
+
+
+def is_full_article_text(text: str, min_chars: int) -> bool:
+    """Long enough and not ending in a "read more" stub"""
+    return len(text) >= min_chars and not _TRUNCATED_RE.search(text[-40:])
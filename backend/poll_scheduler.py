@@ -0,0 +1,259 @@
+"""
+Adaptive per-feed polling scheduler
+Learns each feed's publish rate (seeded from article history, then updated
+from the new entries seen on every poll) and schedules the next poll so a
+feed is fetched about once per POLL_TARGET_ENTRIES new items, within
+[POLL_MIN_INTERVAL, POLL_MAX_INTERVAL] and with jitter. Due feeds are
+dispatched to the collector; schedule state lives in feed_schedule so a
+restart resumes where it left off.
+
+Run standalone with `python poll_scheduler.py`, or set
+ENABLE_POLL_SCHEDULER=true to run it inside the API process. Every
+instance heartbeats the same leader lease and only the holder polls, so
+several workers or hosts can run it safely.
+"""
+
+import os
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from database import db
+from enhanced_news_collector import FEEDS, CollectionInProgress, collect_news_async
+from leader_lease import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+ENABLE_POLL_SCHEDULER = os.getenv("ENABLE_POLL_SCHEDULER", "false").lower() == "true"
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "300"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "86400"))
+POLL_DEFAULT_INTERVAL = float(os.getenv("POLL_DEFAULT_INTERVAL", "3600"))
+POLL_TARGET_ENTRIES = float(os.getenv("POLL_TARGET_ENTRIES", "2"))
+POLL_JITTER = float(os.getenv("POLL_JITTER", "0.1"))
+POLL_HISTORY_DAYS = int(os.getenv("POLL_HISTORY_DAYS", "14"))
+POLL_RATE_ALPHA = float(os.getenv("POLL_RATE_ALPHA", "0.3"))
+POLL_TICK = float(os.getenv("POLL_TICK", "30"))
+POLL_BATCH_SIZE = int(os.getenv("POLL_BATCH_SIZE", "10"))
+POLL_LEASE_NAME = "scheduled-collection"
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(str(value)[:19], _TIME_FORMAT)
+    except ValueError:
+        return None
+
+
+def interval_for(rate_per_hour: float) -> float:
+    """Seconds between polls so about POLL_TARGET_ENTRIES new items accumulate"""
+    if rate_per_hour <= 0:
+        return POLL_MAX_INTERVAL
+    return min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, POLL_TARGET_ENTRIES / rate_per_hour * 3600))
+
+
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+
+@dataclass
+class FeedSchedule:
+    feed: Dict
+    rate_per_hour: float
+    interval: float
+    next_poll_at: datetime
+    last_polled_at: Optional[datetime] = None
+    last_new_entries: Optional[int] = None
+
+    @property
+    def feed_url(self) -> str:
+        return self.feed["feed_url"]
+
+
+class FeedPollScheduler:
+    def __init__(self, feeds: Optional[List[Dict]] = None):
+        self.feeds = [f for f in (feeds if feeds is not None else FEEDS) if f.get("feed_url")]
+        self._schedules: Dict[str, FeedSchedule] = {}
+        self._loaded = False
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.lease = LeaderLease(POLL_LEASE_NAME)
+
+    def load(self) -> None:
+        """Restore persisted schedules; feeds seen for the first time are seeded from history"""
+        now = datetime.now()
+        rows = {row['feed_url']: row for row in db.get_feed_schedules()}
+        history = db.get_source_publish_counts(now - timedelta(days=POLL_HISTORY_DAYS))
+
+        for feed in self.feeds:
+            row = rows.get(feed["feed_url"])
+            if row and _parse_time(row['next_poll_at']):
+                self._schedules[feed["feed_url"]] = FeedSchedule(
+                    feed=feed,
+                    rate_per_hour=float(row['rate_per_hour'] or 0.0),
+                    interval=float(row['interval_seconds'] or POLL_DEFAULT_INTERVAL),
+                    next_poll_at=_parse_time(row['next_poll_at']),
+                    last_polled_at=_parse_time(row['last_polled_at']),
+                    last_new_entries=row['last_new_entries'],
+                )
+                continue
+
+            source = feed.get("source")
+            if source in history:
+                rate = history[source] / (POLL_HISTORY_DAYS * 24)
+                interval = interval_for(rate)
+            else:
+                interval = POLL_DEFAULT_INTERVAL
+                rate = POLL_TARGET_ENTRIES / interval * 3600
+            # Spread first polls so a fresh start does not sweep every feed at once
+            first_poll = now + timedelta(seconds=random.uniform(0, min(interval, POLL_MIN_INTERVAL)))
+            schedule = FeedSchedule(feed, rate, interval, first_poll)
+            self._schedules[feed["feed_url"]] = schedule
+            self._persist(schedule)
+
+        self._loaded = True
+        logger.info(f"🗓️ Poll scheduler tracking {len(self._schedules)} feeds")
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _persist(self, schedule: FeedSchedule) -> None:
+        try:
+            db.save_feed_schedule(
+                schedule.feed_url,
+                schedule.feed.get("source"),
+                schedule.rate_per_hour,
+                schedule.interval,
+                schedule.next_poll_at.strftime(_TIME_FORMAT),
+                schedule.last_polled_at.strftime(_TIME_FORMAT) if schedule.last_polled_at else None,
+                schedule.last_new_entries,
+            )
+        except Exception as e:
+            logger.warning(f"Schedule update failed for {schedule.feed_url}: {e}")
+
+    def due_feeds(self, now: Optional[datetime] = None) -> List[Dict]:
+        now = now or datetime.now()
+        due = sorted((s for s in self._schedules.values() if s.next_poll_at <= now),
+                     key=lambda s: s.next_poll_at)
+        return [s.feed for s in due[:POLL_BATCH_SIZE]]
+
+    def record(self, feed_url: str, new_entries: Optional[int], now: Optional[datetime] = None) -> None:
+        """Fold one poll outcome into the feed's rate and schedule its next poll (None = poll failed)"""
+        schedule = self._schedules.get(feed_url)
+        if not schedule:
+            return
+        now = now or datetime.now()
+
+        if new_entries is not None:
+            # The first poll only drains the backlog; rate samples start from the second
+            if schedule.last_polled_at:
+                elapsed = (now - schedule.last_polled_at).total_seconds()
+                observed = new_entries / max(elapsed, 1.0) * 3600
+                schedule.rate_per_hour = POLL_RATE_ALPHA * observed + (1 - POLL_RATE_ALPHA) * schedule.rate_per_hour
+                schedule.interval = interval_for(schedule.rate_per_hour)
+            schedule.last_polled_at = now
+            schedule.last_new_entries = new_entries
+
+        schedule.next_poll_at = now + timedelta(seconds=_jittered(schedule.interval))
+        self._persist(schedule)
+
+    async def run_once(self) -> int:
+        """Collect every due feed once; returns the number of feeds polled"""
+        await asyncio.to_thread(self.ensure_loaded)
+        due = self.due_feeds()
+        if not due:
+            return 0
+
+        logger.info(f"⏰ Polling {len(due)} due feeds")
+        try:
+            result = await collect_news_async(feeds=due)
+            new_entries = result.get('new_entries', {})
+        except CollectionInProgress:
+            # A manual run holds the collector; the feeds stay due for the next tick
+            logger.info("⏭️ Collection already in progress; scheduled poll skipped")
+            return 0
+        except Exception as e:
+            logger.error(f"❌ Scheduled collection failed: {e}")
+            new_entries = {}
+
+        now = datetime.now()
+        for feed in due:
+            await asyncio.to_thread(self.record, feed["feed_url"], new_entries.get(feed["feed_url"]), now)
+        return len(due)
+
+    def seconds_until_next(self) -> float:
+        if not self._schedules:
+            return POLL_TICK
+        next_due = min(s.next_poll_at for s in self._schedules.values())
+        return min(POLL_TICK, max(0.0, (next_due - datetime.now()).total_seconds()))
+
+    async def run_forever(self) -> None:
+        logger.info("🗓️ Poll scheduler started")
+        self._stop = asyncio.Event()
+        await asyncio.to_thread(self.lease.try_acquire)
+        heartbeat = asyncio.get_running_loop().create_task(self.lease.maintain(self._stop))
+        was_leader = False
+        while not self._stop.is_set():
+            leader = self.lease.is_leader
+            if leader and not was_leader:
+                # The previous leader kept advancing the schedule; start from the persisted state
+                self._loaded = False
+            was_leader = leader
+            if leader:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"❌ Poll scheduler error: {e}")
+            timeout = (self.seconds_until_next() or 1.0) if leader else self.lease.heartbeat
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        await heartbeat
+        logger.info("🗓️ Poll scheduler stopped")
+
+    def start(self) -> None:
+        """Run the scheduler as a background task on the current event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def snapshot(self) -> List[Dict]:
+        return [
+            {
+                'feed_url': s.feed_url,
+                'source': s.feed.get("source"),
+                'rate_per_hour': round(s.rate_per_hour, 3),
+                'interval_seconds': round(s.interval),
+                'next_poll_at': s.next_poll_at.isoformat(),
+                'last_polled_at': s.last_polled_at.isoformat() if s.last_polled_at else None,
+                'last_new_entries': s.last_new_entries,
+            }
+            for s in sorted(self._schedules.values(), key=lambda s: s.next_poll_at)
+        ]
+
+
+# Global scheduler instance
+poll_scheduler = FeedPollScheduler()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    db.init_database()
+    try:
+        asyncio.run(poll_scheduler.run_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,194 @@
+"""
+Related articles via MinHash signatures and an LSH band index
+Signatures are built from title and keyword shingles at ingest time;
+lookups retrieve candidates from shared LSH buckets and re-rank them
+by exact Jaccard similarity.
+"""
+
+import os
+import re
+import json
+import zlib
+import hashlib
+import logging
+from typing import List, Dict, Optional, Set, Iterable
+
+import numpy as np
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+MINHASH_NUM_PERM = int(os.getenv("MINHASH_NUM_PERM", "128"))
+LSH_BANDS = int(os.getenv("LSH_BANDS", "32"))
+MAX_RELATED_CANDIDATES = int(os.getenv("MAX_RELATED_CANDIDATES", "200"))
+
+# Hash family h(x) = (a*x + b) mod p with p = 2^31 - 1; a*x stays below 2^63 for 32-bit x
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+class MinHashLSH:
+    def __init__(self, num_perm: int = MINHASH_NUM_PERM, bands: int = LSH_BANDS, seed: int = 42):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by the number of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, (1 << 31) - 1, size=num_perm).astype(np.uint64)
+
+    @staticmethod
+    def shingles(title: str, keywords: Optional[Iterable[str]] = None) -> Set[str]:
+        """Character 3-grams of title tokens plus whole keywords (robust to Korean particles)"""
+        result: Set[str] = set()
+        for token in _TOKEN_RE.findall((title or "").lower()):
+            if len(token) <= 3:
+                result.add(f"t:{token}")
+            else:
+                result.update(f"t:{token[i:i + 3]}" for i in range(len(token) - 2))
+        for kw in keywords or []:
+            if isinstance(kw, str) and kw.strip():
+                result.add(f"k:{kw.strip().lower()}")
+        return result
+
+    def signature(self, shingles: Set[str]) -> Optional[np.ndarray]:
+        """MinHash signature of a shingle set (None for an empty set)"""
+        if not shingles:
+            return None
+        x = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+        )
+        hashed = (np.outer(x, self._a) + self._b) % _MERSENNE_PRIME
+        return hashed.min(axis=0)
+
+    def band_buckets(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket id per band; the band number is mixed into the hash"""
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].astype("<u8").tobytes()
+            digest = hashlib.blake2b(band.to_bytes(2, "little") + chunk, digest_size=8).digest()
+            buckets.append(int.from_bytes(digest, "little", signed=True))
+        return buckets
+
+    @staticmethod
+    def jaccard(a: Set[str], b: Set[str]) -> float:
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+
+def _parse_keywords(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else []
+    except (json.JSONDecodeError, TypeError):
+        return [k.strip() for k in str(value).split(',') if k.strip()]
+
+
+class RelatedArticleIndex:
+    def __init__(self, lsh: Optional[MinHashLSH] = None):
+        self.lsh = lsh or MinHashLSH()
+
+    def index_article(self, article_id: int, title: str, keywords: Optional[Iterable[str]]) -> int:
+        """(Re)write the LSH buckets of one article; returns the number of buckets stored"""
+        return self.index_articles([(article_id, title, keywords)])
+
+    def index_articles(self, articles: List[tuple]) -> int:
+        """(Re)write the LSH buckets of (article_id, title, keywords) rows with one delete and one insert"""
+        if not articles:
+            return 0
+        p = db.placeholder
+        db.execute_many(
+            f"DELETE FROM article_lsh_buckets WHERE article_id = {p}",
+            [(article_id,) for article_id, _, _ in articles]
+        )
+        params = []
+        for article_id, title, keywords in articles:
+            signature = self.lsh.signature(self.lsh.shingles(title, keywords))
+            if signature is not None:
+                params.extend((bucket, article_id) for bucket in self.lsh.band_buckets(signature))
+        if params:
+            db.execute_many(
+                f"INSERT INTO article_lsh_buckets (bucket, article_id) VALUES ({p}, {p}) ON CONFLICT DO NOTHING",
+                params
+            )
+        return len(params)
+
+    def backfill(self, batch_size: int = 500) -> int:
+        """Index articles that have no buckets yet (archives created before the index existed)"""
+        rows = db.execute_query("""
+            SELECT id, title, keywords FROM articles
+            WHERE id NOT IN (SELECT DISTINCT article_id FROM article_lsh_buckets)
+        """)
+        p = db.placeholder
+        indexed = 0
+        for start in range(0, len(rows), batch_size):
+            params = []
+            for row in rows[start:start + batch_size]:
+                signature = self.lsh.signature(
+                    self.lsh.shingles(row['title'], _parse_keywords(row['keywords']))
+                )
+                if signature is None:
+                    continue
+                params.extend((bucket, row['id']) for bucket in self.lsh.band_buckets(signature))
+                indexed += 1
+            db.execute_many(
+                f"INSERT INTO article_lsh_buckets (bucket, article_id) VALUES ({p}, {p}) ON CONFLICT DO NOTHING",
+                params
+            )
+        if indexed:
+            logger.info(f"🔗 LSH index backfilled for {indexed} articles")
+        return indexed
+
+    def find_related(self, article_id: int, limit: int = 10, min_similarity: float = 0.1) -> Optional[List[Dict]]:
+        """Related articles ranked by exact Jaccard; None if the article does not exist"""
+        p = db.placeholder
+        rows = db.execute_query(f"SELECT id, title, keywords FROM articles WHERE id = {p}", (article_id,))
+        if not rows:
+            return None
+        base = self.lsh.shingles(rows[0]['title'], _parse_keywords(rows[0]['keywords']))
+        signature = self.lsh.signature(base)
+        if signature is None:
+            return []
+
+        buckets = self.lsh.band_buckets(signature)
+        in_clause = ", ".join([p] * len(buckets))
+        candidates = db.execute_query(f"""
+            SELECT article_id, COUNT(*) AS hits FROM article_lsh_buckets
+            WHERE bucket IN ({in_clause}) AND article_id <> {p}
+            GROUP BY article_id
+            ORDER BY hits DESC
+            LIMIT {p}
+        """, tuple(buckets) + (article_id, MAX_RELATED_CANDIDATES))
+        if not candidates:
+            return []
+
+        ids = [row['article_id'] for row in candidates]
+        id_clause = ", ".join([p] * len(ids))
+        articles = db.execute_query(f"""
+            SELECT id, title, link, published, source, summary, keywords
+            FROM articles WHERE id IN ({id_clause})
+        """, tuple(ids))
+
+        related = []
+        for article in articles:
+            keywords = _parse_keywords(article['keywords'])
+            similarity = self.lsh.jaccard(base, self.lsh.shingles(article['title'], keywords))
+            if similarity < min_similarity:
+                continue
+            article['keywords'] = keywords
+            article['similarity'] = round(similarity, 4)
+            related.append(article)
+
+        related.sort(key=lambda a: a['similarity'], reverse=True)
+        return related[:limit]
+
+
+# Global index instance
+related_index = RelatedArticleIndex()
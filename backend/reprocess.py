@@ -0,0 +1,282 @@
+"""
+Offline article reprocessing
+Streams stored articles in id order (optionally limited to a published-date
+range and a set of sources), re-runs keyword extraction, the heuristic
+summary, the tech filter and the feed category mapping in a process pool and
+writes the changed rows back in batched updates. After every chunk the last
+written id is checkpointed in reprocess_jobs, so a stopped or crashed job
+resumes where it left off. With from_html, raw_text is first re-extracted
+from the pages kept in the HTML store, replaying extraction changes without
+any network I/O.
+
+Run from backend/:
+    python reprocess.py --job retag --since 2026-01-01 --source "ZDNet Korea" --from-html
+"""
+
+import os
+import json
+import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from database import db
+from enrichment import extract_keywords, heuristic_summarize, is_tech_article
+from enhanced_news_collector import FEEDS
+from leader_lease import LeaderLease
+from parsers import MAX_MAIN_TEXT, extract_article_text
+
+try:
+    from related_articles import related_index
+except ImportError:
+    related_index = None
+
+try:
+    from html_store import html_store
+except ImportError:
+    html_store = None
+
+logger = logging.getLogger(__name__)
+
+REPROCESS_CHUNK_SIZE = int(os.getenv("REPROCESS_CHUNK_SIZE", "500"))
+REPROCESS_WORKERS = int(os.getenv("REPROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Chunks queued per worker so the pool never idles while the parent reads or writes
+_PREFETCH_PER_WORKER = 2
+
+ALL_FIELDS = ("keywords", "summary", "category")
+
+
+@dataclass
+class ReprocessOptions:
+    since: Optional[str] = None          # published >= since
+    until: Optional[str] = None          # published < until
+    sources: List[str] = field(default_factory=list)
+    fields: List[str] = field(default_factory=lambda: list(ALL_FIELDS))
+    from_html: bool = False              # re-extract raw_text from the HTML store first
+    drop_non_tech: bool = False          # delete articles that fail the tech filter
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, value: Optional[str]) -> "ReprocessOptions":
+        return cls(**json.loads(value)) if value else cls()
+
+
+def _parse_keywords(value) -> List[str]:
+    if isinstance(value, list):
+        return value
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else []
+    except (json.JSONDecodeError, TypeError):
+        return [k.strip() for k in str(value).split(',') if k.strip()]
+
+
+def enrich_chunk(rows: List[Dict], categories: Dict[str, str], fields: List[str]) -> List[Dict]:
+    """
+    Worker-side enrichment of one chunk. Runs in a child process, so it only
+    touches the rows it is given; rows carrying 'html' are re-extracted first.
+    """
+    results = []
+    for row in rows:
+        title = row['title'] or ""
+        raw_text = row['raw_text'] or ""
+        if row.get('html'):
+            raw_text = extract_article_text(row['html'], row.get('charset')) or raw_text
+        raw_text = raw_text[:MAX_MAIN_TEXT]
+
+        keywords = extract_keywords(raw_text, title) if "keywords" in fields else _parse_keywords(row['keywords'])
+        results.append({
+            'id': row['id'],
+            'raw_text': raw_text,
+            'summary': heuristic_summarize(title, raw_text) if "summary" in fields else row['summary'],
+            'keywords': keywords,
+            'category': categories.get(row['source'], row['category']) if "category" in fields else row['category'],
+            'is_tech': is_tech_article(title, raw_text, keywords),
+        })
+    return results
+
+
+def _keywords_changed(row: Dict, result: Dict) -> bool:
+    # Compared as sets: older rows list tech keywords in set iteration order, which varied between runs
+    return set(_parse_keywords(row['keywords'])) != set(result['keywords'])
+
+
+def _changed(row: Dict, result: Dict) -> bool:
+    return (
+        (row['raw_text'] or "") != result['raw_text']
+        or row['summary'] != result['summary']
+        or _keywords_changed(row, result)
+        or row['category'] != result['category']
+    )
+
+
+class Reprocessor:
+    def __init__(self, workers: int = REPROCESS_WORKERS, chunk_size: int = REPROCESS_CHUNK_SIZE):
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._stop_requested: Dict[str, threading.Event] = {}
+
+    def request_stop(self, name: str) -> bool:
+        """Ask a job running in this process to stop after its current chunk"""
+        event = self._stop_requested.get(name)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+    def status(self, name: str) -> Optional[Dict]:
+        job = db.get_reprocess_job(name)
+        if job:
+            job['options'] = json.loads(job['options']) if job['options'] else {}
+            job['running_here'] = name in self._stop_requested
+        return job
+
+    def _load_html(self, rows: List[Dict]) -> int:
+        """Attach stored pages to rows for re-extraction; returns how many were found"""
+        found = 0
+        if html_store is None:
+            return found
+        for row in rows:
+            stored = html_store.latest(row['link'])
+            if stored:
+                row['html'], row['charset'], _ = stored
+                found += 1
+        return found
+
+    def run(self, name: str, options: Optional[ReprocessOptions] = None, restart: bool = False) -> Dict:
+        """Run (or resume) a job to completion; returns its final progress row"""
+        lease = LeaderLease(f"reprocess:{name}")
+        if not lease.try_acquire():
+            raise RuntimeError(f"reprocess job '{name}' is already running in another process")
+
+        job = None if restart else db.get_reprocess_job(name)
+        if job and job['status'] != 'done':
+            stored = ReprocessOptions.from_json(job['options'])
+            if options and options != stored:
+                logger.warning(f"Job '{name}' resumes with its stored filters; pass restart to change them")
+            options = stored
+            last_id, processed, changed, dropped = job['last_id'], job['processed'], job['changed'], job['dropped']
+            logger.info(f"♻️ Resuming reprocess job '{name}' after article {last_id}")
+        else:
+            options = options or ReprocessOptions()
+            last_id = processed = changed = dropped = 0
+            logger.info(f"♻️ Starting reprocess job '{name}': {options.to_json()}")
+
+        stop = self._stop_requested.setdefault(name, threading.Event())
+        stop.clear()
+        categories = {feed['source']: feed['category'] for feed in FEEDS}
+        status, error = 'running', None
+
+        def checkpoint(state: str, err: Optional[str] = None) -> None:
+            db.save_reprocess_job(name, options.to_json(), state, last_id, processed, changed, dropped, err)
+
+        checkpoint(status)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                pending = deque()
+                cursor, exhausted = last_id, False
+                while True:
+                    while not exhausted and not stop.is_set() and len(pending) < self.workers * _PREFETCH_PER_WORKER:
+                        rows = db.get_articles_for_reprocess(
+                            cursor, self.chunk_size, options.since, options.until, options.sources
+                        )
+                        if not rows:
+                            exhausted = True
+                            break
+                        cursor = rows[-1]['id']
+                        if options.from_html:
+                            self._load_html(rows)
+                        pending.append((rows, pool.submit(enrich_chunk, rows, categories, options.fields)))
+                    if not pending:
+                        break
+
+                    # Chunks are written in submission order so the checkpoint only ever moves past finished rows
+                    rows, future = pending.popleft()
+                    by_id = {row['id']: row for row in rows}
+                    results = future.result()
+                    non_tech = [r['id'] for r in results if not r['is_tech']] if options.drop_non_tech else []
+                    updates = [r for r in results if r['id'] not in non_tech and _changed(by_id[r['id']], r)]
+                    if updates:
+                        # Keyword changes and deletions move the rollup in their own transactions
+                        db.bulk_update_enrichment(updates, by_id)
+                        if related_index is not None:
+                            for result in updates:
+                                if _keywords_changed(by_id[result['id']], result):
+                                    related_index.index_article(
+                                        result['id'], by_id[result['id']]['title'], result['keywords']
+                                    )
+                    if non_tech:
+                        db.delete_articles(non_tech)
+
+                    last_id = rows[-1]['id']
+                    processed += len(rows)
+                    changed += len(updates)
+                    dropped += len(non_tech)
+                    checkpoint(status)
+                    logger.info(f"♻️ {name}: {processed} processed, {changed} changed, {dropped} dropped (id {last_id})")
+
+                    if not lease.try_acquire():
+                        raise RuntimeError(f"lost the lease for reprocess job '{name}'")
+                    if stop.is_set() and not exhausted:
+                        # Let already submitted chunks finish in the pool but do not write them
+                        for _, queued in pending:
+                            queued.cancel()
+                        status = 'stopped'
+                        break
+            if status == 'running':
+                status = 'done'
+        except Exception as e:
+            status, error = 'failed', str(e)
+            logger.error(f"❌ Reprocess job '{name}' failed at article {last_id}: {e}")
+        finally:
+            checkpoint(status, error)
+            self._stop_requested.pop(name, None)
+            lease.release()
+
+        logger.info(f"✅ Reprocess job '{name}' {status}: {processed} processed, {changed} changed, {dropped} dropped")
+        return self.status(name)
+
+
+# Global reprocessor instance
+reprocessor = Reprocessor()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run enrichment over stored articles")
+    parser.add_argument("--job", default="default", help="job name; progress is checkpointed under it")
+    parser.add_argument("--since", help="only articles published on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="only articles published before this date (YYYY-MM-DD)")
+    parser.add_argument("--source", action="append", default=[], help="limit to a source (repeatable)")
+    parser.add_argument("--fields", default=",".join(ALL_FIELDS),
+                        help=f"comma-separated fields to recompute ({', '.join(ALL_FIELDS)})")
+    parser.add_argument("--from-html", action="store_true", help="re-extract article text from the HTML store")
+    parser.add_argument("--drop-non-tech", action="store_true", help="delete articles failing the tech filter")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--workers", type=int, default=REPROCESS_WORKERS)
+    parser.add_argument("--chunk", type=int, default=REPROCESS_CHUNK_SIZE, help="articles per chunk")
+    args = parser.parse_args()
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    unknown = set(fields) - set(ALL_FIELDS)
+    if unknown:
+        parser.error(f"unknown fields: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.INFO)
+    db.init_database()
+    options = ReprocessOptions(
+        since=args.since, until=args.until, sources=args.source, fields=fields,
+        from_html=args.from_html, drop_non_tech=args.drop_non_tech,
+    )
+    result = Reprocessor(args.workers, args.chunk).run(args.job, options, restart=args.restart)
+    print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
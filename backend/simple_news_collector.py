@@ -1,45 +1,43 @@
 """
 Simple news collector for testing and development
-Standalone script that can run independently
+Script front-end on the shared ingest engine that keeps its own small
+SQLite file
 """
 
 import sqlite3
-import requests
-import feedparser
-import json
-import os
-from datetime import datetime
 from typing import List, Dict
 
+from ingest_engine import IngestConfig, SqliteSink, ingest
+
 # Simple configuration - expanded feed list
 FEEDS = [
     # Korean Tech News
-    {"feed_url": "https://it.donga.com/feeds/rss/", "source": "IT동아"},
-    {"feed_url": "https://rss.etnews.com/Section902.xml", "source": "전자신문_속보"},
-    {"feed_url": "https://rss.etnews.com/Section901.xml", "source": "전자신문_오늘의뉴스"},
-    {"feed_url": "https://zdnet.co.kr/news/news_xml.asp", "source": "ZDNet Korea"},
-    {"feed_url": "https://www.itworld.co.kr/rss/all.xml", "source": "ITWorld Korea"},
-    {"feed_url": "https://www.bloter.net/feed", "source": "Bloter"},
-    {"feed_url": "https://byline.network/feed/", "source": "Byline Network"},
-    {"feed_url": "https://platum.kr/feed", "source": "Platum"},
-    {"feed_url": "https://www.boannews.com/media/news_rss.xml", "source": "보안뉴스"},
-    {"feed_url": "https://it.chosun.com/rss.xml", "source": "IT조선"},
+    {"feed_url": "https://it.donga.com/feeds/rss/", "source": "IT동아", "lang": "ko"},
+    {"feed_url": "https://rss.etnews.com/Section902.xml", "source": "전자신문_속보", "lang": "ko"},
+    {"feed_url": "https://rss.etnews.com/Section901.xml", "source": "전자신문_오늘의뉴스", "lang": "ko"},
+    {"feed_url": "https://zdnet.co.kr/news/news_xml.asp", "source": "ZDNet Korea", "lang": "ko"},
+    {"feed_url": "https://www.itworld.co.kr/rss/all.xml", "source": "ITWorld Korea", "lang": "ko"},
+    {"feed_url": "https://www.bloter.net/feed", "source": "Bloter", "lang": "ko"},
+    {"feed_url": "https://byline.network/feed/", "source": "Byline Network", "lang": "ko"},
+    {"feed_url": "https://platum.kr/feed", "source": "Platum", "lang": "ko"},
+    {"feed_url": "https://www.boannews.com/media/news_rss.xml", "source": "보안뉴스", "lang": "ko"},
+    {"feed_url": "https://it.chosun.com/rss.xml", "source": "IT조선", "lang": "ko"},
     
     # Global Tech News
-    {"feed_url": "https://techcrunch.com/feed/", "source": "TechCrunch"},
-    {"feed_url": "https://www.theverge.com/rss/index.xml", "source": "The Verge"},
-    {"feed_url": "https://www.engadget.com/rss.xml", "source": "Engadget"},
-    {"feed_url": "https://www.wired.com/feed/rss", "source": "WIRED"},
-    {"feed_url": "https://www.technologyreview.com/feed/", "source": "MIT Tech Review"},
-    {"feed_url": "https://arstechnica.com/feed/", "source": "Ars Technica"},
-    {"feed_url": "https://feeds.feedburner.com/venturebeat/SZYF", "source": "VentureBeat"},
-    {"feed_url": "https://thenextweb.com/feed", "source": "The Next Web"},
-    {"feed_url": "https://www.zdnet.com/news/rss.xml", "source": "ZDNet"},
-    {"feed_url": "https://www.cnet.com/rss/news/", "source": "CNET News"},
+    {"feed_url": "https://techcrunch.com/feed/", "source": "TechCrunch", "lang": "en"},
+    {"feed_url": "https://www.theverge.com/rss/index.xml", "source": "The Verge", "lang": "en"},
+    {"feed_url": "https://www.engadget.com/rss.xml", "source": "Engadget", "lang": "en"},
+    {"feed_url": "https://www.wired.com/feed/rss", "source": "WIRED", "lang": "en"},
+    {"feed_url": "https://www.technologyreview.com/feed/", "source": "MIT Tech Review", "lang": "en"},
+    {"feed_url": "https://arstechnica.com/feed/", "source": "Ars Technica", "lang": "en"},
+    {"feed_url": "https://feeds.feedburner.com/venturebeat/SZYF", "source": "VentureBeat", "lang": "en"},
+    {"feed_url": "https://thenextweb.com/feed", "source": "The Next Web", "lang": "en"},
+    {"feed_url": "https://www.zdnet.com/news/rss.xml", "source": "ZDNet", "lang": "en"},
+    {"feed_url": "https://www.cnet.com/rss/news/", "source": "CNET News", "lang": "en"},
 ]
 
 DB_PATH = "simple_news.db"
-HEADERS = {"User-Agent": "Mozilla/5.0 (NewsAgent/1.0)"}
+MAX_ITEMS = 10
 
 def init_simple_db():
     """Initialize simple database"""
@@ -69,87 +67,19 @@ def init_simple_db():
     conn.close()
     print("✅ Simple database initialized")
 
-def collect_from_feed(feed_url: str, source: str, max_items: int = 10) -> List[Dict]:
-    """Collect news from a single RSS feed"""
-    try:
-        print(f"📡 Collecting from {source}...")
-        
-        # Parse RSS feed
-        feed = feedparser.parse(feed_url)
-        if not hasattr(feed, 'entries') or not feed.entries:
-            print(f"❌ No entries found for {source}")
-            return []
-        
-        articles = []
-        for entry in feed.entries[:max_items]:
-            try:
-                article = {
-                    'title': getattr(entry, 'title', '').strip(),
-                    'link': getattr(entry, 'link', '').strip(),
-                    'published': getattr(entry, 'published', datetime.now().strftime('%Y-%m-%d')),
-                    'source': source,
-                    'summary': getattr(entry, 'summary', '')[:500] if hasattr(entry, 'summary') else ''
-                }
-                
-                if article['title'] and article['link']:
-                    articles.append(article)
-                    
-            except Exception as e:
-                print(f"⚠️ Error processing entry from {source}: {e}")
-                continue
-        
-        print(f"✅ Collected {len(articles)} articles from {source}")
-        return articles
-        
-    except Exception as e:
-        print(f"❌ Error collecting from {source}: {e}")
-        return []
-
 def save_articles(articles: List[Dict]) -> Dict[str, int]:
     """Save articles to database"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    stats = {'inserted': 0, 'skipped': 0}
-    
-    for article in articles:
-        try:
-            cursor.execute("""
-                INSERT OR IGNORE INTO articles (title, link, published, source, summary)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                article['title'],
-                article['link'], 
-                article['published'],
-                article['source'],
-                article['summary']
-            ))
-            
-            if cursor.rowcount > 0:
-                stats['inserted'] += 1
-            else:
-                stats['skipped'] += 1
-                
-        except Exception as e:
-            print(f"⚠️ Error saving article: {e}")
-            stats['skipped'] += 1
-    
-    conn.commit()
-    conn.close()
-    
-    return stats
+    sink = SqliteSink(DB_PATH, update_existing=False)
+    try:
+        return sink.write(articles)
+    finally:
+        sink.close()
 
 def collect_all_feeds():
     """Collect news from all feeds and save to DB"""
-    all_articles = []
-    for feed in FEEDS:
-        articles = collect_from_feed(feed['feed_url'], feed['source'])
-        all_articles.extend(articles)
-    
-    if all_articles:
-        stats = save_articles(all_articles)
-        return len(all_articles), stats
-    return 0, {'inserted': 0, 'skipped': 0}
+    result = ingest(FEEDS, SqliteSink(DB_PATH, update_existing=False), IngestConfig(max_results=MAX_ITEMS))
+    stats = result['stats']
+    return stats['total_processed'], {'inserted': stats['total_inserted'], 'skipped': stats['total_skipped']}
 
 def run_simple_collection():
     """Run simple news collection"""
@@ -159,20 +89,14 @@ def run_simple_collection():
     init_simple_db()
     
     # Collect from all feeds
-    all_articles = []
-    for feed in FEEDS:
-        articles = collect_from_feed(feed['feed_url'], feed['source'])
-        all_articles.extend(articles)
+    total, stats = collect_all_feeds()
     
-    if not all_articles:
+    if not total:
         print("❌ No articles collected")
         return
     
-    # Save articles
-    stats = save_articles(all_articles)
-    
     print(f"📊 Collection complete:")
-    print(f"   - Total collected: {len(all_articles)}")
+    print(f"   - Total collected: {total}")
     print(f"   - Newly inserted: {stats['inserted']}")
     print(f"   - Skipped (duplicates): {stats['skipped']}")
     
@@ -0,0 +1,125 @@
+"""
+Multi-term dictionary matcher (Aho-Corasick)
+The classifiers used to test every dictionary term against the text with a
+separate substring scan. A TermMatcher compiles all terms of a dictionary
+(optionally split into named groups such as categories) into one automaton
+and reports every term found, with occurrence counts, in a single pass over
+the lowercased text. Matching keeps plain substring semantics: terms may
+overlap or sit inside longer words, as with `term in text`.
+
+The automaton comes from pyahocorasick. Without it the matcher falls back to
+one substring scan per term: same results, original cost.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, List, Mapping, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+DEFAULT_GROUP = "terms"
+
+
+@dataclass
+class TermMatches:
+    # Matched dictionary terms (original spelling) -> occurrences, in order of first occurrence
+    terms: Dict[str, int] = field(default_factory=dict)
+    # Group -> distinct matched terms, in the group's dictionary order
+    groups: Dict[Hashable, List[str]] = field(default_factory=dict)
+
+    def hits(self, group: Hashable = DEFAULT_GROUP) -> List[str]:
+        return self.groups.get(group, [])
+
+    def count(self, group: Hashable = DEFAULT_GROUP) -> int:
+        """Number of distinct terms of the group found"""
+        return len(self.groups.get(group, ()))
+
+
+class TermMatcher:
+    def __init__(self, groups: Mapping[Hashable, Iterable[str]]):
+        """
+        Compile a dictionary of group -> terms. Matching is case-insensitive;
+        results report the terms as spelled in the dictionary.
+        """
+        self._keys: List[str] = []
+        # Per key: (group, term, position of the term within its group)
+        self._entries: List[List[Tuple[Hashable, str, int]]] = []
+        index_of: Dict[str, int] = {}
+        for group, terms in groups.items():
+            for position, term in enumerate(terms):
+                key = term.lower()
+                if not key:
+                    continue
+                if key not in index_of:
+                    index_of[key] = len(self._keys)
+                    self._keys.append(key)
+                    self._entries.append([])
+                self._entries[index_of[key]].append((group, term, position))
+
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self._keys:
+            self._automaton = ahocorasick.Automaton()
+            for index, key in enumerate(self._keys):
+                self._automaton.add_word(key, index)
+            self._automaton.make_automaton()
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[str]) -> "TermMatcher":
+        """Matcher over a flat term list (single DEFAULT_GROUP)"""
+        return cls({DEFAULT_GROUP: terms})
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _key_counts(self, text: str) -> Dict[int, int]:
+        """Occurrences (overlapping) per key index, in order of first match"""
+        counts: Dict[int, int] = {}
+        if not self._keys or not text:
+            return counts
+        text = text.lower()
+        if self._automaton is not None:
+            for _, index in self._automaton.iter(text):
+                counts[index] = counts.get(index, 0) + 1
+            return counts
+
+        found = []
+        for index, key in enumerate(self._keys):
+            start = text.find(key)
+            if start < 0:
+                continue
+            first_end, occurrences = start + len(key), 0
+            while start >= 0:
+                occurrences += 1
+                start = text.find(key, start + 1)
+            found.append((first_end, index, occurrences))
+        for _, index, occurrences in sorted(found):
+            counts[index] = occurrences
+        return counts
+
+    def scan(self, text: str) -> TermMatches:
+        """Every dictionary term found in the text, per term and per group, in one pass"""
+        matches = TermMatches()
+        positions: Dict[Hashable, List[Tuple[int, str]]] = {}
+        for index, occurrences in self._key_counts(text).items():
+            for group, term, position in self._entries[index]:
+                # A spelling listed under several groups is still one term
+                matches.terms.setdefault(term, occurrences)
+                positions.setdefault(group, []).append((position, term))
+        for group, found in positions.items():
+            found.sort()
+            matches.groups[group] = [term for _, term in found]
+        return matches
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any term occurs; stops at the first hit"""
+        if not self._keys or not text:
+            return False
+        text = text.lower()
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+            return False
+        return any(key in text for key in self._keys)
@@ -0,0 +1,120 @@
+"""
+Shared fixtures: the backend modules read their settings at import time, so
+the database and stores are pointed at a temporary directory before anything
+from backend/ is imported. Tests run from backend/: python -m pytest -q
+"""
+
+import os
+import sys
+import hashlib
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_TMP_DIR = tempfile.mkdtemp(prefix="news-tests-")
+os.environ.update(
+    DATABASE_URL="",
+    DB_TYPE="sqlite",
+    SQLITE_PATH=os.path.join(_TMP_DIR, "backend.db"),
+    HTML_STORE_DIR=os.path.join(_TMP_DIR, "html"),
+    ENABLE_HTTP_CACHE="false",
+    ENABLE_NLP_SERVICE="false",
+    OPENAI_API_KEY="",
+    HOST_MIN_INTERVAL="0",
+)
+
+from database import db  # noqa: E402
+
+db.init_database()
+
+
+@pytest.fixture
+def backend_db(monkeypatch):
+    """The backend database with every table emptied and a fresh near-duplicate index"""
+    import enhanced_news_collector
+    import ingest_pipeline
+    from near_duplicates import SimHashIndex
+
+    for row in db.execute_query("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"):
+        db.execute_update(f"DELETE FROM {row['name']}")
+    index = SimHashIndex()
+    monkeypatch.setattr(enhanced_news_collector, "simhash_index", index)
+    monkeypatch.setattr(ingest_pipeline, "simhash_index", index)
+    return db
+
+
+def make_article(n: int, **fields) -> dict:
+    """An enriched article as the collector hands it to a sink"""
+    article = {
+        'title': f"Story {n} about GPUs and cloud",
+        'link': f"https://example.com/a/{n}",
+        'published': f"2026-10-{n % 9 + 1:02d}T09:00:00",
+        'source': "Example",
+        'raw_text': f"Body of story {n}.",
+        'summary': f"Summary {n}",
+        'keywords': ["gpu", "cloud"],
+        'category': "IT",
+        'language': "en",
+    }
+    article.update(fields)
+    return article
+
+
+def rollup(db) -> dict:
+    """Non-zero keyword_daily_counts rows as {(day, keyword): count}"""
+    return {
+        (r['day'], r['keyword']): r['count']
+        for r in db.execute_query("SELECT day, keyword, count FROM keyword_daily_counts WHERE count != 0")
+    }
+
+
+def _rss(port: int, count: int) -> bytes:
+    items = []
+    for n in range(count):
+        # Distinct words per item so the near-duplicate filter keeps them all
+        words = " ".join(hashlib.sha1(f"{n}:{k}".encode()).hexdigest()[:8] for k in range(60))
+        items.append(f"""<item><title>Semiconductor cloud AI story {n}</title>
+<link>http://127.0.0.1:{port}/a/{n}</link><guid>http://127.0.0.1:{port}/a/{n}</guid>
+<pubDate>Mon, {28 - n:02d} Sep 2026 10:00:00 +0000</pubDate>
+<description>Story {n} on AI chips, GPU servers and cloud semiconductor plans. {words}</description></item>""")
+    return (f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Test</title>'
+            f'<link>http://127.0.0.1:{port}/</link><description>Test feed</description>'
+            f'{"".join(items)}</channel></rss>').encode()
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if not self.path.startswith("/feed"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = _rss(self.server.server_address[1], self.server.item_count)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def feed_server():
+    """A local RSS feed of three full-text items; yields its feed config"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.item_count = 3
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield {
+            "feed_url": f"http://127.0.0.1:{server.server_address[1]}/feed",
+            "source": "Local", "category": "IT", "lang": "en",
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,104 @@
+"""Engine and sink contract: DatabaseSink and SqliteSink dedup and update the same way"""
+
+import sqlite3
+
+import pytest
+
+from conftest import make_article
+from ingest_engine import DatabaseSink, IngestConfig, SqliteSink, ingest
+
+
+@pytest.fixture(params=["database", "sqlite"])
+def sink(request, backend_db, tmp_path):
+    if request.param == "database":
+        from enhanced_news_collector import collector
+        sink = DatabaseSink(collector)
+
+        def rows():
+            return {r['link']: r for r in backend_db.execute_query("SELECT link, title, keywords FROM articles")}
+    else:
+        sink = SqliteSink(str(tmp_path / "articles.db"))
+
+        def rows():
+            with sqlite3.connect(sink.path) as conn:
+                conn.row_factory = sqlite3.Row
+                return {r['link']: dict(r) for r in conn.execute("SELECT link, title, keywords FROM articles")}
+    sink.rows = rows
+    yield sink
+    sink.close()
+
+
+def test_new_links_are_inserted_once(sink):
+    first = make_article(1)
+    stats = sink.write([first, make_article(2), make_article(1, title="Same link from another feed")])
+
+    assert stats['inserted'] == 2
+    assert stats['skipped'] == 1
+    rows = sink.rows()
+    assert sorted(rows) == [first['link'], make_article(2)['link']]
+    assert rows[first['link']]['title'] == first['title']
+    assert sink.contains(first['link'])
+    assert not sink.contains(make_article(3)['link'])
+
+
+def test_changed_articles_are_updated_in_place(sink):
+    sink.write([make_article(1), make_article(2)])
+
+    stats = sink.write([make_article(1, title="Retitled", keywords=["gpu", "hbm"]), make_article(3)])
+
+    assert stats['inserted'] == 1
+    assert stats['updated'] == 1
+    rows = sink.rows()
+    assert len(rows) == 3
+    assert rows[make_article(1)['link']]['title'] == "Retitled"
+    assert "hbm" in rows[make_article(1)['link']]['keywords']
+
+
+def test_database_sink_skips_unchanged_articles(backend_db):
+    from enhanced_news_collector import collector
+    sink = DatabaseSink(collector)
+    sink.write([make_article(1)])
+
+    assert sink.write([make_article(1)]) == {'inserted': 0, 'updated': 0, 'skipped': 1, 'failed': 0}
+
+
+def test_sqlite_sink_can_keep_stored_rows(tmp_path):
+    sink = SqliteSink(str(tmp_path / "articles.db"), update_existing=False)
+    sink.write([make_article(1)])
+
+    stats = sink.write([make_article(1, title="Retitled")])
+
+    assert stats == {'inserted': 0, 'updated': 0, 'skipped': 1}
+    sink.close()
+
+
+def test_database_sink_indexes_saved_articles(backend_db):
+    from enhanced_news_collector import collector
+    DatabaseSink(collector).write([make_article(1), make_article(2)])
+
+    indexed = backend_db.execute_query("SELECT COUNT(DISTINCT article_id) AS n FROM article_lsh_buckets")
+    assert indexed[0]['n'] == 2
+
+
+def test_ingest_into_backend_database_skips_known_links(backend_db, feed_server):
+    config = IngestConfig(fetch_pages=False, max_pages=1)
+
+    first = ingest([feed_server], config=config)
+    second = ingest([feed_server], config=config)
+
+    assert first['stats']['total_inserted'] == 3
+    assert second['stats']['total_inserted'] == 0
+    assert len(backend_db.execute_query("SELECT id FROM articles")) == 3
+
+
+def test_ingest_into_sqlite_sink_leaves_backend_database_alone(backend_db, feed_server, tmp_path):
+    path = str(tmp_path / "articles.db")
+    config = IngestConfig(fetch_pages=False, max_pages=1)
+
+    result = ingest([feed_server], SqliteSink(path), config)
+
+    assert result['stats']['total_inserted'] == 3
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 3
+    for table in ("articles", "feed_watermarks", "feed_state", "article_simhash"):
+        assert backend_db.execute_query(f"SELECT COUNT(*) AS n FROM {table}")[0]['n'] == 0, table
@@ -0,0 +1,74 @@
+"""The per-day keyword rollup moves with every article write and matches a full rebuild"""
+
+from conftest import make_article, rollup
+from ingest_engine import DatabaseSink
+
+
+def assert_matches_rebuild(db):
+    before = rollup(db)
+    db.rebuild_keyword_daily_counts()
+    assert rollup(db) == before
+
+
+def save(articles):
+    from enhanced_news_collector import collector
+    return DatabaseSink(collector).write(articles)
+
+
+def test_inserted_articles_are_counted_per_day(backend_db):
+    save([
+        make_article(1, published="2026-10-02T09:00:00", keywords=["gpu", "cloud"]),
+        make_article(2, published="2026-10-02T18:30:00", keywords=["gpu", "gpu"]),
+    ])
+
+    assert rollup(backend_db) == {("2026-10-02", "gpu"): 2, ("2026-10-02", "cloud"): 1}
+    assert_matches_rebuild(backend_db)
+
+
+def test_updated_keywords_move_the_counts(backend_db):
+    save([make_article(1, keywords=["gpu", "cloud"])])
+
+    save([make_article(1, keywords=["gpu", "hbm"])])
+
+    counts = rollup(backend_db)
+    day = "2026-10-02"
+    assert counts == {(day, "gpu"): 1, (day, "hbm"): 1}
+    assert_matches_rebuild(backend_db)
+
+
+def test_enrichment_updates_and_deletes_move_the_counts(backend_db):
+    save([make_article(n) for n in range(1, 4)])
+    stored = {r['id']: r for r in backend_db.execute_query("SELECT id, published, keywords FROM articles")}
+    first, second, _ = sorted(stored)
+
+    backend_db.bulk_update_enrichment([
+        {'id': first, 'raw_text': "text", 'summary': "s", 'keywords': ["npu"], 'category': "AI"},
+    ], stored)
+    backend_db.delete_articles([second])
+
+    counts = rollup(backend_db)
+    assert sum(counts.values()) == 3
+    assert_matches_rebuild(backend_db)
+
+
+def test_rebuild_repairs_a_drifted_rollup(backend_db):
+    save([make_article(1), make_article(2)])
+    expected = rollup(backend_db)
+    backend_db.update_keyword_counts("2026-10-05", ["stale"])
+
+    rows = backend_db.rebuild_keyword_daily_counts()
+
+    assert rows == len(expected)
+    assert rollup(backend_db) == expected
+
+
+def test_rebuild_is_skipped_while_another_one_runs(backend_db):
+    from database import KEYWORD_REBUILD_LOCK
+    save([make_article(1)])
+    backend_db.update_keyword_counts("2026-10-05", ["stale"])
+    assert backend_db.try_acquire_lock(KEYWORD_REBUILD_LOCK, "another-host", 60)
+    try:
+        assert backend_db.rebuild_keyword_daily_counts() == 0
+        assert rollup(backend_db)[("2026-10-05", "stale")] == 1
+    finally:
+        backend_db.release_lock(KEYWORD_REBUILD_LOCK, "another-host")
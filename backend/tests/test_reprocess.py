@@ -0,0 +1,69 @@
+"""Reprocess jobs checkpoint after every chunk and resume after the last written id"""
+
+import json
+
+import pytest
+
+from conftest import make_article, rollup
+from ingest_engine import DatabaseSink
+from reprocess import Reprocessor, ReprocessOptions
+
+TECH_TEXT = "Nvidia GPU HBM semiconductor cloud AI chip TSMC wafer announced. " * 10
+FOOD_TEXT = "The chef cooked pasta and the restaurant served wine to guests. " * 10
+
+
+@pytest.fixture
+def articles(backend_db):
+    from enhanced_news_collector import collector
+    DatabaseSink(collector).write([
+        make_article(n, title=f"Story {n}", raw_text=TECH_TEXT if n % 2 else FOOD_TEXT, keywords=["old"])
+        for n in range(1, 7)
+    ])
+    return [row['id'] for row in backend_db.execute_query("SELECT id FROM articles ORDER BY id")]
+
+
+def stored_keywords(db):
+    return {r['id']: json.loads(r['keywords']) for r in db.execute_query("SELECT id, keywords FROM articles")}
+
+
+def test_job_runs_to_completion(backend_db, articles):
+    job = Reprocessor(workers=1, chunk_size=2).run("full", ReprocessOptions(fields=["keywords"]))
+
+    assert job['status'] == 'done'
+    assert job['processed'] == len(articles)
+    assert job['last_id'] == articles[-1]
+    assert all(keywords != ["old"] for keywords in stored_keywords(backend_db).values())
+
+
+def test_stopped_job_resumes_after_its_checkpoint(backend_db, articles):
+    options = ReprocessOptions(fields=["keywords"])
+    backend_db.save_reprocess_job("resume", options.to_json(), 'stopped', articles[1], 2, 0, 0, None)
+
+    job = Reprocessor(workers=1, chunk_size=2).run("resume", ReprocessOptions(fields=["summary"]))
+
+    assert job['status'] == 'done'
+    assert job['processed'] == len(articles)
+    assert job['options']['fields'] == ["keywords"]
+    keywords = stored_keywords(backend_db)
+    assert [keywords[i] for i in articles[:2]] == [["old"], ["old"]]
+    assert all(keywords[i] != ["old"] for i in articles[2:])
+
+
+def test_restart_ignores_the_checkpoint(backend_db, articles):
+    options = ReprocessOptions(fields=["keywords"])
+    backend_db.save_reprocess_job("again", options.to_json(), 'stopped', articles[-1], 6, 0, 0, None)
+
+    job = Reprocessor(workers=1, chunk_size=2).run("again", options, restart=True)
+
+    assert job['processed'] == len(articles)
+    assert all(keywords != ["old"] for keywords in stored_keywords(backend_db).values())
+
+
+def test_dropping_non_tech_articles_keeps_the_rollup_in_step(backend_db, articles):
+    job = Reprocessor(workers=1, chunk_size=2).run("drop", ReprocessOptions(drop_non_tech=True))
+
+    assert job['dropped'] == 3
+    assert len(backend_db.execute_query("SELECT id FROM articles")) == 3
+    counts = rollup(backend_db)
+    backend_db.rebuild_keyword_daily_counts()
+    assert rollup(backend_db) == counts
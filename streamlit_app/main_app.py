@@ -21,9 +21,6 @@
 # UI_LOAD_LIMIT=2000
 # CONNECT_TIMEOUT=6
 # READ_TIMEOUT=10
-# OPENAI_TIMEOUT=20
-# NLP_BACKEND=kiwi
-# PER_ARTICLE_SLEEP=0
 # OPENAI_API_KEY=sk-...          # ENABLE_SUMMARY=1일 때만 필요
 # ENABLE_GITHUB=0
 # GITHUB_TOKEN=ghp_...
@@ -36,19 +33,18 @@
 # ──────────────────────────────────────────────────────────────────────────────
 
 from __future__ import annotations
-import os, sys, json, sqlite3, time
-from typing import List, Dict, Tuple, Optional, Iterable, Set
+import os, sys, json, sqlite3
+from typing import List, Dict, Tuple, Optional, Set
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 import re
+# 백엔드 공용 모듈(ingest_engine, enrichment) 경로
+sys.path.append(str(Path(__file__).resolve().parent.parent / "backend"))
 from translate_util import translate_rows_if_needed
 
 import numpy as np
 import pandas as pd
-import requests
-import feedparser
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
 import streamlit as st
@@ -58,9 +54,6 @@ import matplotlib.pyplot as plt
 from wordcloud import WordCloud, STOPWORDS
 from pyvis.network import Network
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
-
 st.set_page_config(page_title="뉴스있슈~(News IT's Issue)", layout="wide")
 
 # ============================================================
@@ -69,6 +62,10 @@ st.set_page_config(page_title="뉴스있슈~(News IT's Issue)", layout="wide")
 env_path = Path(__file__).resolve().with_name(".env")
 load_dotenv(dotenv_path=env_path)
 
+# 수집(피드/본문/요약/키워드/저장)은 백엔드 공용 엔진 사용 — .env 를 읽은 뒤에 import 해야 설정이 반영됨
+from ingest_engine import IngestConfig, SqliteSink, ingest
+from enrichment import is_tech_article, sanitize_summary
+
 # ===== 안전 파서 유틸 (주석/따옴표/공백 허용) =====
 import re
 
@@ -96,31 +93,11 @@ def getenv_str(name: str, default: str="") -> str:
     return _strip_comment(os.getenv(name, default))
 
 # ===== 여기부터 교체 =====
-MAX_RESULTS            = getenv_int("MAX_RESULTS", 10)
-MAX_TOTAL_PER_SOURCE   = getenv_int("MAX_TOTAL_PER_SOURCE", 200)
-RSS_BACKFILL_PAGES     = getenv_int("RSS_BACKFILL_PAGES", 3)
-
-CONNECT_TIMEOUT        = getenv_float("CONNECT_TIMEOUT", 6.0)
-READ_TIMEOUT           = getenv_float("READ_TIMEOUT", 10.0)
-OPENAI_TIMEOUT         = getenv_float("OPENAI_TIMEOUT", 20.0)
-
-ENABLE_SUMMARY         = getenv_bool("ENABLE_SUMMARY", False)
+# MAX_RESULTS, CONNECT_TIMEOUT, ENABLE_SUMMARY, SKIP_NON_TECH 등 수집 설정은 backend/ingest_engine.py 가 읽음
 ENABLE_GITHUB          = getenv_bool("ENABLE_GITHUB", False)
-ENABLE_HTTP_CACHE      = getenv_bool("ENABLE_HTTP_CACHE", True)
-HTTP_CACHE_EXPIRE      = getenv_int("HTTP_CACHE_EXPIRE", 3600)
-PARALLEL_MAX_WORKERS   = getenv_int("PARALLEL_MAX_WORKERS", 8)
-SKIP_UPDATE_IF_EXISTS  = getenv_bool("SKIP_UPDATE_IF_EXISTS", True)
-
 UI_LOAD_LIMIT          = getenv_int("UI_LOAD_LIMIT", 2000)
-
-NLP_BACKEND            = getenv_str("NLP_BACKEND", "kiwi").lower()
-PER_ARTICLE_SLEEP      = getenv_float("PER_ARTICLE_SLEEP", 0.0)
-
-STRICT_TECH_KEYWORDS   = getenv_bool("STRICT_TECH_KEYWORDS", True)
-SKIP_NON_TECH          = getenv_bool("SKIP_NON_TECH", False)
 HIDE_NON_TECH_AT_UI    = getenv_bool("HIDE_NON_TECH_AT_UI", False)
 
-OPENAI_API_KEY         = getenv_str("OPENAI_API_KEY", "ssu1")
 GITHUB_TOKEN           = getenv_str("GITHUB_TOKEN",   "ssu2")
 GITHUB_REPO            = getenv_str("GITHUB_REPO",    "ssu3")
 GITHUB_PATH            = getenv_str("GITHUB_PATH",    "news_data.json")
@@ -132,15 +109,7 @@ def _require(name, value, placeholder):
     if value is None or value.strip() == "" or value.strip() == placeholder:
         raise RuntimeError(f"{name}가 비어있습니다. .env에서 {name} 값을 설정하세요.")
 
-_openai_client = None
 _github_client = None
-def _get_openai():
-    global _openai_client
-    if _openai_client is None and ENABLE_SUMMARY:
-        from openai import OpenAI
-        _require("OPENAI_API_KEY", OPENAI_API_KEY, "ssu1")
-        _openai_client = OpenAI(api_key=OPENAI_API_KEY, timeout=OPENAI_TIMEOUT)
-    return _openai_client
 def _get_github():
     global _github_client
     if _github_client is None and ENABLE_GITHUB:
@@ -228,74 +197,6 @@ FEEDS: List[Dict[str, str]] = [
     {"feed_url": "https://venturebeat.com/category/ai/feed/",  "source": "VentureBeat AI",      "category": "AI",           "lang": "en"},
 ]
 
-HEADERS = {"User-Agent": "Mozilla/5.0 (NewsAgent/1.0)"}
-try:
-    if os.getenv("ENABLE_HTTP_CACHE", "1") == "1":
-        from requests_cache import CachedSession
-        SESSION = CachedSession('http_cache', expire_after=int(os.getenv("HTTP_CACHE_EXPIRE","3600")))
-    else:
-        SESSION = requests.Session()
-except Exception:
-    SESSION = requests.Session()
-ADAPTER = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=1)
-SESSION.mount("http://", ADAPTER)
-SESSION.mount("https://", ADAPTER)
-
-def canonicalize_link(url: str) -> str:
-    try:
-        u = urlparse(url)
-        scheme = (u.scheme or "https").lower()
-        netloc = (u.netloc or "").lower()
-        path = (u.path or "").rstrip("/")
-        drop = {"utm_source","utm_medium","utm_campaign","utm_term","utm_content","utm_id","utm_name",
-                "gclid","fbclid","igshid","spm","ref","ref_src","cmpid"}
-        qs = [(k, v) for k, v in parse_qsl(u.query, keep_blank_values=True) if k.lower() not in drop]
-        query = urlencode(qs, doseq=True)
-        return urlunparse((scheme, netloc, path, u.params, query, ""))
-    except Exception:
-        return url
-
-def extract_main_text(url: str) -> str:
-    try:
-        r = SESSION.get(url, headers=HEADERS, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        art = soup.find("article")
-        if art and art.get_text(strip=True):
-            return art.get_text("\n", strip=True)
-        candidates = soup.select(
-            "div[id*='content'], div[class*='content'], "
-            "div[id*='article'], div[class*='article'], "
-            "section[id*='content'], section[class*='content'], "
-            "div[id*='news'], div[class*='news']"
-        )
-        best = max((c for c in candidates), key=lambda c: len(c.get_text(strip=True)), default=None)
-        if best and len(best.get_text(strip=True)) > 200:
-            return best.get_text("\n", strip=True)
-        md = soup.find("meta", attrs={"name":"description"}) or soup.find("meta", attrs={"property":"og:description"})
-        if md and md.get("content"):
-            return md["content"]
-    except Exception:
-        pass
-    return ""
-
-def parse_feed(feed_url: str):
-    try:
-        feed = feedparser.parse(feed_url)
-        if not hasattr(feed, "entries"): return None
-        return feed
-    except Exception:
-        return None
-
-def expand_paged_feed_urls(feed_url: str, pages: int) -> List[str]:
-    """WordPress 계열 /feed/ 인 경우 ?paged=2..N 로 확장해 과거 기사도 수집"""
-    urls = [feed_url]
-    if re.search(r"/feed/?$", feed_url, re.IGNORECASE):
-        for i in range(2, max(2, pages+1)):
-            sep = "&" if "?" in feed_url else "?"
-            urls.append(f"{feed_url}{sep}paged={i}")
-    return urls
-
 # ============================================================
 # 3) 키워드 필터/요약/형태소 (요약 정화 + 실패 휴리스틱)
 # ============================================================
@@ -308,36 +209,6 @@ STOP_WORDS = set([
     "입니다","한다","했다","하였다","에서는","에서","대한","이날","라며","다고","였다","했다가","하며",
 ]) | STOP_EXACT
 
-TECH_ALLOW_TERMS = set(map(str.lower, """
-ai 인공지능 머신러닝 딥러닝 생성형 챗gpt 로보틱스 로봇 자동화 협동로봇
-반도체 메모리 dram nand ddr sram hbm 시스템 반도체 파운드리 웨이퍼 소자 공정 노광 euv 장비 소재
-npu tpu gpu cpu dsp isp fpga asic 칩셋 칩 설계 리소그래피 패키징 하이브리드 본딩
-이차전지 배터리 ess 양극재 음극재 전해질 분리막 고체전지 전고체 전기차 ev hev phev bms
-자율주행 라이다 레이더 센서 카메라 제어기 ecu v2x
-통신 네트워크 5g 6g lte nr 위성 mmwave 백홀 fronthaul 스몰셀
-ict 클라우드 엣지컴퓨팅 엣지 컴퓨팅 서버 데이터센터 쿠버네티스 컨테이너 devops cicd 오브젝트스토리지 객체저장
-소프트웨어 플랫폼 saas paas iaas 보안 암호 인증 키관리 키체인 취약점 제로트러스트
-핀테크 블록체인 분산원장 defi nft
-모델 학습 파인튜닝 튜닝 프롬프트 추론 인퍼런스 토큰 임베딩 경량화 양자화 distillation 지식증류
-사물인터넷 iot 산업용iot iiot plc scada mes erp
-디스플레이 oled qd 마이크로 led lcd microled micro-led
-바이오 바이오센서 유전자치료제 세포치료제 의료기기 헬스케어 디지털 헬스 웨어러블 원격진료
-""".split()))
-TECH_ALLOW_PATTERNS = [
-    r"^llm$", r"^rlhf$", r"^rag$", r"^ssl$", r"^tls$", r"^ssh$", r"^api$", r"^sdk$",
-    r"^[cg]pu$", r"^cpu$", r"^npu$", r"^tpu$", r"^fpga$", r"^asic$",
-    r"^(5g|6g|4g|lte|nr)$",
-    r"^dr?am$", r"^nand$", r"^hbm$",
-    r"^(ai|ml|dl|nlp|cv)$",
-    r"^ar|^vr|^xr$",
-    r"^[a-z]+net$",
-    r".*net$",
-    r".*transformer.*",
-    r".*diffusion.*",
-    r".*foundation model.*",
-]
-TECH_ALLOW_REGEX = [re.compile(p, re.IGNORECASE) for p in TECH_ALLOW_PATTERNS]
-
 def is_meaningless_token(w: str) -> bool:
     if not w: return True
     s = w.strip()
@@ -350,252 +221,28 @@ def is_meaningless_token(w: str) -> bool:
     if sl in STOP_EXACT: return True
     return False
 
-def is_tech_term(w: str) -> bool:
-    if not w: return False
-    s = w.strip(); sl = s.lower()
-    if sl in TECH_ALLOW_TERMS: return True
-    for rx in TECH_ALLOW_REGEX:
-        if rx.search(s): return True
-    if re.fullmatch(r"[a-z]{2,}\d{1,2}", sl): return True
-    if "반도체" in s or "자율주행" in s or "클라우드" in s or "모델" in s or "알고리즘" in s:
-        return True
-    return False
-
-def sanitize_summary(s: Optional[str]) -> str:
-    if not s: return ""
-    t = str(s).strip()
-    t = re.sub(r"^\s*\[[^\]]*\]\s*", "", t)
-    t = re.sub(r"(^|\s)제목\s*:\s*", r"\1", t)
-    t = re.sub(r"(^|\s)첫\s*문장\s*:\s*", r"\1", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
-
-def _clean_sentences(txt: str, limit_chars: int = 700) -> str:
-    t = (txt or "").strip()
-    t = re.sub(r"\s+", " ", t)
-    t = re.sub(r"(기자|사진|영상)\s*=", "", t)
-    return t[:limit_chars]
-
-# ---- 요약 실패 시 제목 기반 휴리스틱 요약 ----
-def generate_heuristic_summary(title: str, source: str, published: str,
-                               categories_map: Optional[Dict[str, Dict[str, List[str]]]] = None) -> str:
-    title_str = (title or "").strip()
-    pm, ps = "IT/공학", "핵심 이슈"
-    if categories_map:
-        # 제목에 포함된 키워드로 대강 분류
-        for main, subcats in categories_map.items():
-            for sub, kws in subcats.items():
-                for kw in kws:
-                    if kw and str(kw) in title_str:
-                        pm, ps = main, sub
-                        break
-    # 간단한 설명 2~3문장 + 해시태그
-    base = f"{source} 보도. '{title_str}' 주제의 {pm} - {ps} 관련 이슈입니다. " \
-           f"해당 분야는 최근 기술·제품·투자 동향이 활발하며 산업 전반의 경쟁이 이어지고 있습니다. " \
-           f"기업/연구기관의 발표와 표준화, 생태계 확장이 동시에 진행되는 흐름을 참고하세요."
-    # 해시태그(제목에서 뽑기)
-    tags = []
-    for token in re.split(r"[^\w가-힣A-Za-z\+\-]+", title_str):
-        if not token: continue
-        if is_meaningless_token(token): continue
-        if is_tech_term(token):
-            tags.append(token)
-    tags = list(dict.fromkeys(tags))[:4]
-    if tags:
-        base += "  #" + " #".join(tags)
-    return sanitize_summary(base)
-
-def summarize_kor(title: str, source: str, published: str, text: str) -> str:
-    def _fallback():
-        base = _clean_sentences(text or "", 1200)
-        if not base or len(base) < 20:
-            return sanitize_summary(f"{title}".strip())
-        sents = re.split(r"(?<=[.?!。])\s+", base)
-        head = " ".join(sents[:3]) if sents else base
-        return sanitize_summary(head)
-
-    if not ENABLE_SUMMARY:
-        # 모델을 쓰지 않는 모드에서는 휴리스틱 보강
-        out = _fallback()
-        if not out or out.strip().lower() == (title or "").strip().lower() or len(out) < 60:
-            try:
-                cm = globals().get("CATEGORIES", None)
-                return generate_heuristic_summary(title, source, published, categories_map=cm)
-            except Exception:
-                return out or (title or "")
-        return out
-
-    try:
-        client = _get_openai()
-        snippet = _clean_sentences(text or "", 6000)
-        prompt = f"""
-다음 기사를 사실 위주로 4~6문장 한국어 요약하세요. 과장/의견 없이 핵심만.
-- 제목: {title}
-- 매체: {source}
-- 게시일: {published}
-- 본문(발췌): {snippet}
-요구사항:
-1) 핵심 기술/제품/조치/수치/일정
-2) 산업적 함의 1줄
-3) 마지막에 #키워드 3~5개 (쉼표 구분, 기술 관련)
-"""
-        chat = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role":"system","content":"너는 공학·IT 뉴스 한국어 에디터다. 사실만 간결히."},
-                {"role":"user","content":prompt}
-            ],
-            temperature=0.3, max_tokens=420, timeout=OPENAI_TIMEOUT,
-        )
-        out = (chat.choices[0].message.content or "").strip()
-        out = sanitize_summary(out)
-        if not out or out.strip().lower() == (title or "").strip().lower() or len(out) < 60:
-            cm = globals().get("CATEGORIES", None)
-            return generate_heuristic_summary(title, source, published, categories_map=cm)
-        return out
-    except Exception:
-        # OpenAI 실패 시 휴리스틱
-        cm = globals().get("CATEGORIES", None)
-        return generate_heuristic_summary(title, source, published, categories_map=cm)
-
-# 형태소
-pos_tags = None
-token_filter = None
-def _init_nlp():
-    global pos_tags, token_filter
-    if pos_tags is not None: return
-    try:
-        if NLP_BACKEND in ("auto", "okt"):
-            from konlpy.tag import Okt
-            _okt = Okt()
-            def _pos(txt): return _okt.pos(txt or "", norm=True, stem=True)
-            def _filter(w,p): return p in {"Noun","Verb","Adjective","Alpha"}
-            pos_tags, token_filter = _pos, _filter
-            return
-        raise RuntimeError("Okt 미사용 강제")
-    except Exception:
-        if NLP_BACKEND == "okt":
-            raise
-        from kiwipiepy import Kiwi
-        _kiwi = Kiwi()
-        def _pos(txt):
-            txt = txt or ""
-            try: toks = _kiwi.tokenize(txt)
-            except Exception:
-                res = _kiwi.analyze(txt) or []
-                r = res[0] if res else None
-                toks = getattr(r, "tokens", None)
-                if toks is None and isinstance(r, (tuple, list)) and len(r) >= 2:
-                    toks = r[1]
-                toks = toks or []
-            pairs = []
-            for t in toks:
-                if hasattr(t, "form"): form, tag = t.form, str(t.tag)
-                elif isinstance(t, (tuple, list)) and len(t) >= 2: form, tag = t[0], str(t[1])
-                else: continue
-                if   tag.startswith("NN"): mapped = "Noun"
-                elif tag.startswith("VV"): mapped = "Verb"
-                elif tag.startswith("VA"): mapped = "Adjective"
-                elif tag == "SL":         mapped = "Alpha"
-                else:                     mapped = tag
-                pairs.append((form, mapped))
-            return pairs
-        def _filter(w,p): return p in {"Noun","Verb","Adjective","Alpha"}
-        pos_tags, token_filter = _pos, _filter
-_init_nlp()
-
-def extract_keywords(text: str, top_k: int = 30):
-    _init_nlp()
-    if not text: return []
-    toks = []
-    for w, p in pos_tags(text):
-        if p not in {"Noun","Verb","Adjective","Alpha"}: continue
-        wl = str(w).strip()
-        if not wl: continue
-        if wl.lower() in STOP_WORDS: continue
-        if is_meaningless_token(wl): continue
-        toks.append(wl)
-    if STRICT_TECH_KEYWORDS:
-        toks = [t for t in toks if is_tech_term(t)]
-    counts = Counter(toks)
-    if not counts:
-        for w,p in pos_tags(text):
-            if p != "Noun": continue
-            w2 = str(w).strip()
-            if len(w2) >= 2 and not is_meaningless_token(w2):
-                counts[w2] += 1
-    return [w for w,_ in counts.most_common(top_k)]
-
-def is_tech_doc(title: str, body: str, keywords: Iterable[str]) -> bool:
-    text = f"{title or ''} {body or ''} {' '.join(keywords or [])}"
-    for k in (keywords or []):
-        if is_tech_term(k): return True
-    for term in TECH_ALLOW_TERMS:
-        if term in text.lower(): return True
-    for rx in TECH_ALLOW_REGEX:
-        if rx.search(text): return True
-    if re.search(r"(연예|스타|예능|헬스|건강|라이프|맛집|여행|뷰티|운세|게임쇼|e스포츠)", text):
-        return False
-    return False
-
 # ============================================================
 # 4) 업서트/수집 (백필 포함)
 # ============================================================
-def link_exists(link: str) -> bool:
-    try:
-        cursor.execute("SELECT 1 FROM articles WHERE link=? LIMIT 1", (link,))
-        return cursor.fetchone() is not None
-    except Exception:
-        return False
-
-def upsert_article(title, link, published, source, raw_text, summary, keywords):
-    link = canonicalize_link(link)
-    summary = sanitize_summary(summary)
-    try:
-        cursor.execute("""
-            INSERT INTO articles (title, link, published, source, raw_text, summary, keywords, category)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (title, link, published, source, raw_text, summary,
-              json.dumps(keywords, ensure_ascii=False), None))
-        conn.commit()
-        return "insert"
-    except sqlite3.IntegrityError:
-        cursor.execute("""
-            UPDATE articles
-               SET title=?, published=?, source=?,
-                   raw_text=?, summary=?, keywords=?
-             WHERE link=?
-        """, (title, published, source, raw_text, summary,
-              json.dumps(keywords, ensure_ascii=False), link))
-        conn.commit()
-        return "update"
-
-def _process_entry(entry, idx, total, source, log):
-    title = getattr(entry, "title", "").strip()
-    link  = canonicalize_link(getattr(entry, "link", "").strip())
-    if not (title and link):
-        return "skip", idx
-
-    if SKIP_UPDATE_IF_EXISTS and link_exists(link):
-        return "skip", idx
-
-    published = getattr(entry, "published", "") or getattr(entry, "updated", "") or datetime.utcnow().strftime("%Y-%m-%d")
-    raw_text  = extract_main_text(link) or getattr(entry, "summary", "") or ""
-    summary   = summarize_kor(title, source, published, raw_text or title)
-    keywords  = extract_keywords(raw_text or summary, top_k=30)
-
-    if SKIP_NON_TECH and not is_tech_doc(title, raw_text, keywords):
-        return "skip_nontech", idx
-
-    res = upsert_article(title, link, published, source, raw_text, summary, keywords)
-
-    if PER_ARTICLE_SLEEP > 0:
-        time.sleep(PER_ARTICLE_SLEEP)
-    return res, idx
+def _feed_config(feed_url: str, source: str) -> Dict[str, str]:
+    for f in FEEDS:
+        if f["feed_url"] == feed_url:
+            return {**f, "source": source}
+    return {"feed_url": feed_url, "source": source}
+
+def _ingest(feeds: List[Dict[str, str]], log, max_total=None) -> None:
+    # 앱 요약/키워드: 한국어 에디터 요약(gpt-4o-mini, 4~6문장 + #키워드) · 키워드 30개
+    config = IngestConfig(summary_style="editor", keyword_count=30)
+    if max_total:
+        config.max_total_per_source = max_total
+    result = ingest(feeds, SqliteSink(DB_PATH), config)
+    stats = result["stats"]
+    for name in stats["failed_feeds"]:
+        log(f"  - {name}: RSS 수집 실패 → 건너뜀")
+    log(f"◼ 신규 {stats['total_inserted']} · 업데이트 {stats['total_updated']} · 스킵 {stats['total_skipped']} "
+        f"· 중복 {stats['total_duplicates']} ({result['duration']:.1f}초)")
 
 def fetch_and_store_news(feed_url: str, source: str, max_total=None, log=None):
-    if max_total is None:
-        max_total = MAX_TOTAL_PER_SOURCE
     if log is None:
         log = st.write
 
@@ -603,69 +250,14 @@ def fetch_and_store_news(feed_url: str, source: str, max_total=None, log=None):
         log(f"- {source}: feed_url 없음 → 건너뜀")
         return
 
-    urls = expand_paged_feed_urls(feed_url, RSS_BACKFILL_PAGES)
-    log(f"**▷ {source}** 피드 읽는 중… (확장 {len(urls)}개)")
-
-    entries_all = []
-    for i, u in enumerate(urls, 1):
-        feed = parse_feed(u)
-        if feed is None:
-            log(f"  - RSS 파싱 실패/비호환: {u} → 건너뜀")
-            continue
-        entries = feed.entries or []
-        if MAX_RESULTS:
-            entries = entries[:MAX_RESULTS]
-        entries_all.extend(entries)
-        log(f"  - {i}/{len(urls)}: 항목 {len(entries)}건")
-
-        if len(entries_all) >= max_total:
-            break
-
-    if not entries_all:
-        log(f"◼ {source}: 수집된 항목 없음")
-        return
-
-    # 중복 제거 (링크 기준)
-    seen = set()
-    uniq_entries = []
-    for e in entries_all:
-        link = canonicalize_link(getattr(e, "link", ""))
-        if not link or link in seen:
-            continue
-        seen.add(link)
-        uniq_entries.append(e)
-
-    log(f"- 총 처리 대상: {len(uniq_entries)}건 (중복 제거 후)")
-
-    inserted, updated, skipped, skipped_nontech = 0, 0, 0, 0
-
-    if not ENABLE_SUMMARY and len(uniq_entries) > 0:
-        workers = max(1, PARALLEL_MAX_WORKERS)
-        with ThreadPoolExecutor(max_workers=workers) as ex:
-            futs = [ex.submit(_process_entry, e, i, len(uniq_entries), source, log)
-                    for i, e in enumerate(uniq_entries, 1)]
-            for fut in as_completed(futs):
-                res, idx = fut.result()
-                if   res == "insert": inserted += 1; log(f"[{idx}/{len(uniq_entries)}] ✅ 신규 저장")
-                elif res == "update": updated  += 1; log(f"[{idx}/{len(uniq_entries)}] 🔄 업데이트")
-                elif res == "skip_nontech":    skipped_nontech += 1
-                else:                           skipped += 1
-    else:
-        for idx, entry in enumerate(uniq_entries, 1):
-            res, _ = _process_entry(entry, idx, len(uniq_entries), source, log)
-            if   res == "insert": inserted += 1; log(f"[{idx}/{len(uniq_entries)}] ✅ 신규 저장")
-            elif res == "update": updated  += 1; log(f"[{idx}/{len(uniq_entries)}] 🔄 업데이트")
-            elif res == "skip_nontech":    skipped_nontech += 1
-            else:                           skipped += 1
-
-    log(f"◼ {source}: 신규 {inserted} · 업데이트 {updated} · 스킵 {skipped} · 비기술스킵 {skipped_nontech}")
+    log(f"**▷ {source}** 피드 읽는 중…")
+    _ingest([_feed_config(feed_url, source)], log, max_total)
 
 def ingest_all(log=None):
     if log is None:
         log = st.write
     log("⏳ 뉴스 수집/요약/키워드 시작")
-    for f in FEEDS:
-        fetch_and_store_news(f.get("feed_url"), f.get("source","(unknown)"), log=log)
+    _ingest(FEEDS, log)
     log("✅ 모든 소스 처리 완료")
 
 def export_json(path="news_data.json", limit=500, log=None):
@@ -978,10 +570,10 @@ def main():
         else:
             filtered_df = pd.DataFrame()  # 즐겨찾기가 없으면 빈 DataFrame
     
-    # 비기술 기사 숨김
+    # 비기술 기사 숨김 (수집의 SKIP_NON_TECH 와 같은 분류기, 본문 대신 제목·키워드로 판정)
     if HIDE_NON_TECH_AT_UI:
         tech_mask = filtered_df.apply(
-            lambda row: is_tech_doc(row["title"], "", row["keywords"]), axis=1
+            lambda row: is_tech_article(row["title"] or "", "", row["keywords"]), axis=1
         )
         filtered_df = filtered_df[tech_mask]
     
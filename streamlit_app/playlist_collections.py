@@ -15,11 +15,17 @@
 from __future__ import annotations
 
 import json
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
 import pandas as pd
 import pandas.api.types as ptypes
 
+# 사전 매칭(Aho-Corasick)은 백엔드 term_matcher 를 공용으로 사용
+sys.path.append(str(Path(__file__).resolve().parent.parent / "backend"))
+from term_matcher import TermMatcher
+
 
 # =========================================
 # 1) 카테고리 사전 (대분류 → 중분류 → 키워드)
@@ -57,24 +63,32 @@ CATEGORIES: Dict[str, Dict[str, List[str]]] = {
 }
 
 
+# 전체 키워드를 (대분류, 중분류) 그룹으로 묶어 한 번에 검사하는 오토마톤
+_CATEGORY_MATCHER = TermMatcher({
+    (main_cat, sub_cat): keywords
+    for main_cat, subcats in CATEGORIES.items()
+    for sub_cat, keywords in subcats.items()
+})
+
+
 # =========================================
 # 2) 분류(카테고리) 유틸
 # =========================================
 def _pick_best_category(title: str, content: str) -> Tuple[str, str, List[str]]:
     """
     제목/본문에서 가장 잘 매칭되는 (대분류, 중분류)와 매칭 키워드 목록을 고른다.
-    - 단순 '포함' 매칭(대소문자 구분 X)
+    - 단순 '포함' 매칭(대소문자 구분 X), 전체 사전을 텍스트 한 번 순회로 검사
     - 가장 많은 키워드가 걸린 중분류를 대표로 선택
     """
     text = (title or "") + " " + (content or "")
-    text_low = text.lower()
+    matches = _CATEGORY_MATCHER.scan(text)
 
     best: Tuple[str, str, List[str]] = ("기타", "기타", [])
     best_hits = 0
 
     for main_cat, subcats in CATEGORIES.items():
-        for sub_cat, keywords in subcats.items():
-            hits = [kw for kw in keywords if kw.lower() in text_low]
+        for sub_cat in subcats:
+            hits = matches.hits((main_cat, sub_cat))
             if len(hits) > best_hits:
                 best = (main_cat, sub_cat, hits)
                 best_hits = len(hits)